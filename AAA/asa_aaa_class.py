@@ -1,6 +1,9 @@
 import json
+import threading
 import requests
 from getpass import getpass
+from asa_session import ASASession
+from asa_token_cache import ASATokenCache
 
 
 class ASAAAA:
@@ -11,20 +14,25 @@ class ASAAAA:
     authentication related tasks, or make configuration changes using POST, PUT,
     and PATCH via the requests module.
     '''
-    def __init__(self, asa, un=None, pw=None, base_url=None):
+    def __init__(self, asa, un=None, pw=None, base_url=None, session=None, token_cache=None):
         '''
         The __init__ method requires an ASA name or IP that can be used to make API
         calls. The un and pw can be entered, but it is expected that they will be
         left blank, and will be handled by method prompts. The pw uses the getpass
-        in order to keep the password from being echoed back to the screen. The
+        in order to keep the password from being echoed back to the screen, and is
+        only prompted for if there is no cached token for the ASA and user. The
         base_url will also default to the correct base URL used for all of the
         methods within this class; each method will build on this base URL to build
-        the full URL need to obtain the method's goal.
+        the full URL need to obtain the method's goal. The session is the pooled
+        ASASession used to login; it is kept on the instance so that it can be
+        passed to the other API classes and reused for every call.
         Args:
             asa: The IP or hostname to be used to reach the desired ASA.
             un: The username for the user trying to login.
             pw: The password for the user trying to login.
             base_url: The base URL used by all API calls in the module.
+            session: An ASASession to use; a default one is created if none is provided.
+            token_cache: An ASATokenCache to use; pass False to always login.
         Example:
             >>>asa = input('What firewall would you like to use? ')
             What firewall would you like to use? 10.10.10.5
@@ -40,34 +48,105 @@ class ASAAAA:
             self.un = input('What is your username? ')
         else: self.un = un
 
-        if pw == None:
-            self.pw = getpass('Enter your password: ')
-        else: self.pw = pw
+        self.pw = pw
 
         if base_url == None:
             self.base_url = "https://{}/api".format(asa)
         else: self.base_url = base_url
 
+        if session == None:
+            self.session = ASASession()
+        else: self.session = session
+
+        if token_cache == None:
+            self.token_cache = ASATokenCache()
+        else: self.token_cache = token_cache
+
+        self.header = None
+        self._refresh_lock = threading.Lock()
+
+    def _password(self):
+        '''
+        The password is only prompted for when a new token is actually needed,
+        so a cached token lets a script run without asking for it.
+        '''
+        if self.pw == None:
+            self.pw = getpass('Enter your password: ')
+        return self.pw
+
+    def _request_token(self):
+        '''
+        This method POSTs to the token service and returns the new X-Auth-Token,
+        or None if the login failed.
+        '''
+        url = self.base_url + "/tokenservices"
+        body = json.dumps({})
+
+        login = self.session.post(url, json=body, verify=False, auth=(self.un, self._password()),
+                                  authenticate=False)
+        if login.ok:
+            print("\nLOGIN STATUS_CODE: {} OK \n".format(login.status_code))
+            token = login.headers['X-Auth-Token']
+            if self.token_cache:
+                self.token_cache.set(self.asa, self.un, token)
+            return token
+        else:
+            print("\nLOGIN FAILED!!! STATUS_CODE: {}\nReason: {}".format(login.status_code, login.reason))
 
     def asa_login(self):
         '''
         This module is used to login to the given ASA and return
-        a token to reuse for future requests.
+        a token to reuse for future requests. A token cached by a previous
+        run for the same ASA and user is reused instead of logging in again.
+        The session is told to use this instance for refreshing the token,
+        so an expired token is replaced and the failed request retried.
         Returns:
              A header with 'Content-Type json and a 'X-Auth-Token.'
-             
+
         '''
         requests.packages.urllib3.disable_warnings()
 
-        url = self.base_url + "/tokenservices"
-        body = json.dumps({})
+        token = None
+        if self.token_cache:
+            token = self.token_cache.get(self.asa, self.un)
+            if token:
+                print("\nLOGIN USING CACHED TOKEN \n")
+        if not token:
+            token = self._request_token()
 
-        asa_session = requests.Session()
-        asa_session.auth = (self.un, self.pw)
-        login = asa_session.post(url,json=body,verify=False)
-        if login.ok:
-            print("\nLOGIN STATUS_CODE: {} OK \n".format(login.status_code))
-            headers = login.headers
-            headers['Content-Type'] = 'application/json'
-            return headers
-            
+        if token:
+            self.header = {'X-Auth-Token': token, 'Content-Type': 'application/json'}
+            self.session.authenticator = self
+            return self.header
+
+    def asa_refresh_token(self, stale_token):
+        '''
+        This method replaces a token the ASA has rejected. The header returned by
+        asa_login is updated in place, so every class holding it picks up the new
+        token. The refresh is done under a lock: a worker that waited on the lock
+        finds the token already replaced and does not login again, and a token
+        refreshed by another process is taken from the cache.
+
+        Args:
+            stale_token: The token that was sent with the rejected request.
+
+        Returns:
+            The current token, or None if a new one could not be obtained.
+
+        '''
+        with self._refresh_lock:
+            if self.header['X-Auth-Token'] != stale_token:
+                return self.header['X-Auth-Token']
+
+            if self.token_cache:
+                with self.token_cache.lock():
+                    token = self.token_cache.get(self.asa, self.un)
+                    if not token or token == stale_token:
+                        self.token_cache.delete(self.asa, self.un)
+                        token = self._request_token()
+            else:
+                token = self._request_token()
+
+            if token:
+                self.header['X-Auth-Token'] = token
+            return token
@@ -0,0 +1,118 @@
+import json
+import asyncio
+import aiohttp
+
+
+class AsyncASAResponse:
+    '''
+    The result of an AsyncASASession call. The body is read before the response
+    is returned, and the attributes mirror the requests.Response attributes used
+    by the programs (ok, status_code, reason, text, content and headers), so
+    the async classes return the same shapes as their blocking counterparts.
+
+    '''
+
+    def __init__(self, status_code, reason, headers, content, url):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncASASession:
+    '''An asyncio HTTP client shared by the AsyncASA* API classes.
+
+    A single aiohttp.ClientSession is used for every call, and the number of
+    calls in flight to any one ASA is bounded by per_device_limit, so a job can
+    issue thousands of GETs at once without overloading the ASA's REST agent.
+    A 401 is handled the same way as ASASession: the token is refreshed through
+    the authenticator (normally the ASAAAA instance) and the call is retried once.
+
+    '''
+
+    def __init__(self, per_device_limit=4, limit=100, timeout=30, authenticator=None):
+        '''
+        Args:
+            per_device_limit: The number of concurrent calls allowed to each ASA.
+            limit: The number of concurrent calls allowed across all ASAs.
+            timeout: The total timeout in seconds for each call.
+            authenticator: An object with asa_refresh_token, normally an ASAAAA.
+
+        Example:
+
+            >>>asa_login = ASAAAA(asa)
+            >>>header = asa_login.asa_login()
+            >>>async with AsyncASASession(authenticator=asa_login) as session:
+            ...    asa_acl = AsyncASAACL(asa, header, session=session)
+            ...    policy = await asa_acl.asa_get_acl_access_in('lab')
+
+        '''
+        self.per_device_limit = per_device_limit
+        self.limit = limit
+        self.timeout = timeout
+        self.authenticator = authenticator
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _client(self):
+        if self._session == None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.per_device_limit, ssl=False)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def close(self):
+        if self._session != None:
+            await self._session.close()
+
+    async def _send(self, method, url, **kwargs):
+        async with self._client().request(method, url, **kwargs) as response:
+            content = await response.read()
+            return AsyncASAResponse(response.status, response.reason, response.headers, content, str(response.url))
+
+    async def request(self, method, url, headers=None, json=None, verify=False):
+        '''
+        Sends the request and reads the whole body. verify is accepted for parity
+        with the blocking calls; certificate checking is controlled by the connector.
+
+        Returns:
+            An AsyncASAResponse.
+
+        '''
+        sent_token = headers.get('X-Auth-Token') if headers else None
+        response = await self._send(method, url, headers=headers, json=json)
+
+        if response.status_code == 401 and self.authenticator and sent_token:
+            loop = asyncio.get_running_loop()
+            token = await loop.run_in_executor(None, self.authenticator.asa_refresh_token, sent_token)
+            if token and token != sent_token:
+                headers = dict(headers, **{'X-Auth-Token': token})
+                response = await self._send(method, url, headers=headers, json=json)
+
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request('PUT', url, **kwargs)
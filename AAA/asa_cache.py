@@ -0,0 +1,265 @@
+import os
+import re
+import dbm
+import time
+import hashlib
+import shelve
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+import requests
+from asa_session import ASASession
+
+
+DEFAULT_TTLS = (
+    ('/api/interfaces/', 600),
+    ('/api/routing/', 300),
+    ('/api/objects/', 120),
+    ('/api/access/', 30)
+)
+
+DISK_SUFFIXES = ('', '.db', '.dir', '.dat', '.bak', '.pag')
+
+
+class CacheEntry:
+    '''
+    A cached GET response with the time it stops being fresh and the validators
+    used to revalidate it with the ASA once it is stale.
+
+    '''
+    __slots__ = ('response', 'expires', 'etag', 'last_modified', 'size')
+
+    def __init__(self, response, expires):
+        self.response = response
+        self.expires = expires
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        self.size = len(response.content)
+
+
+class CachingSession:
+    '''An opt-in, read-through cache of GET responses in front of an ASASession.
+
+    The API classes send their calls to whatever session they are given, so
+    passing a CachingSession in place of the ASASession caches their GETs
+    without changing them. Entries are keyed by the identity that sent the GET,
+    a hash of its X-Auth-Token, or of the session's username when no token is
+    sent, and the full URL, which includes the ASA, so one user's responses
+    are never answered to another. Entries are fresh for a time-to-live chosen
+    by URL. A stale entry is
+    revalidated with If-None-Match / If-Modified-Since when the ASA supplied an
+    ETag or Last-Modified, so an unchanged collection costs a 304 rather than a
+    full download. The memory tier is bounded by entries and bytes and evicts
+    the least recently used entry; an optional on-disk tier lets later runs
+    reuse responses. A successful POST, PUT, PATCH or DELETE drops every entry
+    under the URL it wrote to, and the collections above it, for every identity.
+
+    '''
+
+    def __init__(self, session=None, ttl=60, ttls=DEFAULT_TTLS, max_entries=1024, max_bytes=64 * 1024 * 1024,
+                 cache_file=None):
+        '''
+        Args:
+            session: The ASASession used to send calls the cache cannot answer.
+            ttl: The seconds a response stays fresh when no entry in ttls matches.
+            ttls: A sequence of (URL pattern, seconds); the first pattern found in the URL applies.
+            max_entries: The number of responses kept in memory.
+            max_bytes: The total size of response bodies kept in memory.
+            cache_file: A file used as the on-disk tier; no disk tier is used if None.
+                Its files are created, or changed, to be readable only by their owner.
+
+        Example:
+
+            >>>asa_login = ASAAAA(asa)
+            >>>header = asa_login.asa_login()
+            >>>session = CachingSession(asa_login.session, cache_file='asa_cache')
+            >>>asa_intfcs = ASAInterface(asa, header, session=session)
+            >>>used_intfcs_name(asa, header, session)
+            >>>unused_intfcs_hardware_id(asa, header, session)  # answered from the cache
+
+        '''
+        if session == None:
+            self.session = ASASession()
+        else:
+            self.session = session
+
+        self.ttl = ttl
+        self.ttls = [(re.compile(pattern), seconds) for pattern, seconds in ttls]
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_file = cache_file
+        if cache_file:
+            for suffix in DISK_SUFFIXES:
+                if os.path.exists(cache_file + suffix):
+                    os.chmod(cache_file + suffix, 0o600)
+
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def ttl_for(self, url):
+        '''
+        Returns:
+            The seconds a response from the URL stays fresh.
+
+        '''
+        for pattern, seconds in self.ttls:
+            if pattern.search(url):
+                return seconds
+        return self.ttl
+
+    def identity(self, headers):
+        '''
+        Returns:
+            A hash of the X-Auth-Token in the headers, or of the username of the
+            session's authenticator when there is no token.
+
+        '''
+        token = (headers or {}).get('X-Auth-Token')
+        if token:
+            return hashlib.sha256(('token:' + token).encode()).hexdigest()[:32]
+        username = getattr(getattr(self.session, 'authenticator', None), 'un', None)
+        return hashlib.sha256('user:{}'.format(username).encode()).hexdigest()[:32]
+
+    def _open_disk(self, flag='c'):
+        return shelve.Shelf(dbm.open(self.cache_file, flag, 0o600))
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._discard(key)
+            self.entries[key] = entry
+            self.size += entry.size
+            self._evict()
+
+            if self.cache_file:
+                with self._open_disk() as disk:
+                    disk[key] = entry
+
+    def _evict(self):
+        while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= evicted.size
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry != None:
+            self.size -= entry.size
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry != None:
+                self.entries.move_to_end(key)
+                return entry
+
+            if self.cache_file:
+                with self._open_disk() as disk:
+                    entry = disk.get(key)
+                if entry != None:
+                    self.entries[key] = entry
+                    self.size += entry.size
+                    self._evict()
+            return entry
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        '''
+        Answers the GET from the cache while the entry is fresh, revalidates a
+        stale entry that has validators, and otherwise sends the GET and caches
+        a successful response.
+
+        Returns:
+            A requests.Response, which may be shared with earlier callers.
+
+        '''
+        prepared_url = requests.Request('GET', url, params=params).prepare().url
+        key = '{} {}'.format(self.identity(headers), prepared_url)
+        entry = self._lookup(key)
+        now = time.time()
+
+        if entry != None and entry.expires > now:
+            self.hits += 1
+            return entry.response
+
+        request_headers = dict(headers or {})
+        if entry != None and entry.etag:
+            request_headers['If-None-Match'] = entry.etag
+        if entry != None and entry.last_modified:
+            request_headers['If-Modified-Since'] = entry.last_modified
+
+        response = self.session.get(url, params=params, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and entry != None:
+            self.revalidations += 1
+            entry.expires = now + self.ttl_for(prepared_url)
+            self._store(key, entry)
+            return entry.response
+
+        self.misses += 1
+        if response.ok:
+            self._store(key, CacheEntry(response, now + self.ttl_for(prepared_url)))
+        return response
+
+    def invalidate(self, url):
+        '''
+        Drops every cached entry under the URL, and every collection the URL is under.
+
+        Args:
+            url: The URL that was written to.
+
+        '''
+        written = urlsplit(url)
+        written_path = written.path.rstrip('/')
+
+        def under(path, parent):
+            return path == parent or path.startswith(parent + '/')
+
+        def affected(key):
+            cached = urlsplit(key.split(' ', 1)[-1])
+            cached_path = cached.path.rstrip('/')
+            return cached.netloc == written.netloc and (
+                under(cached_path, written_path) or under(written_path, cached_path))
+
+        with self._lock:
+            for key in [key for key in self.entries if affected(key)]:
+                self._discard(key)
+
+            if self.cache_file:
+                with self._open_disk() as disk:
+                    for key in [key for key in disk.keys() if affected(key)]:
+                        del disk[key]
+
+    def clear(self):
+        '''
+        Drops every cached entry from memory and disk.
+
+        '''
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
+            if self.cache_file:
+                with self._open_disk('n'):
+                    pass
+
+    def _write(self, method, url, **kwargs):
+        response = getattr(self.session, method)(url, **kwargs)
+        if response.ok:
+            self.invalidate(url)
+        return response
+
+    def post(self, url, **kwargs):
+        return self._write('post', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._write('put', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self._write('patch', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._write('delete', url, **kwargs)
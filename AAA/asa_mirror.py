@@ -0,0 +1,375 @@
+import io
+import re
+import json
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl
+import requests
+from requests.structures import CaseInsensitiveDict
+from asa_session import ASASession
+
+
+MIRRORED_COLLECTIONS = (
+    r'/api/objects/networkobjects$',
+    r'/api/objects/networkobjectgroups$',
+    r'/api/routing/static$',
+    r'/api/access/in$',
+    r'/api/access/in/[^/]+/rules$',
+    r'/api/interfaces/physical$'
+)
+
+DEFAULT_PAGE_LIMIT = 100
+
+
+def collection_key(url):
+    '''
+    Returns:
+        The URL without its query string or trailing slash, which is how mirrored collections are keyed.
+
+    '''
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/'), '', ''))
+
+
+def mirror_response(url, body):
+    '''
+    This function builds the requests.Response returned for a call answered by the mirror.
+
+    Args:
+        url: The URL that was requested.
+        body: The JSON body of the response.
+
+    Returns:
+        A requests.Response with a status_code of 200. Its content is already
+        read, and raw is a file over the content, so iter_content and close work
+        as they do for a response sent with stream=True.
+
+    '''
+    content = json.dumps(body).encode('utf-8')
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.url = url
+    response.encoding = 'utf-8'
+    response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+    response._content = content
+    response._content_consumed = True
+    response.raw = io.BytesIO(content)
+    return response
+
+
+def position_of(item):
+    try:
+        return int(item['position'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class MirroredCollection:
+    '''
+    Every item of one collection on one ASA, in the order the ASA lists them,
+    with an index of the items by selfLink.
+
+    '''
+    __slots__ = ('kind', 'items', 'links')
+
+    def __init__(self, kind, items):
+        self.kind = kind
+        self.items = list(items)
+        self.links = {item['selfLink']: item for item in self.items if 'selfLink' in item}
+
+    def add(self, item):
+        '''
+        Adds a created item. An item with a position is inserted at that
+        position, and the items at or after it move down one, as the ASA does
+        when a rule is inserted into an ACL.
+
+        '''
+        position = position_of(item)
+        if position == None and self.items and position_of(self.items[-1]) != None:
+            position = position_of(self.items[-1]) + 1
+        if position != None:
+            position = max(1, min(position, len(self.items) + 1))
+            item['position'] = position
+            for existing in self.items:
+                existing_position = position_of(existing)
+                if existing_position != None and existing_position >= position:
+                    existing['position'] = existing_position + 1
+            index = next((index for index, existing in enumerate(self.items)
+                          if (position_of(existing) or 0) > position), len(self.items))
+            self.items.insert(index, item)
+        else:
+            self.items.append(item)
+        self.links[item['selfLink']] = item
+
+    def update(self, self_link, item):
+        '''
+        Replaces an item changed by a successful PUT or PATCH with the item as
+        the ASA lists it.
+
+        Returns:
+            False if the item is not in the collection, or if its position changed.
+
+        '''
+        existing = self.links.get(self_link)
+        if existing == None or position_of(existing) != position_of(item):
+            return False
+        self.items[self.items.index(existing)] = item
+        self.links[self_link] = item
+        return True
+
+    def remove(self, self_link):
+        '''
+        Removes a deleted item, and moves the items after it up one position.
+
+        Returns:
+            False if the item is not in the collection.
+
+        '''
+        item = self.links.pop(self_link, None)
+        if item == None:
+            return False
+        self.items.remove(item)
+        position = position_of(item)
+        if position != None:
+            for existing in self.items:
+                existing_position = position_of(existing)
+                if existing_position != None and existing_position > position:
+                    existing['position'] = existing_position - 1
+        return True
+
+
+class MirrorSession:
+    '''An in-process, write-through mirror of each ASA's collections.
+
+    Scripts often list a collection right after writing to it. A MirrorSession
+    is passed to the API classes in place of the ASASession; once every page
+    of a collection (objects, object groups, static routes, access-groups, ACL
+    rules or physical interfaces) has been read through it, later GETs of the
+    collection, any page of it, or any item in it are answered locally.
+    Successful writes made through the same session update the mirror in place
+    instead of discarding it: a 201 to a POST adds the item the ASA returns, or
+    the item GET from the created resource's Location, so the mirror only holds
+    items in the shape the ASA lists them; an ACL insert
+    moves the rules after it down, a PUT or PATCH replaces the item with the
+    one GET from its selfLink, and a DELETE removes it. When the result of a write is ambiguous (an error, or a
+    success that does not identify the created resource) only the collection
+    written to is dropped, and its next GET goes to the ASA.
+
+    '''
+
+    def __init__(self, session=None, collections=MIRRORED_COLLECTIONS):
+        '''
+        Args:
+            session: The ASASession used to send calls the mirror cannot answer.
+            collections: The URL path patterns of the collections that are mirrored.
+
+        Example:
+
+            >>>asa_login = ASAAAA(asa)
+            >>>header = asa_login.asa_login()
+            >>>session = MirrorSession(asa_login.session)
+            >>>asa_acl = ASAACL(asa, header, session=session)
+            >>>rules = list(asa_acl.asa_iter_acl_access_in('lab'))
+            >>>asa_acl.asa_configure_acl_access_in('lab', 'IPv4Address', '10.1.4.28',
+            'objectRef#NetworkObj','webhost', 'TcpUdpService', 'tcp/80', 'Approved Ticket: 5678', 1)
+            >>>rules = list(asa_acl.asa_iter_acl_access_in('lab'))  # no call is sent to the ASA
+
+        '''
+        if session == None:
+            self.session = ASASession()
+        else:
+            self.session = session
+
+        self.patterns = [re.compile(pattern) for pattern in collections]
+        self.collections = {}
+        self.hits = 0
+        self._pages = {}
+        self._generations = {}
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def is_mirrored(self, key):
+        path = urlsplit(key).path
+        return any(pattern.search(path) for pattern in self.patterns)
+
+    def get(self, url, params=None, **kwargs):
+        '''
+        Answers the GET from the mirror when the collection, or the collection
+        of the item, is mirrored. Otherwise the GET is sent, and the pages of a
+        mirrored collection are kept until every page has been seen.
+
+        Returns:
+            A requests.Response.
+
+        '''
+        key = collection_key(url)
+        query = dict(parse_qsl(urlsplit(url).query))
+        query.update(params or {})
+
+        with self._lock:
+            collection = self.collections.get(key)
+            if collection != None:
+                self.hits += 1
+                offset = int(query.get('offset', 0))
+                limit = int(query.get('limit', DEFAULT_PAGE_LIMIT))
+                return mirror_response(url, {
+                    'kind': collection.kind,
+                    'selfLink': key,
+                    'rangeInfo': {'offset': offset, 'limit': limit, 'total': len(collection.items)},
+                    'items': collection.items[offset:offset + limit]
+                })
+
+            parent = self.collections.get(key.rsplit('/', 1)[0])
+            if parent != None and key in parent.links:
+                self.hits += 1
+                return mirror_response(url, parent.links[key])
+
+            generation = self._generations.get(key, 0)
+
+        response = self.session.get(url, params=params, **kwargs)
+        if response.ok and self.is_mirrored(key):
+            self._record_page(key, generation, response)
+        return response
+
+    def _record_page(self, key, generation, response):
+        try:
+            page = response.json()
+        except ValueError:
+            return
+        if not isinstance(page, dict) or not isinstance(page.get('items'), list):
+            return
+
+        range_info = page.get('rangeInfo', {})
+        offset = range_info.get('offset', 0)
+        total = range_info.get('total', len(page['items']))
+
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return
+            pages = self._pages.setdefault(key, {})
+            pages[offset] = page['items']
+            if sum(len(items) for items in pages.values()) < total:
+                return
+
+            items = []
+            for page_offset in sorted(pages):
+                if page_offset != len(items):
+                    return
+                items.extend(pages[page_offset])
+            del self._pages[key]
+            self.collections[key] = MirroredCollection(page.get('kind'), items[:total])
+
+    def invalidate(self, url):
+        '''
+        Drops the mirrored collection at the URL, so its next GET is sent to the ASA.
+
+        Args:
+            url: The URL of the collection.
+
+        '''
+        key = collection_key(url)
+        with self._lock:
+            self.collections.pop(key, None)
+            self._pages.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        '''
+        Drops every mirrored collection.
+
+        '''
+        with self._lock:
+            for key in list(self.collections) + list(self._pages):
+                self.invalidate(key)
+
+    def post(self, url, json=None, **kwargs):
+        '''
+        Sends the POST, and adds the created item to the mirrored collection.
+        A bulk request drops every collection named by its operations.
+
+        '''
+        response = self.session.post(url, json=json, **kwargs)
+        key = collection_key(url)
+
+        if isinstance(json, list):
+            parts = urlsplit(key)
+            for operation in json:
+                if isinstance(operation, dict) and 'resourceUri' in operation:
+                    uri = urlunsplit((parts.scheme, parts.netloc, operation['resourceUri'], '', ''))
+                    self.invalidate(uri)
+                    self.invalidate(uri.rstrip('/').rsplit('/', 1)[0])
+            return response
+
+        location = response.headers.get('Location')
+        created = None
+        try:
+            body = response.json() if response.content else None
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and 'selfLink' in body:
+            created = body
+        elif location and response.status_code == 201 and key in self.collections:
+            created = self._fetch_item(location, kwargs)
+
+        with self._lock:
+            collection = self.collections.get(key)
+            if response.status_code == 201 and created != None and collection != None:
+                collection.add(created)
+                self._generations[key] = self._generations.get(key, 0) + 1
+            else:
+                self.invalidate(key)
+
+        return response
+
+    def _fetch_item(self, location, kwargs):
+        '''
+        GETs an item created by a POST from its Location, or changed by a PUT or
+        PATCH from its selfLink, because the body that was sent is not in the
+        shape the ASA lists the item in.
+
+        Returns:
+            The item as JSON, or None if it could not be read.
+
+        '''
+        response = self.session.get(location, verify=kwargs.get('verify', False), headers=kwargs.get('headers'))
+        if not response.ok:
+            return None
+        try:
+            item = response.json()
+        except ValueError:
+            return None
+        return item if isinstance(item, dict) and 'selfLink' in item else None
+
+    def _write_item(self, method, url, json=None, **kwargs):
+        response = getattr(self.session, method)(url, json=json, **kwargs)
+        key = collection_key(url)
+        parent_key = key.rsplit('/', 1)[0]
+
+        changed = None
+        if method != 'delete' and response.ok and parent_key in self.collections:
+            changed = self._fetch_item(url, kwargs)
+
+        with self._lock:
+            collection = self.collections.get(parent_key)
+            if method == 'delete':
+                applied = response.ok and collection != None and collection.remove(key)
+            else:
+                applied = changed != None and collection != None and collection.update(key, changed)
+            if applied:
+                self._generations[parent_key] = self._generations.get(parent_key, 0) + 1
+            else:
+                self.invalidate(parent_key)
+                self.invalidate(key)
+
+        return response
+
+    def put(self, url, **kwargs):
+        return self._write_item('put', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self._write_item('patch', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._write_item('delete', url, **kwargs)
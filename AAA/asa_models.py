@@ -0,0 +1,30 @@
+class Record:
+    '''
+    The base of the __slots__ record classes built from ASA JSON (ACE, Route,
+    NetworkObject, ObjectGroup, Interface and AccessGroup). A record keeps only
+    the fields the programs use, in slots rather than a per-instance dict, and
+    compares, hashes and prints by those fields.
+
+    '''
+    __slots__ = ()
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name)) for name in self.__slots__))
+
+    def as_dict(self):
+        '''
+        Returns:
+            The record's fields as a dictionary.
+
+        '''
+        return dict(zip(self.__slots__, self._values()))
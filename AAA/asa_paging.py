@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def get_page(session, url, header, offset, limit):
+    '''
+    This function GETs one page of an ASA collection.
+
+    Args:
+        session: The ASASession used to send the API call.
+        url: The URL of the collection.
+        header: The header to use for providing the authentication token.
+        offset: The index of the first item of the page.
+        limit: The number of items in the page.
+
+    Returns:
+        The decoded JSON of the page.
+
+    '''
+    page = session.get(url, params={'offset': offset, 'limit': limit}, verify=False, headers=header)
+    page.raise_for_status()
+    return page.json()
+
+
+def asa_iter_items(session, url, header, limit=100, workers=4, ordered=False):
+    '''
+    The ASA API returns large collections a page at a time, and describes the
+    page in 'rangeInfo' ({'offset': 0, 'limit': 100, 'total': 523}). This
+    function GETs the first page, and once the total is known GETs all of the
+    remaining pages at the same time, yielding the items of each page as it
+    arrives. Every item of the collection is yielded exactly once.
+
+    Args:
+        session: The ASASession used to send the API calls.
+        url: The URL of the collection.
+        header: The header to use for providing the authentication token.
+        limit: The number of items requested per page.
+        workers: The number of pages fetched at the same time.
+        ordered: True to yield pages in order; pages are still fetched concurrently.
+
+    Yields:
+        The items of the collection, one at a time.
+
+    Raises:
+        requests.HTTPError: If the ASA rejects a page.
+
+    Example:
+
+        >>>routes = asa_iter_items(session, 'https://10.10.10.5/api/routing/static', header)
+        >>>len(list(routes))
+        1452
+
+    '''
+    first_page = get_page(session, url, header, 0, limit)
+    for item in first_page.get('items', []):
+        yield item
+
+    range_info = first_page.get('rangeInfo', {})
+    total = range_info.get('total', 0)
+    page_limit = range_info.get('limit') or limit
+    offsets = range(page_limit, total, page_limit)
+    if not offsets:
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pages = [executor.submit(get_page, session, url, header, offset, page_limit) for offset in offsets]
+        for page in (pages if ordered else as_completed(pages)):
+            for item in page.result().get('items', []):
+                yield item
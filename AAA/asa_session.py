@@ -0,0 +1,77 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class ASASession(requests.Session):
+    '''A keep-alive, connection-pooled transport shared by the ASA API classes.
+
+    The module-level requests.get/post/put open a new TCP connection and perform
+    a new TLS handshake for every call. An ASASession is created once (normally
+    by ASAAAA at login) and handed to ASAACL, ASAObject, ASARouting and
+    ASAInterface so that every API call made during a run reuses a small pool
+    of sockets to the ASA.
+
+    '''
+
+    def __init__(self, pool_size=10, retries=3, timeout=30, verify=False):
+        '''
+        The __init__ method mounts a pooled HTTPAdapter for both http and https.
+        Connection errors are retried for every method, but read and status
+        retries are only performed for idempotent methods so that a POST is
+        never sent twice.
+
+        Args:
+            pool_size: The number of connections kept open per ASA.
+            retries: The number of times a failed request is retried.
+            timeout: The default (connect, read) timeout in seconds for each call.
+            verify: Whether the ASA's certificate should be verified.
+
+        Example:
+
+            >>>session = ASASession(pool_size=4, retries=2, timeout=10)
+            >>>asa_login = ASAAAA(asa, session=session)
+            >>>header = asa_login.asa_login()
+            >>>asa_acl = ASAACL(asa, header, session=session)
+
+        '''
+        super().__init__()
+        self.authenticator = None
+        self.timeout = timeout
+        self.verify = verify
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'PUT', 'DELETE']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, authenticate=True, **kwargs):
+        '''
+        Applies the session's default timeout to any call that does not
+        provide its own, and then sends the request over the pooled connection.
+        If the ASA answers 401 to a request carrying an X-Auth-Token, the token
+        is refreshed through the authenticator and the request is sent again.
+
+        Args:
+            authenticate: False to skip the token refresh, as the login itself does.
+
+        '''
+        kwargs.setdefault('timeout', self.timeout)
+        headers = kwargs.get('headers')
+        sent_token = headers.get('X-Auth-Token') if headers else None
+        response = super().request(method, url, **kwargs)
+
+        if response.status_code == 401 and authenticate and self.authenticator and sent_token:
+            token = self.authenticator.asa_refresh_token(sent_token)
+            if token and token != sent_token:
+                kwargs['headers'] = dict(headers, **{'X-Auth-Token': token})
+                response = super().request(method, url, **kwargs)
+
+        return response
@@ -0,0 +1,117 @@
+import sys
+import json
+import socket
+import time
+import threading
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from asa_session import ASASession
+from asa_routing_class import ASARouting
+
+
+class MockASAHandler(BaseHTTPRequestHandler):
+    '''
+    A minimal stand-in for the ASA REST agent. Every GET returns a small
+    collection in the same shape as the ASA API, and every POST returns a 201.
+    The connection setup sleeps for handshake_delay seconds to stand in for
+    the TCP and TLS handshakes that a real ASA requires on each new socket.
+
+    '''
+    protocol_version = 'HTTP/1.1'
+    handshake_delay = 0.0
+    body = json.dumps({'kind': 'collection#StaticRoute', 'items': []}).encode()
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.connections += 1
+        time.sleep(self.handshake_delay)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_asa(handshake_delay=0.002):
+    '''
+    This function starts a MockASAHandler server on a free local port in a
+    background thread.
+
+    Args:
+        handshake_delay: Seconds added to the setup of each new connection.
+
+    Returns:
+        The running server; server.server_address holds the host and port.
+
+    '''
+    MockASAHandler.handshake_delay = handshake_delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockASAHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def calls_per_second(routing, calls):
+    '''
+    This function times a number of asa_get_all_static_routes calls.
+
+    Args:
+        routing: An ASARouting instance.
+        calls: The number of API calls to make.
+
+    Returns:
+        The number of API calls completed per second.
+
+    '''
+    start = time.perf_counter()
+    for _ in range(calls):
+        routing.asa_get_all_static_routes()
+    return calls / (time.perf_counter() - start)
+
+
+def main(calls=500):
+    '''
+    The purpose of this program is to compare the module-level requests calls
+    previously used by the API classes with a shared ASASession. Both runs use
+    ASARouting against a local mock ASA.
+
+    Print:
+        The calls per second and sockets opened for each transport.
+
+    Example:
+        (py3) C:\\asa_api_tests>python asa_session_benchmark.py 500
+        module-level requests:      233.6 calls/sec over 500 sockets
+        shared ASASession:          772.0 calls/sec over 1 sockets
+
+    '''
+    server = start_mock_asa()
+    base_url = 'http://{}:{}/api/routing/'.format(*server.server_address)
+    header = {'X-Auth-Token': 'benchmark', 'Content-Type': 'application/json'}
+
+    for label, session in (('module-level requests:', requests), ('shared ASASession:', ASASession())):
+        server.connections = 0
+        routing = ASARouting(server.server_address[0], header, base_url=base_url, session=session)
+        rate = calls_per_second(routing, calls)
+        print('{:<25}{:>8.1f} calls/sec over {} sockets'.format(label, rate, server.connections))
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
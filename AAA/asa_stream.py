@@ -0,0 +1,171 @@
+import json
+import codecs
+
+
+WHITESPACE = ' \t\n\r'
+
+
+class JSONItemStream:
+    '''
+    An incremental reader of an ASA collection response. The body is read from
+    the socket a chunk at a time and the members of the top level 'items' array
+    are decoded one at a time, so only the current item and one chunk of text
+    are held in memory however large the collection is. The other top level
+    values, such as 'rangeInfo', are kept in meta as they are passed.
+
+    '''
+
+    def __init__(self, response, chunk_size=64 * 1024):
+        '''
+        Args:
+            response: A requests.Response sent with stream=True.
+            chunk_size: The number of bytes read from the socket at a time.
+
+        '''
+        self.chunks = response.iter_content(chunk_size)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json = json.JSONDecoder()
+        self.buffer = ''
+        self.index = 0
+        self.eof = False
+        self.meta = {}
+
+    def _read(self):
+        chunk = next(self.chunks, None)
+        if chunk == None:
+            self.eof = True
+            self.buffer = self.buffer[self.index:] + self.decoder.decode(b'', final=True)
+        else:
+            self.buffer = self.buffer[self.index:] + self.decoder.decode(chunk)
+        self.index = 0
+
+    def _peek(self):
+        while True:
+            while self.index < len(self.buffer) and self.buffer[self.index] in WHITESPACE:
+                self.index += 1
+            if self.index < len(self.buffer):
+                return self.buffer[self.index]
+            if self.eof:
+                raise ValueError('Unexpected end of JSON response')
+            self._read()
+
+    def _expect(self, character):
+        if self._peek() != character:
+            raise ValueError('Expected {!r} at {!r}'.format(character, self.buffer[self.index:self.index + 20]))
+        self.index += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.index)
+            except ValueError:
+                value, end = None, None
+            # A number at the very end of the buffer may continue in the next chunk.
+            if end != None and (end < len(self.buffer) or self.eof):
+                self.index = end
+                return value
+            if self.eof:
+                raise ValueError('Invalid JSON at {!r}'.format(self.buffer[self.index:self.index + 20]))
+            self._read()
+
+    def __iter__(self):
+        '''
+        Yields:
+            The members of the 'items' array, in order.
+
+        '''
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == 'items' and self._peek() == '[':
+                self.index += 1
+                if self._peek() == ']':
+                    self.index += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._peek() == ']':
+                            self.index += 1
+                            break
+                        self._expect(',')
+            else:
+                self.meta[key] = self._value()
+            if self._peek() == '}':
+                self.index += 1
+                return
+            self._expect(',')
+
+
+def stream_items(response, meta=None, chunk_size=64 * 1024):
+    '''
+    This function yields the items of an ASA collection response as they are read
+    from the socket, instead of decoding the whole body with json.loads.
+
+    Args:
+        response: A requests.Response sent with stream=True.
+        meta: A dictionary that receives the other top level values, such as 'rangeInfo'.
+        chunk_size: The number of bytes read from the socket at a time.
+
+    Yields:
+        The members of the response's 'items' array, in order.
+
+    Raises:
+        requests.HTTPError: If the ASA rejected the request.
+        ValueError: If the body is not a JSON object.
+
+    '''
+    response.raise_for_status()
+    stream = JSONItemStream(response, chunk_size)
+    try:
+        for item in stream:
+            yield item
+    finally:
+        response.close()
+        if meta != None:
+            meta.update(stream.meta)
+
+
+def asa_stream_items(session, url, header, limit=100):
+    '''
+    This function is the constant memory form of asa_iter_items. Pages are
+    requested one after another with stream=True, and the items of each page
+    are decoded and yielded one at a time as they arrive, so memory use does
+    not grow with the size of the collection. The items are yielded in the
+    order the ASA lists them.
+
+    Args:
+        session: The ASASession used to send the API calls.
+        url: The URL of the collection.
+        header: The header to use for providing the authentication token.
+        limit: The number of items requested per page.
+
+    Yields:
+        The items of the collection, one at a time.
+
+    Raises:
+        requests.HTTPError: If the ASA rejects a page.
+
+    Example:
+
+        >>>rules = asa_stream_items(session, 'https://10.10.10.5/api/access/in/lab/rules', header)
+        >>>print_acls(rules)
+
+    '''
+    offset = 0
+    while True:
+        meta = {}
+        response = session.get(url, params={'offset': offset, 'limit': limit}, verify=False, headers=header,
+                               stream=True)
+        count = 0
+        for item in stream_items(response, meta):
+            count += 1
+            yield item
+
+        range_info = meta.get('rangeInfo', {})
+        offset += range_info.get('limit') or limit
+        if not count or offset >= range_info.get('total', 0):
+            return
@@ -0,0 +1,117 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class ASATokenCache:
+    '''A local, permission-restricted store of X-Auth-Tokens keyed by (asa, user).
+
+    Tokens are kept in a JSON file that only the current user can read, so a
+    token obtained by one script can be reused by the next one instead of
+    logging in again. Access is serialized with a thread lock and, where the
+    platform supports it, an flock on a sibling lock file so that concurrent
+    processes do not clobber each other's entries.
+
+    '''
+
+    def __init__(self, path=None):
+        '''
+        Args:
+            path: The file used to store tokens; defaults to ~/.asa_api/tokens.json.
+
+        Example:
+
+            >>>cache = ASATokenCache()
+            >>>asa_login = ASAAAA(asa, token_cache=cache)
+
+        '''
+        if path == None:
+            self.path = os.path.join(os.path.expanduser('~'), '.asa_api', 'tokens.json')
+        else:
+            self.path = path
+
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def lock(self):
+        '''
+        A context manager holding the cache lock for both threads and processes.
+        Token refreshes are done while holding this lock.
+
+        '''
+        with self._thread_lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            lock_file = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._depth = 1
+                yield self
+            finally:
+                self._depth = 0
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                os.close(lock_file)
+
+    def _read(self):
+        try:
+            with open(self.path) as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, tokens):
+        temp_path = self.path + '.tmp'
+        temp_file = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(temp_file, 'w') as cache_file:
+            json.dump(tokens, cache_file)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _key(asa, un):
+        return '{}|{}'.format(asa, un)
+
+    def get(self, asa, un):
+        '''
+        Returns:
+            The cached token for the ASA and user, or None if there is not one.
+
+        '''
+        with self.lock():
+            return self._read().get(self._key(asa, un))
+
+    def set(self, asa, un, token):
+        '''
+        Stores the token for the ASA and user, replacing any previous token.
+
+        '''
+        with self.lock():
+            tokens = self._read()
+            tokens[self._key(asa, un)] = token
+            self._write(tokens)
+
+    def delete(self, asa, un):
+        '''
+        Removes the token for the ASA and user if one is cached.
+
+        '''
+        with self.lock():
+            tokens = self._read()
+            if tokens.pop(self._key(asa, un), None) != None:
+                self._write(tokens)
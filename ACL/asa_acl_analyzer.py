@@ -0,0 +1,268 @@
+from bisect import bisect_right
+from collections import namedtuple
+from functools import reduce
+from operator import and_, or_
+import numpy as np
+from asa_acl_classifier import ACLClassifier, MAX_SERVICE, service_key
+
+
+ACLAnomaly = namedtuple('ACLAnomaly', 'kind position object_id by_position by_object_id count')
+
+BLOCK_SIZE = 64
+
+
+class SegmentRanges:
+    '''
+    The segments of one dimension of an ACLClassifier, with the bit vectors of
+    every BLOCK_SIZE segments, every BLOCK_SIZE of those blocks and so on
+    combined in advance, so the rules covering part of a run of segments (OR)
+    or all of it (AND) are found with a few operations per level instead of one
+    per segment.
+
+    '''
+
+    def __init__(self, starts, masks):
+        self.starts = starts
+        self.masks = masks
+        self.levels = {or_: [masks], and_: [masks]}
+        for operator, levels in self.levels.items():
+            while len(levels[-1]) > BLOCK_SIZE:
+                below = levels[-1]
+                levels.append([reduce(operator, below[block:block + BLOCK_SIZE])
+                               for block in range(0, len(below), BLOCK_SIZE)])
+
+    def locate(self, firsts, lasts):
+        '''
+        Returns:
+            Arrays of the indexes of the segments holding the first and last values of each range.
+
+        '''
+        return (np.searchsorted(self.starts, firsts, side='right') - 1,
+                np.searchsorted(self.starts, lasts, side='right') - 1)
+
+    @staticmethod
+    def spans(runs):
+        '''
+        Returns:
+            The (first, last) segment index runs sorted and merged.
+
+        '''
+        spans = []
+        for first, last in sorted(runs):
+            if spans and first <= spans[-1][1] + 1:
+                spans[-1] = (spans[-1][0], max(last, spans[-1][1]))
+            else:
+                spans.append((first, last))
+        return tuple(spans)
+
+    def gaps(self, spans):
+        '''
+        Returns:
+            The segment index runs not covered by spans.
+
+        '''
+        gaps, first = [], 0
+        for start, last in spans:
+            if start > first:
+                gaps.append((first, start - 1))
+            first = last + 1
+        if first < len(self.masks):
+            gaps.append((first, len(self.masks) - 1))
+        return gaps
+
+    def combine(self, spans, operator, empty):
+        '''
+        This method combines the bit vectors of every segment in spans with
+        operator, using the largest aligned block that fits at each step.
+
+        '''
+        levels = self.levels[operator]
+        result = empty
+        for first, last in spans:
+            while first <= last:
+                level, size = 0, 1
+                while (level + 1 < len(levels) and first % (size * BLOCK_SIZE) == 0 and
+                       first + size * BLOCK_SIZE - 1 <= last):
+                    level, size = level + 1, size * BLOCK_SIZE
+                result = operator(result, levels[level][first // size])
+                first += size
+        return result
+
+
+class ACLAnalyzer:
+    '''
+    A finder of the dead and conflicting entries of an interface's inbound ACL.
+    The ACL is compiled into an ACLClassifier, and the source, destination and
+    service of every rule become runs of the classifier's segments. The bit
+    vector of the rules that overlap a rule in one dimension is the OR of the
+    vectors of its segments, and of the rules that cover it, the AND; three of
+    each give every rule's covering and overlapping rules without comparing the
+    rules in pairs. Rules that share objects share runs, which are combined once.
+
+    Anomalies are reported as:
+
+        shadowed: an earlier rule with the other action matches everything the rule does,
+        so it never takes effect.
+        redundant: an earlier rule with the same action matches everything the rule does,
+        or a later rule with the same action, and larger than the rule, does and nothing
+        between them with the other action overlaps it; the rule can be removed without
+        changing the policy.
+        correlated: earlier rules with the other action match part, but not all, of the
+        rule, and the rule does not cover them either; the order of the rules matters.
+
+    Inactive rules are ignored, and rules that cannot be expanded are not
+    analyzed. A later rule is not used to call a rule redundant across the
+    position of a rule that could not be expanded.
+
+    Each rule is analyzed against the rest of the ACL as it is, so each anomaly
+    says that one rule can be removed, not that every reported rule can be
+    removed together: removing one rule can change the anomalies of others.
+
+    '''
+
+    def __init__(self, entries, resolve_address=None, resolve_service=None):
+        '''
+        Args:
+            entries: An iterable of an interface's ACL policy entries as JSON, an ACLTable, or an ACLClassifier.
+            resolve_address: A function of (kind, objectId) returning address ranges.
+            resolve_service: A function of (kind, objectId) returning service ranges.
+
+        Example:
+
+            >>>index = ObjectIndex(ASAObject(asa, header))
+            >>>analyzer = ACLAnalyzer(asa_acl.asa_iter_acl_access_in('lab'),
+            ...                       index.address_ranges, index.service_ranges)
+            >>>analyzer.anomalies()
+            [ACLAnomaly(kind='shadowed', position=14, object_id='2147483661', by_position=3,
+            by_object_id='3535378664', count=1)]
+
+        '''
+        if isinstance(entries, ACLClassifier):
+            self.classifier = entries
+        else:
+            self.classifier = ACLClassifier(entries, resolve_address, resolve_service)
+        classifier = self.classifier
+        table = classifier.table
+
+        self.dimensions = (SegmentRanges(classifier.src_starts, classifier.src_masks),
+                           SegmentRanges(classifier.dst_starts, classifier.dst_masks),
+                           SegmentRanges(classifier.svc_starts, classifier.svc_masks))
+
+        protocols = table.svc_protocol.astype(np.int64)
+        any_protocol = protocols == 0
+        ranges = ((table.src_rule, table.src_first.astype(np.int64), table.src_last.astype(np.int64)),
+                  (table.dst_rule, table.dst_first.astype(np.int64), table.dst_last.astype(np.int64)),
+                  (table.svc_rule,
+                   np.where(any_protocol, 0, service_key(protocols, table.svc_first.astype(np.int64))),
+                   np.where(any_protocol, MAX_SERVICE, service_key(protocols, table.svc_last.astype(np.int64)))))
+
+        self.runs = []
+        for segments, (rules, firsts, lasts) in zip(self.dimensions, ranges):
+            order = np.argsort(rules, kind='stable')
+            bounds = np.searchsorted(rules[order], np.arange(len(table) + 1)).tolist()
+            seg_firsts, seg_lasts = segments.locate(firsts[order], lasts[order])
+            runs = list(zip(seg_firsts.tolist(), seg_lasts.tolist()))
+            self.runs.append([runs[bounds[row]:bounds[row + 1]] for row in range(len(table))])
+
+        self.rows = classifier.rows.tolist()
+        self.permit = int.from_bytes(np.packbits(table.permit[classifier.rows], bitorder='little').tobytes(), 'little')
+        self.all = (1 << len(self.rows)) - 1
+        self._spans = {}
+
+    def relation(self, kind, dimension, spans):
+        '''
+        Args:
+            kind: 'cover' for the rules that cover every segment in spans, 'overlap'
+            for those that overlap any of them, or 'inside' for those that lie inside them.
+            dimension: 0 for source, 1 for destination and 2 for service.
+            spans: Segment index runs from SegmentRanges.spans.
+
+        Returns:
+            The bit vector of the rules.
+
+        '''
+        key = (kind, dimension, spans)
+        found = self._spans.get(key)
+        if found == None:
+            segments = self.dimensions[dimension]
+            if kind == 'cover':
+                found = segments.combine(spans, and_, self.all)
+            elif kind == 'overlap':
+                found = segments.combine(spans, or_, 0)
+            else:
+                found = self.relation('overlap', dimension, spans) & ~segments.combine(
+                    segments.gaps(spans), or_, 0)
+            self._spans[key] = found
+        return found
+
+    def relations(self, kind, spans):
+        '''
+        Returns:
+            The bit vector of the rules related by kind to a rule in all three dimensions.
+
+        '''
+        found = self.all
+        for dimension, dim_spans in enumerate(spans):
+            found &= self.relation(kind, dimension, dim_spans)
+            if not found:
+                break
+        return found
+
+    def anomalies(self):
+        '''
+        This method analyzes every rule.
+
+        Returns:
+            A list of ACLAnomaly tuples in position order. by_position and
+            by_object_id are the covering rule for shadowed and redundant rules,
+            and the first of the count conflicting rules for correlated rules.
+
+        '''
+        positions = self.classifier.table.position.tolist()
+        unresolved = self.classifier.unresolved
+
+        found = []
+        for bit, row in enumerate(self.rows):
+            spans = tuple(SegmentRanges.spans(runs[row]) for runs in self.runs)
+            cover = self.relations('cover', spans)
+
+            this = 1 << bit
+            earlier = this - 1
+            same = self.permit if self.permit & this else self.all & ~self.permit
+            other = self.all & ~same
+
+            covering = cover & earlier
+            if covering:
+                by = (covering & -covering).bit_length() - 1
+                found.append(self.anomaly('shadowed' if other >> by & 1 else 'redundant', row, by))
+                continue
+
+            overlap = self.relations('overlap', spans) & other
+            later = cover & same & ~(earlier | this)
+            if later:
+                # A later rule that this rule covers is itself reported redundant
+                # with this rule, so only a later rule larger than this one is used.
+                later &= ~self.relations('inside', spans)
+            if later:
+                by = (later & -later).bit_length() - 1
+                between = ((1 << by) - 1) & ~(earlier | this)
+                skipped = bisect_right(unresolved, positions[row])
+                if not overlap & between and (skipped == len(unresolved) or
+                                              unresolved[skipped] > positions[self.rows[by]]):
+                    found.append(self.anomaly('redundant', row, by))
+                    continue
+
+            conflicts = overlap & earlier & ~cover
+            if conflicts:
+                conflicts &= ~self.relations('inside', spans)
+            if conflicts:
+                found.append(self.anomaly('correlated', row, (conflicts & -conflicts).bit_length() - 1,
+                                          bin(conflicts).count('1')))
+
+        return found
+
+    def anomaly(self, kind, row, by, count=1):
+        table = self.classifier.table
+        by_row = self.rows[by]
+        return ACLAnomaly(kind, int(table.position[row]), table.object_id[row],
+                          int(table.position[by_row]), table.object_id[by_row], count)
@@ -0,0 +1,93 @@
+from asa_aaa_class import ASAAAA
+from asa_acl_class import acl_policy_config
+from asa_async_session import AsyncASASession
+
+
+class AsyncASAACL:
+    '''Asyncio counterpart of ASAACL.
+
+    The methods have the same names, arguments and return shapes as ASAACL, but
+    are coroutines sent through an AsyncASASession, so many ACL calls can be in
+    flight at once instead of one after another.
+
+    '''
+
+    def __init__(self, asa, header=None, base_url=None, session=None):
+        '''
+        Args:
+            asa: The IP or hostname to be used to reach the desired ASA.
+            header: The header to use for providing the authentication token.
+            base_url: The base URL used by all API calls in the module.
+            session: The AsyncASASession used to send every API call.
+
+        Example:
+
+            >>>asa_login = ASAAAA(asa)
+            >>>header = asa_login.asa_login()
+            >>>session = AsyncASASession(authenticator=asa_login)
+            >>>asa_acl = AsyncASAACL(asa, header, session=session)
+
+        '''
+        self.asa = asa
+
+        if header == None:
+            self.header = ASAAAA(asa).asa_login()
+        else:
+            self.header = header
+
+        if base_url == None:
+            self.base_url = "https://{}/api/access/".format(asa)
+        else:
+            self.base_url = base_url
+
+        if session == None:
+            self.session = AsyncASASession()
+        else:
+            self.session = session
+
+    async def asa_get_intfc_acl_in(self, intfc_name):
+        '''
+        Returns:
+            The inbound ACL name associated with the interface; see ASAACL.asa_get_intfc_acl_in.
+
+        '''
+        url = self.base_url + 'in/' + intfc_name
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_get_acls_in(self):
+        '''
+        Returns:
+            The inbound ACL to interface mappings; see ASAACL.asa_get_acls_in.
+
+        '''
+        url = self.base_url + 'in'
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_get_acl_access_in(self, intfc_name):
+        '''
+        Args:
+            intfc_name: The name ('name-if') of the interface to use to display inbound ACL.
+
+        Returns:
+            The inbound ACL policy of the interface; see ASAACL.asa_get_acl_access_in.
+
+        Example:
+
+            >>>asa_acl = AsyncASAACL(asa, header, session=session)
+            >>>policies = await asyncio.gather(*(asa_acl.asa_get_acl_access_in(intfc) for intfc in intfcs))
+
+        '''
+        url = self.base_url + 'in/{}/rules'.format(intfc_name)
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_configure_acl_access_in(self, intfc_name, src_kind, src, dst_kind, dst, svc_kind, svc,
+                                          remark, position):
+        '''
+        Returns:
+            The result of POSTing the new policy element; see ASAACL.asa_configure_acl_access_in.
+
+        '''
+        url = self.base_url + 'in/{}/rules'.format(intfc_name)
+        policy_config = acl_policy_config(src_kind, src, dst_kind, dst, svc_kind, svc, remark, position)
+
+        return await self.session.post(url, verify=False, headers=self.header, json=policy_config)
@@ -1,6 +1,10 @@
 import json
-import requests
+from urllib.parse import urlparse
 from asa_aaa_class import ASAAAA
+from asa_session import ASASession
+from asa_paging import asa_iter_items
+from asa_stream import asa_stream_items
+from asa_acl_models import ACE, AccessGroup
 from pprint import pprint
 
 
@@ -39,6 +43,88 @@ def determine_acl_key(kind):
         return "value"
 
 
+def acl_policy_config(src_kind, src, dst_kind, dst, svc_kind, svc, remark, position):
+    '''
+    This function builds the body used to create a new inbound ACL policy element.
+    It is shared by ASAACL, AsyncASAACL and any bulk requests so that every way of
+    adding a rule sends the same configuration.
+
+    Args:
+        src_kind: The type of source being configured (IP based or object based).
+        src: The source to use in the ACL policy.
+        dst_kind: The type of destination being configured (IP based or object based).
+        dst: The source to use in the ACL policy.
+        svc_kind: The type of destination service being configured (Protocol based or object based).
+        svc: The destination service to use in the ACL policy.
+        remark: A remark explaining the rules purpose.
+        position: The position the new rule should occupy within the ACL
+
+    Returns:
+        A dictionary of the ACL policy configuration.
+
+    '''
+    return {
+        "sourceAddress": {
+            "kind": src_kind,
+            "{}".format(determine_acl_key(src_kind)): src
+        },
+        "destinationAddress": {
+            "kind": dst_kind,
+            "{}".format(determine_acl_key(dst_kind)): dst
+        },
+        "destinationService": {
+            "kind": svc_kind,
+            "{}".format(determine_acl_key(svc_kind)): svc
+        },
+        "ruleLogging": {
+            "logInterval": "300",
+            "logStatus": "Informational"
+        },
+        "permit": "true",
+        "remarks": [remark],
+        "position": position
+    }
+
+
+def bulk_results(bulk_response, count):
+    '''
+    This function matches the response of a bulk request to its operations.
+    The ASA returns a list with one entry per operation when it accepts the
+    request; entries carrying a 'code' of 400 or more are failed operations.
+    If the whole request is rejected, every operation is reported as failed
+    with the status of the request. If the request is accepted but the body
+    does not hold one entry per operation, the result of each operation is
+    unknown, and ok is None; the ACLs written to should be read again before
+    their positions are trusted.
+
+    Args:
+        bulk_response: The response of asa_bulk_configure_acl_access_in.
+        count: The number of operations in the request.
+
+    Returns:
+        A list of (ok, status_code, detail) tuples in operation order; ok is
+        True, False, or None when the result is unknown.
+
+    '''
+    if not bulk_response.ok:
+        return [(False, bulk_response.status_code, bulk_response.content)] * count
+
+    try:
+        entries = bulk_response.json()
+    except ValueError:
+        entries = None
+
+    if not isinstance(entries, list) or len(entries) != count:
+        return [(None, bulk_response.status_code, bulk_response.content)] * count
+
+    results = []
+    for entry in entries:
+        code = entry.get('code', bulk_response.status_code) if isinstance(entry, dict) else bulk_response.status_code
+        results.append((int(code) < 400, int(code), entry))
+
+    return results
+
+
 class ASAACL:
     '''Methods for making ACL related API calls to a Cisco ASA.
 
@@ -49,18 +135,21 @@ class ASAACL:
 
     '''
 
-    def __init__(self, asa, header=None, base_url=None):
+    def __init__(self, asa, header=None, base_url=None, session=None):
         '''
         The __init__ method requires an ASA name or IP that can be used to make API calls.
         It is expected that the ASAAAA class will be used to obtain a header containing a
         valid authentication token; however, a user will be prompted to initialize ASAAAA and
         obtain the necessary token if none is provided. The default base URL is based on Cisco's
         API documentation; all methods will build off the base URL for making an API call.
+        The session should be the ASASession kept by ASAAAA at login, so that all classes
+        share one pool of keep-alive connections to the ASA.
 
         Args:
             asa: The IP or hostname to be used to reach the desired ASA.
             header: The header to use for providing the authentication token.
             base_url: The base URL used by all API calls in the module.
+            session: The ASASession used to send every API call.
 
         Example:
 
@@ -73,7 +162,7 @@ class ASAACL:
 
             LOGIN STATUS_CODE: 204 OK
 
-            >>>asa_acl = ASAACL(asa, header)
+            >>>asa_acl = ASAACL(asa, header, session=asa_login.session)
 
         '''
         self.asa = asa
@@ -88,6 +177,11 @@ class ASAACL:
         else:
             self.base_url = base_url
 
+        if session == None:
+            self.session = ASASession()
+        else:
+            self.session = session
+
     def asa_get_intfc_acl_in(self, intfc_name):
         '''
         This method returns the inbound ACL name associated for a specified interface.
@@ -115,7 +209,7 @@ class ASAACL:
 
         '''
         url = self.base_url + 'in/' + intfc_name
-        return requests.get(url, verify=False, headers=self.header)
+        return self.session.get(url, verify=False, headers=self.header)
 
     def asa_get_acls_in(self):
         '''
@@ -153,7 +247,30 @@ class ASAACL:
 
         '''
         url = self.base_url + 'in'
-        return requests.get(url, verify=False, headers=self.header)
+        return self.session.get(url, verify=False, headers=self.header)
+
+    def asa_iter_acls_in(self, limit=100, workers=4, records=False):
+        '''
+        This method is the paged form of asa_get_acls_in. It follows
+        every page of the collection, fetching the pages after the first one at the
+        same time, so the whole collection is returned however large it is.
+
+        Args:
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+            records: True to return AccessGroup records instead of the JSON items.
+
+        Returns:
+            A generator of inbound access-group mappings, yielded as each page arrives.
+
+        Example:
+
+            >>>access_groups = list(asa_acls.asa_iter_acls_in())
+
+        '''
+        url = self.base_url + 'in'
+        items = asa_iter_items(self.session, url, self.header, limit, workers)
+        return map(AccessGroup.from_json, items) if records else items
 
     def asa_get_acl_access_in(self, intfc_name):
         '''
@@ -216,7 +333,55 @@ class ASAACL:
 
         '''
         url = self.base_url + 'in/{}/rules'.format(intfc_name)
-        return requests.get(url, verify=False, headers=self.header)
+        return self.session.get(url, verify=False, headers=self.header)
+
+    def asa_iter_acl_access_in(self, intfc_name, limit=100, workers=4, records=False):
+        '''
+        This method is the paged form of asa_get_acl_access_in. It follows
+        every page of the collection, fetching the pages after the first one at the
+        same time, so the whole collection is returned however large it is.
+
+        Args:
+            intfc_name: The name ('name-if') of the interface to use to display inbound ACL.
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+            records: True to return ACE records instead of the JSON items.
+
+        Returns:
+            A generator of inbound ACL policy entries; pages may arrive out of order, so sort on
+            'position' if order matters, yielded as each page arrives.
+
+        Example:
+
+            >>>acl_policy = sorted(asa_acl.asa_iter_acl_access_in('lab'), key=lambda entry: entry['position'])
+
+        '''
+        url = self.base_url + 'in/{}/rules'.format(intfc_name)
+        items = asa_iter_items(self.session, url, self.header, limit, workers)
+        return map(ACE.from_json, items) if records else items
+
+    def asa_stream_acl_access_in(self, intfc_name, limit=100, records=False):
+        '''
+        This method is the constant memory form of asa_iter_acl_access_in. The pages
+        are requested one after another and each item is decoded from the socket as
+        it arrives, so a very large collection is never held in memory at once.
+
+        Args:
+            intfc_name: The name ('name-if') of the interface to use to display inbound ACL.
+            limit: The number of items requested per page.
+            records: True to return ACE records instead of the JSON items.
+
+        Returns:
+            A generator of inbound ACL policy entries, yielded in the order the ASA lists them.
+
+        Example:
+
+            >>>print_acls(asa_acl.asa_stream_acl_access_in('lab'))
+
+        '''
+        url = self.base_url + 'in/{}/rules'.format(intfc_name)
+        items = asa_stream_items(self.session, url, self.header, limit)
+        return map(ACE.from_json, items) if records else items
 
     def asa_configure_acl_access_in(self, intfc_name, src_kind, src, dst_kind, dst, svc_kind, svc, remark, position):
         '''
@@ -250,26 +415,42 @@ class ASAACL:
 
         '''
         url = self.base_url + 'in/{}/rules'.format(intfc_name)
-        policy_config = {
-            "sourceAddress": {
-                "kind": src_kind,
-                "{}".format(determine_acl_key(src_kind)): src
-            },
-            "destinationAddress": {
-                "kind": dst_kind,
-                "{}".format(determine_acl_key(dst_kind)): dst
-            },
-            "destinationService": {
-                "kind": svc_kind,
-                "{}".format(determine_acl_key(svc_kind)): svc
-            },
-            "ruleLogging": {
-                "logInterval": "300",
-                "logStatus": "Informational"
-            },
-            "permit": "true",
-            "remarks": [remark],
-            "position": position
-        }
-
-        return requests.post(url, verify=False, headers=self.header, json=policy_config)
+        policy_config = acl_policy_config(src_kind, src, dst_kind, dst, svc_kind, svc, remark, position)
+
+        return self.session.post(url, verify=False, headers=self.header, json=policy_config)
+
+    def asa_bulk_configure_acl_access_in(self, policies):
+        '''
+        This method uses the ASA bulk API to apply many new policy elements with a
+        single POST. Each policy element becomes one operation in the request, in
+        the same order as given, so a large change can be sent in a few requests
+        instead of one request per rule.
+
+        Args:
+            policies: A list of (intfc_name, policy_config) tuples, where policy_config
+            is built with acl_policy_config.
+
+        Returns:
+            A 'request.post()' of the bulk request. When the ASA returns one entry per
+            operation, bulk_results can be used to match them to the policies.
+
+        Example:
+
+            >>>asa_acl = ASAACL(asa, header)
+            >>>policies = [('lab', acl_policy_config('IPv4Address', '10.1.4.28', 'objectRef#NetworkObj',
+            'webhost', 'TcpUdpService', 'tcp/80', 'Approved Ticket: 5678', 20))]
+            >>>bulk_config = asa_acl.asa_bulk_configure_acl_access_in(policies)
+            >>>print('STATUS_CODE: {}'.format(bulk_config.status_code))
+            STATUS_CODE: 200
+
+        '''
+        api_path = urlparse(self.base_url).path
+        url = self.base_url[:self.base_url.index('/api/') + len('/api')]
+        operations = [{
+            'resourceUri': api_path + 'in/{}/rules'.format(intfc_name),
+            'data': policy_config,
+            'method': 'Post'
+        } for intfc_name, policy_config in policies]
+
+        return self.session.post(url, verify=False, headers=self.header, json=operations)
+
@@ -0,0 +1,270 @@
+from collections import namedtuple
+import numpy as np
+from asa_acl_table import ACLTable, flow_service
+from asa_routing_functions import ip_to_int
+
+
+FlowDecision = namedtuple('FlowDecision', 'flow permitted object_id position valid')
+
+MAX_SERVICE = (255 << 16) | 65535
+
+
+def service_key(protocol, port):
+    '''
+    Returns:
+        The protocol and port combined into one integer, so services are searched as one dimension.
+
+    '''
+    return (protocol << 16) | port
+
+
+def segment_masks(rules, firsts, lasts, bits):
+    '''
+    This function splits one dimension (source, destination or service) into
+    the elementary segments formed by the starts and ends of every rule's
+    ranges, and computes for each segment the bit vector of the rules that
+    cover it. A rule can have several, possibly overlapping, ranges in a
+    dimension, so a count of covering ranges is kept per rule as the segments
+    are swept in order.
+
+    Args:
+        rules: The row of the rule that owns each range.
+        firsts: The first value of each range.
+        lasts: The last value of each range.
+        bits: The bit of each row, or -1 for rows that are not classified.
+
+    Returns:
+        A tuple of the segment starts as an array, and the bit vector (an int)
+        of each segment. Equal bit vectors are shared between segments. They
+        are found by the hash of the vector's bytes rather than by using the
+        vectors as keys: the hash of an int is not cached, so the dictionary
+        would hash every vector again each time it grows, and it is the
+        remainder by 2 ** 61 - 1, which is the same for many vectors that
+        differ only in bits 61 apart.
+
+    '''
+    events = {}
+    for rule, first, last in zip(rules.tolist(), firsts.tolist(), lasts.tolist()):
+        bit = bits[rule]
+        if bit < 0:
+            continue
+        events.setdefault(first, []).append((bit, 1))
+        events.setdefault(last + 1, []).append((bit, -1))
+
+    starts, masks, shared = [0], [0], {}
+    counts = {}
+    mask = 0
+    for start in sorted(events):
+        for bit, step in events[start]:
+            count = counts.get(bit, 0) + step
+            counts[bit] = count
+            if (count == 0 and step < 0) or (count == 1 and step > 0):
+                mask ^= 1 << bit
+        equal = shared.setdefault(hash(mask.to_bytes((mask.bit_length() + 7) // 8, 'little')), [])
+        for found in equal:
+            if found == mask:
+                mask = found
+                break
+        else:
+            equal.append(mask)
+        if starts[-1] == start:
+            masks[-1] = mask
+        else:
+            starts.append(start)
+            masks.append(mask)
+
+    return np.array(starts, dtype=np.int64), masks
+
+
+class ACLClassifier:
+    '''
+    An offline form of packet-tracer for one interface's inbound ACL. The
+    active rules are compiled into a bit vector classifier: the source,
+    destination and service (protocol and port) dimensions are each split into
+    segments, and each segment holds a bit vector of the rules that cover it,
+    with the first rule of the policy in the lowest bit. A flow is classified by
+    finding its segment in each dimension with a binary search over all flows at
+    once, and the first matching rule is the lowest set bit of the AND of the
+    three vectors, so the cost does not grow with the position of the match.
+
+    Object and object-group references are expanded with the resolvers, normally
+    the address_ranges and service_ranges methods of an ObjectIndex. Rules that
+    cannot be expanded are left out and listed in unresolved, so a decision made
+    after one of their positions should be checked on the ASA.
+
+    '''
+
+    def __init__(self, entries, resolve_address=None, resolve_service=None):
+        '''
+        Args:
+            entries: An iterable of an interface's ACL policy entries as JSON, or an ACLTable.
+            resolve_address: A function of (kind, objectId) returning address ranges.
+            resolve_service: A function of (kind, objectId) returning service ranges.
+
+        Example:
+
+            >>>index = ObjectIndex(ASAObject(asa, header))
+            >>>classifier = ACLClassifier(asa_acl.asa_iter_acl_access_in('lab'),
+            ...                           index.address_ranges, index.service_ranges)
+            >>>classifier.decide([('10.1.1.22', '10.2.2.22', 'tcp', 443)])
+            [FlowDecision(flow=('10.1.1.22', '10.2.2.22', 'tcp', 443), permitted=True,
+            object_id='3535378664', position=2, valid=True)]
+
+        '''
+        if isinstance(entries, ACLTable):
+            self.table = entries
+        else:
+            self.table = ACLTable(entries, resolve_address, resolve_service)
+        table = self.table
+
+        classified = table.active & table.resolved
+        order = np.argsort(table.position, kind='stable')
+        self.rows = order[classified[order]]
+        bits = np.full(len(table), -1, dtype=np.int64)
+        bits[self.rows] = np.arange(len(self.rows))
+        bits = bits.tolist()
+
+        self.unresolved = sorted(table.position[table.active & ~table.resolved].tolist())
+        self.src_starts, self.src_masks = segment_masks(table.src_rule, table.src_first, table.src_last, bits)
+        self.dst_starts, self.dst_masks = segment_masks(table.dst_rule, table.dst_first, table.dst_last, bits)
+
+        protocols = table.svc_protocol.astype(np.int64)
+        any_protocol = protocols == 0
+        svc_first = np.where(any_protocol, 0, service_key(protocols, table.svc_first.astype(np.int64)))
+        svc_last = np.where(any_protocol, MAX_SERVICE, service_key(protocols, table.svc_last.astype(np.int64)))
+        self.svc_starts, self.svc_masks = segment_masks(table.svc_rule, svc_first, svc_last, bits)
+
+    def match(self, sources, destinations, protocols, ports):
+        '''
+        This method finds the first matching rule for a batch of flows.
+
+        Args:
+            sources: A uint32 array of source addresses, such as from addresses_to_array.
+            destinations: A uint32 array of destination addresses.
+            protocols: An array of protocol numbers.
+            ports: An array of destination ports; 0 for protocols without ports.
+
+        Returns:
+            An array of the ACLTable row of the first matching rule of each flow,
+            with -1 where no rule matches (the implicit deny).
+
+        '''
+        src = np.searchsorted(self.src_starts, np.asarray(sources, dtype=np.int64), side='right') - 1
+        dst = np.searchsorted(self.dst_starts, np.asarray(destinations, dtype=np.int64), side='right') - 1
+        svc = np.searchsorted(self.svc_starts, service_key(np.asarray(protocols, dtype=np.int64),
+                                                           np.asarray(ports, dtype=np.int64)), side='right') - 1
+
+        src_masks, dst_masks, svc_masks, rows = self.src_masks, self.dst_masks, self.svc_masks, self.rows.tolist()
+        found = []
+        seen = {}
+        for segments in zip(src.tolist(), dst.tolist(), svc.tolist()):
+            row = seen.get(segments)
+            if row == None:
+                mask = src_masks[segments[0]] & dst_masks[segments[1]] & svc_masks[segments[2]]
+                row = rows[(mask & -mask).bit_length() - 1] if mask else -1
+                seen[segments] = row
+            found.append(row)
+
+        return np.array(found, dtype=np.int64)
+
+    def skipped_matches(self, sources, destinations, protocols, ports, rows):
+        '''
+        This method finds, for each flow, the rules left out as unresolved that
+        come before the flow's matching rule and could match the flow instead. A
+        rule could match when every source, destination or service that was
+        expanded contains the flow; the parts that could not be expanded are
+        taken to contain it.
+
+        Args:
+            sources: A uint32 array of source addresses.
+            destinations: A uint32 array of destination addresses.
+            protocols: An array of protocol numbers.
+            ports: An array of destination ports.
+            rows: The rows returned by match for the same flows.
+
+        Returns:
+            A list with a tuple of the positions of those rules for each flow,
+            empty where the decision does not depend on an unresolved rule.
+
+        '''
+        table = self.table
+        rows = np.asarray(rows, dtype=np.int64)
+        found = [() for row in rows.tolist()]
+        skipped = np.flatnonzero(table.active & ~table.resolved)
+        if not len(skipped) or not len(rows):
+            return found
+
+        sources = np.asarray(sources, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        protocols = np.asarray(protocols, dtype=np.int64)
+        ports = np.asarray(ports, dtype=np.int64)
+        decided = np.where(rows >= 0, table.position[np.maximum(rows, 0)], np.iinfo(np.int64).max)
+
+        sides = []
+        for rule_column, columns in ((table.src_rule, (table.src_first, table.src_last)),
+                                     (table.dst_rule, (table.dst_first, table.dst_last)),
+                                     (table.svc_rule, (table.svc_protocol, table.svc_first, table.svc_last))):
+            order = np.argsort(rule_column, kind='stable')
+            bounds = np.searchsorted(rule_column[order], np.stack([skipped, skipped + 1]))
+            sides.append((bounds, [column[order].astype(np.int64) for column in columns]))
+
+        for number, row in enumerate(skipped.tolist()):
+            selected = np.flatnonzero(decided > table.position[row])
+            for side, (bounds, columns) in enumerate(sides):
+                ranges = [column[bounds[0, number]:bounds[1, number]].tolist() for column in columns]
+                if not ranges[0] or not len(selected):
+                    continue
+                hits = np.zeros(len(selected), dtype=bool)
+                if side < 2:
+                    values = (sources if side == 0 else destinations)[selected]
+                    for first, last in zip(*ranges):
+                        hits |= (first <= values) & (values <= last)
+                else:
+                    for protocol, first, last in zip(*ranges):
+                        hits |= (((protocols[selected] == protocol) | (protocol == 0)) &
+                                 (first <= ports[selected]) & (ports[selected] <= last))
+                selected = selected[hits]
+
+            position = int(table.position[row])
+            for flow in selected.tolist():
+                found[flow] += (position,)
+        return found
+
+    def decide(self, flows):
+        '''
+        This method classifies flows given as text, such as read from a file.
+
+        Args:
+            flows: A list of (source, destination, protocol, port) tuples, where the
+            addresses are dotted strings and protocol is a name or number.
+
+        Returns:
+            A list of FlowDecision tuples in the order of flows. object_id and
+            position are None where the flow falls to the implicit deny. A flow
+            with an address, protocol or port that is not understood is not
+            classified; it is denied with valid False.
+
+        '''
+        parsed = []
+        for flow in flows:
+            try:
+                addresses = ip_to_int(str(flow[0]).strip()), ip_to_int(str(flow[1]).strip())
+            except OSError:
+                addresses = None
+            service = flow_service(flow[2], flow[3])
+            parsed.append(addresses + service if addresses and service else None)
+
+        valid = [values for values in parsed if values]
+        rows = iter(self.match(*np.array(valid, dtype=np.int64).reshape(-1, 4).T).tolist() if valid else ())
+
+        decisions = []
+        for flow, values in zip(flows, parsed):
+            row = next(rows) if values else -1
+            if values == None:
+                decisions.append(FlowDecision(flow, False, None, None, False))
+            elif row < 0:
+                decisions.append(FlowDecision(flow, False, None, None, True))
+            else:
+                decisions.append(FlowDecision(flow, bool(self.table.permit[row]), self.table.object_id[row],
+                                              int(self.table.position[row]), True))
+        return decisions
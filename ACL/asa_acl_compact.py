@@ -0,0 +1,286 @@
+from collections import namedtuple
+import numpy as np
+from asa_acl_analyzer import ACLAnalyzer, SegmentRanges
+from asa_acl_classifier import ACLClassifier
+from asa_object_expand import merge_intervals, interval_to_cidrs
+from asa_routing_functions import int_to_ip
+
+
+CompactionStep = namedtuple('CompactionStep', 'side permission positions object_ids members elements_before '
+                                              'elements_after')
+
+ANCHORS = 16
+
+LITERAL_ADDRESSES = ('AnyIPAddress', 'IPv4Address', 'IPv4Network', 'IPv4Range')
+
+
+def cidr_member(cidr):
+    '''
+    Returns:
+        A network as the source, destination or object-group member used by the ASA API.
+
+    '''
+    if cidr == '0.0.0.0/0':
+        return {'kind': 'AnyIPAddress', 'value': 'any4'}
+    elif cidr.endswith('/32'):
+        return {'kind': 'IPv4Address', 'value': cidr[:-len('/32')]}
+    return {'kind': 'IPv4Network', 'value': cidr}
+
+
+def interval_member(first, last):
+    '''
+    Returns:
+        A range of addresses as one member: a host or network when it is one CIDR, and an IPv4Range otherwise.
+
+    '''
+    cidrs = interval_to_cidrs(first, last)
+    if len(cidrs) == 1:
+        return cidr_member(cidrs[0])
+    return {'kind': 'IPv4Range', 'value': '{}-{}'.format(int_to_ip(first), int_to_ip(last))}
+
+
+class CompactionPlanner:
+    '''
+    A planner of the merges that make an interface's inbound ACL smaller. Rules
+    added one ticket at a time often differ only in their source, or only in
+    their destination. Rules with the same action, destination and service have
+    their sources merged into one rule, and then rules with the same action,
+    source and service have their destinations merged. Literal hosts, networks
+    and ranges are merged into the fewest ranges that cover them exactly, each
+    kept as a host, network or IPv4Range, and a merge that is left with more
+    than one member is proposed as a new object group. A merge is only planned
+    when it makes the element count smaller.
+
+    A merge keeps the first rule and removes the others, which moves their
+    traffic up to the first rule's position. A rule is only merged when that
+    keeps its order with every rule that overlaps it with the other action,
+    including rules already moved by the plan, using the overlap bit vectors of
+    an ACLAnalyzer, so the plan does not change what the ACL permits. Inactive
+    rules and rules that cannot be expanded are not merged, and no rule is
+    moved across a rule that cannot be expanded.
+
+    The element count of a rule is the product of the element counts of its
+    source, destination and service, as the ASA expands them when the ACL is
+    compiled.
+
+    '''
+
+    def __init__(self, entries, resolve_address=None, resolve_service=None, size=None):
+        '''
+        Args:
+            entries: An iterable of an interface's ACL policy entries as JSON, an ACLTable, an
+            ACLClassifier or an ACLAnalyzer.
+            resolve_address: A function of (kind, objectId) returning address ranges.
+            resolve_service: A function of (kind, objectId) returning service ranges.
+            size: A function of (kind, objectId) returning the element count of an object or
+            group; by default an object or group counts as the ranges it expands to.
+
+        Example:
+
+            >>>index = ObjectIndex(ASAObject(asa, header))
+            >>>planner = CompactionPlanner(asa_acl.asa_iter_acl_access_in('lab'),
+            ...                            index.address_ranges, index.service_ranges)
+            >>>planner.plan()
+            [CompactionStep(side='source', permission='permit', positions=(12, 13), object_ids=('3535378664',
+            '1183290466'), members=({'kind': 'IPv4Network', 'value': '10.1.4.0/23'},), elements_before=2,
+            elements_after=1)]
+
+        '''
+        if isinstance(entries, ACLAnalyzer):
+            self.analyzer = entries
+        else:
+            if not isinstance(entries, ACLClassifier):
+                entries = ACLClassifier(entries, resolve_address, resolve_service)
+            self.analyzer = ACLAnalyzer(entries)
+        self.table = table = self.analyzer.classifier.table
+        self.names = {code: kind for kind, code in table.kinds.items()}
+
+        self.ranges = {}
+        for side, (rules, firsts, lasts) in (('source', (table.src_rule, table.src_first, table.src_last)),
+                                             ('destination', (table.dst_rule, table.dst_first, table.dst_last))):
+            order = np.argsort(rules, kind='stable')
+            bounds = np.searchsorted(rules[order], np.arange(len(table) + 1)).tolist()
+            values = list(zip(firsts[order].tolist(), lasts[order].tolist()))
+            self.ranges[side] = [values[bounds[row]:bounds[row + 1]] for row in range(len(table))]
+        self.elements = {side: np.bincount(rules, minlength=len(table)).tolist()
+                         for side, rules in (('source', table.src_rule), ('destination', table.dst_rule),
+                                             ('service', table.svc_rule))}
+        for side in ('source', 'destination', 'service') if size else ():
+            for row in range(len(table)):
+                kind = self.kind(side, row)
+                if 'objectRef' in kind:
+                    self.elements[side][row] = size(kind, getattr(table, side)[row])
+
+        self.bits = {row: bit for bit, row in enumerate(self.analyzer.rows)}
+        self.moved = {}
+        self.moved_mask = 0
+        self._conflicts = {}
+
+    def kind(self, side, row):
+        return self.names[getattr(self.table, side + '_kind')[row]]
+
+    def rule_elements(self, row):
+        return self.elements['source'][row] * self.elements['destination'][row] * self.elements['service'][row]
+
+    def conflicts(self, row):
+        '''
+        Returns:
+            The bit vector of the rules that overlap the rule with the other action.
+
+        '''
+        found = self._conflicts.get(row)
+        if found == None:
+            analyzer = self.analyzer
+            spans = tuple(SegmentRanges.spans(runs[row]) for runs in analyzer.runs)
+            other = analyzer.all & ~analyzer.permit if self.table.permit[row] else analyzer.permit
+            found = self._conflicts[row] = analyzer.relations('overlap', spans) & other
+        return found
+
+    def movable(self, anchor, row):
+        '''
+        Returns:
+            True if the rule can be moved up to the anchor's position without changing the ACL's decisions.
+
+        '''
+        analyzer = self.analyzer
+        anchor_bit, bit = self.bits[anchor], self.bits[row]
+        conflicts = self.conflicts(row)
+        moved = conflicts & self.moved_mask
+        window = (1 << (bit - anchor_bit - 1)) - 1
+        if ((conflicts ^ moved) >> (anchor_bit + 1)) & window:
+            return False
+
+        # A moved rule keeps its order with this one if, when it was first between
+        # the two, it has been moved above the anchor, and if it was first after
+        # this one, it has not.
+        for moved, offset, above in ((moved >> (anchor_bit + 1) & window, anchor_bit + 1, True),
+                                     (moved >> (bit + 1), bit + 1, False)):
+            while moved:
+                low_bit = moved & -moved
+                if (self.moved[offset + low_bit.bit_length() - 1] < anchor_bit) != above:
+                    return False
+                moved ^= low_bit
+
+        low, high = self.table.position[anchor], self.table.position[row]
+        return not any(low < position < high for position in analyzer.classifier.unresolved)
+
+    def unmove(self, row):
+        '''
+        Records that a rule is not merged after all, so it takes effect at its own position again.
+
+        '''
+        bit = self.bits[row]
+        self.moved.pop(bit, None)
+        self.moved_mask &= ~(1 << bit)
+
+    def move(self, anchor, row):
+        '''
+        Records that the rule is merged into the anchor, so it now takes effect at the anchor's position.
+
+        '''
+        bit = self.bits[row]
+        self.moved[bit] = self.bits[anchor]
+        self.moved_mask |= 1 << bit
+
+    def clusters(self, rows):
+        '''
+        This method splits rules that share a key into the groups that can be
+        merged. Each rule joins the first group it can be moved into, or starts
+        a new group. Only the first and the latest ANCHORS groups are tried, so
+        a key shared by thousands of rules that conflict with each other does
+        not make the plan quadratic.
+
+        Returns:
+            A list of lists of rows, each in position order with the rule that is kept first.
+
+        '''
+        clusters = []
+        for row in rows:
+            for cluster in clusters[:ANCHORS] + clusters[max(ANCHORS, len(clusters) - ANCHORS):]:
+                if self.movable(cluster[0], row):
+                    self.move(cluster[0], row)
+                    cluster.append(row)
+                    break
+            else:
+                clusters.append([row])
+        return clusters
+
+    def merge(self, side, rows):
+        '''
+        This method merges the source or destination of rules.
+
+        Returns:
+            A CompactionStep.
+
+        '''
+        table = self.table
+        literals = []
+        references = {}
+        for row in rows:
+            kind = self.kind(side, row)
+            if kind in LITERAL_ADDRESSES:
+                literals.extend(self.ranges[side][row])
+            else:
+                references.setdefault((kind, getattr(table, side)[row]), row)
+
+        members = [interval_member(first, last) for first, last in merge_intervals(literals)]
+        literal_count = len(members)
+        members.extend({'kind': kind, 'objectId': object_id} for kind, object_id in references)
+
+        other = 'destination' if side == 'source' else 'source'
+        fixed = self.elements[other][rows[0]] * self.elements['service'][rows[0]]
+        side_elements = literal_count + sum(self.elements[side][row] for row in references.values())
+        return CompactionStep(side, 'permit' if table.permit[rows[0]] else 'deny',
+                              tuple(int(table.position[row]) for row in rows),
+                              tuple(table.object_id[row] for row in rows), tuple(members),
+                              sum(self.rule_elements(row) for row in rows), side_elements * fixed)
+
+    def plan(self):
+        '''
+        This method plans the merges of the whole ACL.
+
+        Returns:
+            A list of CompactionSteps in the order of the kept rules' positions. members
+            are the merged side's new value, or the members of a proposed object group
+            when there is more than one. Merges that would not make the element count
+            smaller are left out, and their rules are not moved.
+
+        '''
+        table = self.table
+        steps = []
+        merged = set()
+        for side, other in (('source', 'destination'), ('destination', 'source')):
+            keys = {}
+            for row in self.analyzer.rows:
+                if row in merged:
+                    continue
+                key = (bool(table.permit[row]), self.kind(other, row), getattr(table, other)[row],
+                       self.kind('service', row), table.service[row])
+                keys.setdefault(key, []).append(row)
+
+            for rows in keys.values():
+                for cluster in self.clusters(rows):
+                    if len(cluster) < 2:
+                        continue
+                    step = self.merge(side, cluster)
+                    if step.elements_after < step.elements_before:
+                        steps.append(step)
+                        merged.update(cluster)
+                    else:
+                        for row in cluster[1:]:
+                            self.unmove(row)
+
+        return sorted(steps, key=lambda step: step.positions[0])
+
+    def report(self, steps=None):
+        '''
+        Returns:
+            A tuple of the ACL's element count, the element count after the plan, and
+            the number of rules the plan removes.
+
+        '''
+        if steps == None:
+            steps = self.plan()
+        before = sum(self.rule_elements(row) for row in self.analyzer.rows)
+        after = before - sum(step.elements_before - step.elements_after for step in steps)
+        return before, after, sum(len(step.positions) - 1 for step in steps)
@@ -0,0 +1,97 @@
+import argparse
+from functools import partial
+from asa_aaa_class import ASAAAA
+from asa_acl_class import ASAACL
+from asa_object_class import ASAObject
+from asa_object_functions import ObjectIndex
+from asa_acl_functions import sort_access_groups
+from asa_acl_elements import ElementCounter, top_offenders
+from asa_snapshot_functions import ASASnapshotStore
+
+
+def main():
+    '''
+    The purpose of this program is to estimate the element count of the inbound
+    ACLs of an ASA, the number of ACEs the ASA expands them into, without
+    compiling them on the ASA. The access-groups, ACL entries and objects are
+    collected from the ASA, or from the newest snapshot of the ASA, and counted
+    with an ElementCounter.
+
+    Print:
+        The element count of each interface's ACL and the entries with the largest
+        element counts, and the element count of the whole ASA.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_acl_element_count.py -t 2
+        What ASA do you want to count? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        Interface lab (lab_access_in): 418 elements in 37 entries
+            rule 3 (3535378664): 120 elements (3 sources x 4 destinations x 10 services)
+            rule 9 (620514475): 64 elements (8 sources x 8 destinations x 1 services)
+
+        Interface weblab (weblab_access_in): 22 elements in 9 entries
+            rule 1 (938417220): 6 elements (1 sources x 3 destinations x 2 services)
+            rule 4 (1183290466): 4 elements (2 sources x 2 destinations x 1 services)
+
+        Total: 440 elements
+
+    '''
+    parser = argparse.ArgumentParser(description='Estimate the element count of the inbound ACLs of an ASA.')
+    parser.add_argument('-i', '--interface', help="Only count the ACL of this interface ('name-if').")
+    parser.add_argument('-t', '--top', type=int, default=5, help='The number of largest entries to print per ACL.')
+    parser.add_argument('-d', '--database', help='Use the newest snapshot in this database instead of the ASA.')
+    options = parser.parse_args()
+
+    asa = input('What ASA do you want to count? ')
+    if options.database:
+        store = ASASnapshotStore(options.database)
+        snapshot = store.latest(asa)
+        counter = ElementCounter(store.object_index(snapshot))
+        groups = map(sort_access_groups, store.items(snapshot, 'access_groups'))
+        acl_rules = partial(store.items, snapshot, 'acl_rules')
+    else:
+        login_cred = ASAAAA(asa)
+        header = login_cred.asa_login()
+        acl = ASAACL(asa, header, session=login_cred.session)
+        counter = ElementCounter(ObjectIndex(ASAObject(asa, header, session=login_cred.session)))
+        groups = acl.asa_iter_acls_in(records=True)
+        acl_rules = acl.asa_iter_acl_access_in
+
+    total = 0
+    for group in groups:
+        if group.direction.upper() != 'IN' or (options.interface and group.interface != options.interface):
+            continue
+        elements, rules = counter.count(acl_rules(group.interface))
+        total += elements
+        print_acl_elements(group, elements, rules, options.top)
+
+    if counter.unresolved:
+        print('\nREFERENCES NOT FOUND, COUNTED AS ONE ELEMENT: {}'.format(
+            ', '.join(object_id for kind, object_id in sorted(counter.unresolved))))
+    print('\nTotal: {} elements'.format(total))
+
+
+def print_acl_elements(group, elements, rules, top=5):
+    '''
+    This function prints the element count of one ACL and its largest entries.
+
+    Args:
+        group: The AccessGroup of the ACL.
+        elements: The element count of the ACL.
+        rules: The RuleElements of the ACL's entries.
+        top: The number of largest entries to print.
+
+    '''
+    print('\nInterface {} ({}): {} elements in {} entries'.format(group.interface, group.acl, elements, len(rules)))
+    for rule in top_offenders(rules, top):
+        print('    rule {} ({}): {} elements ({} sources x {} destinations x {} services)'.format(
+            rule.position, rule.object_id, rule.elements, rule.sources, rule.destinations, rule.services))
+
+
+if __name__ == '__main__':
+    main()
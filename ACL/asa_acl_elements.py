@@ -0,0 +1,145 @@
+import heapq
+from collections import namedtuple
+
+
+RuleElements = namedtuple('RuleElements', 'position object_id elements sources destinations services')
+
+ACL_SIDES = ('sourceAddress', 'destinationAddress', 'destinationService')
+
+
+def literal_elements(kind, value):
+    '''
+    Returns:
+        The number of elements a literal source, destination or service expands to; 'tcp-udp' services are two.
+
+    '''
+    if kind == 'TcpUdpService' and value.startswith('tcp-udp'):
+        return 2
+    return 1
+
+
+class ElementCounter:
+    '''
+    An estimator of the element count of ACLs: the number of ACEs the ASA
+    expands each entry into when the ACL is compiled, which is the product of
+    the number of sources, destinations and services once every object group
+    has been expanded. The size of each group is summed from its members' sizes
+    and remembered, so the count of an ACL is one multiplication per entry and
+    nested groups are never enumerated.
+
+    Groups and objects are read from an ObjectIndex. A reference that is not in
+    the index counts as one element and is listed in unresolved, and a group
+    that contains itself raises a ValueError.
+
+    '''
+
+    def __init__(self, index):
+        '''
+        Args:
+            index: An ObjectIndex.
+
+        Example:
+
+            >>>counter = ElementCounter(ObjectIndex(ASAObject(asa, header)))
+            >>>counter.count(asa_acl.asa_iter_acl_access_in('lab'))
+            (418, [RuleElements(position=1, object_id='3535378664', elements=12, sources=3, destinations=2,
+            services=2), ...])
+
+        '''
+        self.index = index
+        self.unresolved = set()
+        self._sizes = {}
+
+    def size(self, kind, object_id, _path=()):
+        '''
+        Args:
+            kind: The kind of the reference, such as 'objectRef#NetworkObjGroup'.
+            object_id: The objectId of the object or group.
+
+        Returns:
+            The number of elements the object or group expands to.
+
+        '''
+        key = (kind, object_id)
+        if key in self._sizes:
+            return self._sizes[key]
+
+        index = self.index
+        service = 'Service' in kind
+        if service and index.service_groups == None:
+            index.load_services()
+        elif not service and index.groups == None:
+            index.load()
+
+        if 'Group' not in kind:
+            if service:
+                found = index.services.get(object_id)
+                size = literal_elements(*found) if found else None
+            else:
+                size = 1 if object_id in index.objects else None
+        else:
+            grp = (index.service_groups if service else index.groups).get(object_id)
+            if grp == None:
+                size = None
+            elif key in _path:
+                raise ValueError('object-group {} contains itself'.format(object_id))
+            else:
+                size = sum(self.size(member_kind, member, _path + (key,)) if 'objectRef#' in member_kind
+                           else literal_elements(member_kind, member) for member_kind, member in grp.members)
+
+        if size == None:
+            self.unresolved.add(key)
+            size = 1
+        self._sizes[key] = size
+        return size
+
+    def side_elements(self, element):
+        '''
+        Returns:
+            The number of elements of a source, destination or service of an ACL entry as JSON.
+
+        '''
+        if 'objectRef#' in element['kind']:
+            return self.size(element['kind'], element['objectId'])
+        return literal_elements(element['kind'], element.get('value', ''))
+
+    def rule_elements(self, entry):
+        '''
+        Args:
+            entry: An ACL policy entry as JSON.
+
+        Returns:
+            A RuleElements tuple.
+
+        '''
+        sources, destinations, services = (self.side_elements(entry[side]) for side in ACL_SIDES)
+        return RuleElements(entry.get('position'), entry.get('objectId'), sources * destinations * services,
+                            sources, destinations, services)
+
+    def count(self, entries):
+        '''
+        This method estimates the element count of an ACL.
+
+        Args:
+            entries: An iterable of an interface's ACL policy entries as JSON.
+
+        Returns:
+            A tuple of the ACL's element count and a list of the RuleElements of
+            each active entry. Inactive entries are not compiled and are left out.
+
+        '''
+        rules = [self.rule_elements(entry) for entry in entries if entry.get('active', True)]
+        return sum(rule.elements for rule in rules), rules
+
+
+def top_offenders(rules, count=10):
+    '''
+    Args:
+        rules: A list of RuleElements from ElementCounter.count.
+        count: The number of rules to return.
+
+    Returns:
+        The rules with the largest element counts, largest first.
+
+    '''
+    return heapq.nlargest(count, rules, key=lambda rule: rule.elements)
@@ -1,19 +1,19 @@
-import json
 from asa_acl_class import ASAACL
+from asa_acl_models import ACE, AccessGroup
 
 
 def sort_access_groups(acl):
     '''
-    This function pulls out the interesting fields and returns them in a dictionary.
+    This function pulls out the interesting fields and returns them as an AccessGroup.
 
     Args:
         acl: The configuration of a ACL
 
     Returns:
-         Only the interesting values of the ACL as a dictionary.
+         Only the interesting values of the ACL as an AccessGroup record.
 
     '''
-    return {'acl': acl["ACLName"], 'direction': acl["direction"], 'interface': acl["interface"]["name"]}
+    return AccessGroup.from_json(acl)
 
 
 def sort_acl(acl):
@@ -26,37 +26,13 @@ def sort_acl(acl):
         acl: A line entry in an ACL
 
     Returns:
-        A dictionary of the interesting fields
+        An ACE record of the interesting fields; permission is 'permit' or 'deny'.
 
     '''
-    if acl['permit']:
-        permission = 'permit'
-    else:
-        permission = 'deny'
-
-    if acl['sourceAddress']['kind'] == 'AnyIPAddress':
-        source = 'any'
-    elif 'objectRef#' in acl['sourceAddress']['kind']:
-        source = acl['sourceAddress']['objectId']
-    else:
-        source = acl['sourceAddress']['value']
-
-    if acl['destinationAddress']['kind'] == 'AnyIPAddress':
-        destination = 'any'
-    elif 'objectRef' in acl['destinationAddress']['kind']:
-        destination = acl['destinationAddress']['objectId']
-    else:
-        destination = acl['destinationAddress']['value']
-
-    if 'objectRef' in acl['destinationService']['kind']:
-        service = acl['destinationService']['objectId']
-    else:
-        service = acl['destinationService']['value']
-
-    return {'permission': permission, 'source': source, 'destination': destination, 'service': service}
-
-
-def get_acl_last_position(asa, header, intfc_name):
+    return ACE.from_json(acl)
+
+
+def get_acl_last_position(asa, header, intfc_name, session=None):
     '''
     This function is used to get the position of the current last item
     in the ACL. The new ACL entry will use this same number to add
@@ -67,12 +43,76 @@ def get_acl_last_position(asa, header, intfc_name):
         asa: The IP or hostname to be used to reach the desired ASA.
         header: The header to use for providing the authentication token.
         intfc_name: The name of the interface which is being modified.
+        session: The ASASession used to send the API call.
 
     Returns:
          The number in string format of the current last item in the policy.
 
     '''
-    acl = ASAACL(asa, header)
-    acls = acl.asa_get_acl_access_in(intfc_name)
-    acls_json = json.loads(acls.text)['items']
-    return acls_json[-1]["position"]
+    acl = ASAACL(asa, header, session=session)
+    return max(entry["position"] for entry in acl.asa_iter_acl_access_in(intfc_name))
+
+
+class ACLPositionTracker:
+    '''
+    Keeps the last position of each interface's inbound ACL for a run of inserts.
+    The ACL of an interface is only downloaded the first time a position is needed;
+    after that each successful insert moves the last position down by one locally,
+    the same as re-reading the ACL would. The ACL is only downloaded again if the
+    ASA rejects an insert, in case the ACL was changed by someone else.
+
+    '''
+
+    def __init__(self, acl):
+        '''
+        Args:
+            acl: An ASAACL instance.
+
+        Example:
+
+            >>>tracker = ACLPositionTracker(ASAACL(asa, header))
+            >>>position = tracker.last_position('lab')
+            >>>tracker.record_insert('lab')
+
+        '''
+        self.acl = acl
+        self.positions = {}
+
+    def last_position(self, intfc_name):
+        '''
+        Args:
+            intfc_name: The name of the interface which is being modified.
+
+        Returns:
+            The position of the current last item in the interface's policy.
+
+        '''
+        if intfc_name not in self.positions:
+            self.refresh(intfc_name)
+        return self.positions[intfc_name]
+
+    def record_insert(self, intfc_name):
+        '''
+        Records that a new entry was added above the last item of the policy,
+        which moves the last item down one position.
+
+        Args:
+            intfc_name: The name of the interface which was modified.
+
+        '''
+        self.positions[intfc_name] += 1
+
+    def refresh(self, intfc_name):
+        '''
+        Downloads the interface's policy and stores its last position.
+
+        Args:
+            intfc_name: The name of the interface which is being modified.
+
+        Returns:
+            The position of the current last item in the interface's policy.
+
+        '''
+        entries = self.acl.asa_iter_acl_access_in(intfc_name)
+        self.positions[intfc_name] = max((entry["position"] for entry in entries), default=1)
+        return self.positions[intfc_name]
@@ -0,0 +1,89 @@
+from asa_models import Record
+
+
+def address_value(address):
+    '''
+    The ASA API uses 'objectId' for object based values and 'value' for all
+    others, and 'any4' for any address.
+
+    Args:
+        address: A source, destination or service of an ACL entry.
+
+    Returns:
+        The value, objectId, or 'any' for any address.
+
+    '''
+    if address['kind'] == 'AnyIPAddress':
+        return 'any'
+    elif 'objectRef' in address['kind']:
+        return address['objectId']
+    else:
+        return address['value']
+
+
+class ACE(Record):
+    '''
+    An access control entry of an interface's ACL policy.
+
+    '''
+    __slots__ = ('object_id', 'position', 'active', 'permit', 'source', 'destination', 'service', 'remarks')
+
+    def __init__(self, object_id, position, active, permit, source, destination, service, remarks=()):
+        self.object_id = object_id
+        self.position = position
+        self.active = active
+        self.permit = permit
+        self.source = source
+        self.destination = destination
+        self.service = service
+        self.remarks = remarks
+
+    @property
+    def permission(self):
+        return 'permit' if self.permit else 'deny'
+
+    @classmethod
+    def from_json(cls, acl):
+        '''
+        Args:
+            acl: A line entry in an ACL from an ASA API call.
+
+        Returns:
+            An ACE.
+
+        '''
+        return cls(
+            acl.get('objectId'),
+            acl.get('position'),
+            acl.get('active', True),
+            bool(acl['permit']),
+            address_value(acl['sourceAddress']),
+            address_value(acl['destinationAddress']),
+            address_value(acl['destinationService']),
+            tuple(acl.get('remarks', ()))
+        )
+
+
+class AccessGroup(Record):
+    '''
+    The ACL applied to an interface, and the direction it is applied in.
+
+    '''
+    __slots__ = ('acl', 'direction', 'interface')
+
+    def __init__(self, acl, direction, interface):
+        self.acl = acl
+        self.direction = direction
+        self.interface = interface
+
+    @classmethod
+    def from_json(cls, acl):
+        '''
+        Args:
+            acl: The configuration of an access-group from an ASA API call.
+
+        Returns:
+            An AccessGroup.
+
+        '''
+        return cls(acl['ACLName'], acl['direction'], acl['interface']['name'])
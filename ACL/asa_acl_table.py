@@ -0,0 +1,334 @@
+import numpy as np
+from asa_routing_functions import ip_to_int, parse_network
+from asa_acl_models import address_value
+
+
+PROTOCOLS = {
+    'ip': 0, 'icmp': 1, 'igmp': 2, 'tcp': 6, 'udp': 17, 'gre': 47, 'esp': 50, 'ah': 51, 'icmp6': 58,
+    'eigrp': 88, 'ospf': 89, 'pim': 103, 'sctp': 132
+}
+
+PORTS = {
+    'aol': 5190, 'bgp': 179, 'biff': 512, 'bootpc': 68, 'bootps': 67, 'chargen': 19, 'cifs': 3020,
+    'citrix-ica': 1494, 'cmd': 514, 'ctiqbe': 2748, 'daytime': 13, 'discard': 9, 'dnsix': 195, 'domain': 53,
+    'echo': 7, 'exec': 512, 'finger': 79, 'ftp': 21, 'ftp-data': 20, 'gopher': 70, 'h323': 1720,
+    'hostname': 101, 'http': 80, 'https': 443, 'ident': 113, 'imap4': 143, 'irc': 194, 'isakmp': 500,
+    'kerberos': 88, 'klogin': 543, 'kshell': 544, 'ldap': 389, 'ldaps': 636, 'login': 513, 'lotusnotes': 1352,
+    'lpd': 515, 'mobile-ip': 434, 'nameserver': 42, 'netbios-dgm': 138, 'netbios-ns': 137, 'netbios-ssn': 139,
+    'nfs': 2049, 'nntp': 119, 'ntp': 123, 'pcanywhere-data': 5631, 'pcanywhere-status': 5632,
+    'pim-auto-rp': 496, 'pop2': 109, 'pop3': 110, 'pptp': 1723, 'radius': 1645, 'radius-acct': 1646,
+    'rip': 520, 'rsh': 514, 'rtsp': 554, 'secureid-udp': 5510, 'sip': 5060, 'smtp': 25, 'snmp': 161,
+    'snmptrap': 162, 'sqlnet': 1521, 'ssh': 22, 'sunrpc': 111, 'syslog': 514, 'tacacs': 49, 'talk': 517,
+    'telnet': 23, 'tftp': 69, 'time': 37, 'uucp': 540, 'who': 513, 'whois': 43, 'www': 80, 'xdmcp': 177
+}
+
+PORT_PROTOCOLS = (0, 6, 17, 132)
+
+ALL_ADDRESSES = (0, 0xFFFFFFFF)
+ALL_PORTS = (0, 65535)
+
+
+def acl_line(permission, source, destination, service):
+    '''
+    This function is the text form of one ACL entry, shared by print_acls and ACLTable.
+
+    Returns:
+        A line such as 'permit source 10.1.1.22 destination any protocol ip'.
+
+    '''
+    return '{} source {} destination {} protocol {}'.format(permission, source, destination, service)
+
+
+def address_intervals(kind, value):
+    '''
+    This function converts a literal source or destination of an ACL entry to
+    address ranges.
+
+    Args:
+        kind: AnyIPAddress, IPv4Address, IPv4Network or IPv4Range.
+        value: The value of the source or destination.
+
+    Returns:
+        A list of (first, last) integer address tuples, or None if the kind is not a literal.
+
+    '''
+    if kind == 'AnyIPAddress':
+        return [ALL_ADDRESSES]
+    elif kind in ('IPv4Address', 'IPv4Network'):
+        network, prefixlen = parse_network(value)
+        return [(network, network + (1 << (32 - prefixlen)) - 1)]
+    elif kind.lower() == 'ipv4range':
+        first, last = value.split('-')
+        return [(ip_to_int(first.strip()), ip_to_int(last.strip()))]
+    return None
+
+
+def parse_port(port):
+    '''
+    Returns:
+        A (first, last) port tuple from a port number, a port name, or a range such as '1000-2000'.
+
+    '''
+    if '-' in port and port not in PORTS:
+        first, last = port.split('-', 1)
+        return parse_port(first)[0], parse_port(last)[1]
+    number = int(port) if port.isdigit() else PORTS[port]
+    return number, number
+
+
+def flow_service(protocol, port):
+    '''
+    Args:
+        protocol: A protocol name or number.
+        port: A port name or number, or an empty string.
+
+    Returns:
+        A tuple of the protocol and port numbers, or None if either is not understood.
+
+    '''
+    protocol, port = str(protocol).strip().lower(), str(port or 0).strip().lower()
+    number = int(protocol) if protocol.isdigit() else PROTOCOLS.get(protocol)
+    port = int(port) if port.isdigit() else PORTS.get(port)
+    if number == None or port == None or number > 255 or port > 65535:
+        return None
+    return number, port
+
+
+def service_ranges(kind, value):
+    '''
+    This function converts a literal destination service of an ACL entry to
+    protocol and port ranges. A protocol of 0 is any protocol, and protocols
+    without ports cover every port.
+
+    Args:
+        kind: AnyService, NetworkProtocol, TcpUdpService or ICMPService.
+        value: The value of the service, such as 'ip', 'tcp/http', 'udp/514' or 'icmp/echo'.
+
+    Returns:
+        A list of (protocol, first port, last port) tuples, or None if the kind is
+        not a literal or the service is not understood.
+
+    '''
+    try:
+        if kind == 'AnyService':
+            return [(0,) + ALL_PORTS]
+        elif kind in ('NetworkProtocol', 'ICMPService'):
+            protocol = value.split('/')[0]
+            number = int(protocol) if protocol.isdigit() else PROTOCOLS[protocol]
+            return [(number,) + ALL_PORTS]
+        elif kind == 'TcpUdpService':
+            protocol, _, port = value.partition('/')
+            ports = parse_port(port) if port else ALL_PORTS
+            protocols = ('tcp', 'udp') if protocol == 'tcp-udp' else (protocol,)
+            return [(PROTOCOLS[name],) + ports for name in protocols]
+    except (KeyError, ValueError):
+        return None
+    return None
+
+
+class ACLTable:
+    '''
+    A columnar, NumPy form of an interface's ACL policy for auditing large
+    policies. Each entry is one row of the rule columns: objectId, position,
+    active, permit, the kinds of source, destination and service as category
+    codes, and the display values used by print_acls. Because a source,
+    destination or service can be an object or group holding many values, the
+    addresses and services are kept in sub-tables with one row per range and
+    the index of the rule it belongs to (a CSR-like layout), so a question such
+    as 'which rules match 10.1.2.3' is answered with array comparisons over the
+    whole policy instead of a Python loop over the entries.
+
+    Literal values are always encoded. Object and object-group references are
+    encoded when resolvers are given; otherwise the rule's column in resolved
+    is False and address or service queries do not match it.
+
+    '''
+
+    def __init__(self, entries, resolve_address=None, resolve_service=None):
+        '''
+        Args:
+            entries: An iterable of an interface's ACL policy entries as JSON.
+            resolve_address: A function of (kind, objectId) returning address ranges, or None.
+            resolve_service: A function of (kind, objectId) returning service ranges, or None.
+
+        Example:
+
+            >>>table = ACLTable(asa_acl.asa_stream_acl_access_in('lab'))
+            >>>for line in table.lines(table.query(active=True, permit=True, source='any', port=22)):
+            ...    print(line)
+            permit source any destination 10.2.2.0/24 protocol tcp/ssh
+
+        '''
+        columns = {name: [] for name in ('object_id', 'position', 'active', 'permit', 'source', 'destination',
+                                         'service', 'source_kind', 'destination_kind', 'service_kind')}
+        self.kinds = {}
+        ranges = {'source': ([], [], []), 'destination': ([], [], []), 'service': ([], [], [], [])}
+        resolved = []
+
+        for row, entry in enumerate(entries):
+            columns['object_id'].append(entry.get('objectId'))
+            columns['position'].append(entry.get('position', row + 1))
+            columns['active'].append(entry.get('active', True))
+            columns['permit'].append(bool(entry['permit']))
+            complete = True
+
+            for side, key in (('source', 'sourceAddress'), ('destination', 'destinationAddress'),
+                              ('service', 'destinationService')):
+                element = entry[key]
+                columns[side].append(address_value(element))
+                columns[side + '_kind'].append(self.kinds.setdefault(element['kind'], len(self.kinds)))
+
+                if side == 'service':
+                    values = service_ranges(element['kind'], element.get('value'))
+                    if values == None and resolve_service and 'objectRef' in element['kind']:
+                        values = resolve_service(element['kind'], element['objectId'])
+                else:
+                    values = address_intervals(element['kind'], element.get('value'))
+                    if values == None and resolve_address and 'objectRef' in element['kind']:
+                        values = resolve_address(element['kind'], element['objectId'])
+
+                if values == None:
+                    complete = False
+                    continue
+                for value in values:
+                    ranges[side][0].append(row)
+                    for column, item in zip(ranges[side][1:], value):
+                        column.append(item)
+            resolved.append(complete)
+
+        self.object_id = np.array(columns['object_id'], dtype=object)
+        self.position = np.array(columns['position'], dtype=np.int32)
+        self.active = np.array(columns['active'], dtype=bool)
+        self.permit = np.array(columns['permit'], dtype=bool)
+        self.resolved = np.array(resolved, dtype=bool)
+        self.source = np.array(columns['source'], dtype=object)
+        self.destination = np.array(columns['destination'], dtype=object)
+        self.service = np.array(columns['service'], dtype=object)
+        self.source_kind = np.array(columns['source_kind'], dtype=np.int8)
+        self.destination_kind = np.array(columns['destination_kind'], dtype=np.int8)
+        self.service_kind = np.array(columns['service_kind'], dtype=np.int8)
+
+        self.src_rule, self.src_first, self.src_last = (
+            np.array(ranges['source'][0], dtype=np.int32),
+            np.array(ranges['source'][1], dtype=np.uint32),
+            np.array(ranges['source'][2], dtype=np.uint32))
+        self.dst_rule, self.dst_first, self.dst_last = (
+            np.array(ranges['destination'][0], dtype=np.int32),
+            np.array(ranges['destination'][1], dtype=np.uint32),
+            np.array(ranges['destination'][2], dtype=np.uint32))
+        self.svc_rule, self.svc_protocol, self.svc_first, self.svc_last = (
+            np.array(ranges['service'][0], dtype=np.int32),
+            np.array(ranges['service'][1], dtype=np.int16),
+            np.array(ranges['service'][2], dtype=np.int32),
+            np.array(ranges['service'][3], dtype=np.int32))
+
+    def __len__(self):
+        return len(self.position)
+
+    def _rules(self, rule_column, hits):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[rule_column[hits]] = True
+        return mask
+
+    def kind(self, side, kind):
+        '''
+        Returns:
+            A boolean array of the rules whose source, destination or service is of the kind.
+
+        '''
+        if kind not in self.kinds:
+            return np.zeros(len(self), dtype=bool)
+        return getattr(self, side + '_kind') == self.kinds[kind]
+
+    def matches_address(self, address, side='source'):
+        '''
+        Args:
+            address: An IPv4 address as a string or integer.
+            side: 'source' or 'destination'.
+
+        Returns:
+            A boolean array of the rules whose side contains the address.
+
+        '''
+        address = ip_to_int(address) if isinstance(address, str) else address
+        prefix = 'src' if side == 'source' else 'dst'
+        first, last = getattr(self, prefix + '_first'), getattr(self, prefix + '_last')
+        return self._rules(getattr(self, prefix + '_rule'), (first <= address) & (address <= last))
+
+    def matches_service(self, protocol=None, port=None):
+        '''
+        Args:
+            protocol: A protocol name or number; None for any protocol.
+            port: A destination port; None for any port.
+
+        Returns:
+            A boolean array of the rules whose service allows the protocol and port.
+            A rule for any protocol (ip) matches every protocol and port, and a port
+            alone matches the protocols that have ports.
+
+        '''
+        hits = np.ones(len(self.svc_rule), dtype=bool)
+        if protocol != None:
+            number = PROTOCOLS[protocol] if isinstance(protocol, str) else protocol
+            hits &= (self.svc_protocol == number) | (self.svc_protocol == 0)
+        elif port != None:
+            hits &= np.isin(self.svc_protocol, PORT_PROTOCOLS)
+        if port != None:
+            hits &= (self.svc_first <= port) & (port <= self.svc_last)
+        return self._rules(self.svc_rule, hits)
+
+    def query(self, active=None, permit=None, source=None, destination=None, protocol=None, port=None):
+        '''
+        This method selects the rules matching every condition given. A source or
+        destination of 'any' selects rules written for any address; an address
+        selects the rules that contain it.
+
+        Args:
+            active: True or False to select on the rule being active.
+            permit: True for permits, False for denies.
+            source: 'any' or an IPv4 address.
+            destination: 'any' or an IPv4 address.
+            protocol: A protocol name or number.
+            port: A destination port.
+
+        Returns:
+            An array of the row indexes of the matching rules, in policy order.
+
+        '''
+        mask = np.ones(len(self), dtype=bool)
+        if active != None:
+            mask &= self.active == active
+        if permit != None:
+            mask &= self.permit == permit
+        for side, value in (('source', source), ('destination', destination)):
+            if value == 'any':
+                mask &= self.kind(side, 'AnyIPAddress')
+            elif value != None:
+                mask &= self.matches_address(value, side)
+        if protocol != None or port != None:
+            mask &= self.matches_service(protocol, port)
+
+        return np.flatnonzero(mask)
+
+    def matching(self, address):
+        '''
+        Returns:
+            An array of the row indexes of the rules whose source or destination contains the address.
+
+        '''
+        return np.flatnonzero(self.matches_address(address, 'source') | self.matches_address(address, 'destination'))
+
+    def lines(self, rows=None):
+        '''
+        This method is the text view of the table, in the format printed by print_acls.
+
+        Args:
+            rows: The row indexes to format; every row if None.
+
+        Returns:
+            A list of lines in the order of rows.
+
+        '''
+        rows = range(len(self)) if rows is None else rows
+        return [acl_line('permit' if self.permit[row] else 'deny', self.source[row], self.destination[row],
+                         self.service[row]) for row in rows]
@@ -0,0 +1,76 @@
+import argparse
+from collections import Counter
+from asa_acl_analyzer import ACLAnalyzer
+from asa_trace_flows import build_classifier
+
+
+def main():
+    '''
+    The purpose of this program is to find the entries of an interface's inbound
+    ACL that never take effect, or that depend on their order. The ACL and the
+    objects it references are collected from the ASA, or from the newest snapshot
+    of the ASA, and every rule is checked against every other with an ACLAnalyzer.
+    Removing a shadowed or redundant rule does not change what the ACL permits,
+    and makes the ACL smaller for the ASA to compile. Each anomaly is about one
+    rule in the ACL as it is, not a set of rules that can be removed together,
+    so analyze the ACL again after removing rules.
+
+    Print:
+        One line per shadowed, redundant or correlated rule, and a count of each.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_analyze_acl.py lab
+        What ASA do you want to analyze? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        Rule 14 (2147483661) is shadowed by rule 3 (3535378664)
+        Rule 20 (1183290466) is redundant with rule 31 (4073312211)
+        Rule 27 (938417220) is correlated with rule 9 (620514475) and 2 other rules
+
+        shadowed: 1
+        redundant: 1
+        correlated: 1
+
+    '''
+    parser = argparse.ArgumentParser(description="Find shadowed, redundant and correlated rules in an interface's ACL.")
+    parser.add_argument('interface', help="The name ('name-if') of the interface.")
+    parser.add_argument('-d', '--database', help='Use the newest snapshot in this database instead of the ASA.')
+    options = parser.parse_args()
+
+    asa = input('What ASA do you want to analyze? ')
+    analyzer = ACLAnalyzer(build_classifier(asa, options.interface, options.database))
+    if analyzer.classifier.unresolved:
+        print('RULES AT POSITIONS {} COULD NOT BE EXPANDED AND WERE SKIPPED\n'.format(
+            analyzer.classifier.unresolved))
+
+    anomalies = analyzer.anomalies()
+    for anomaly in anomalies:
+        print_anomaly(anomaly)
+
+    print()
+    for kind, count in Counter(anomaly.kind for anomaly in anomalies).items():
+        print('{}: {}'.format(kind, count))
+
+
+def print_anomaly(anomaly):
+    '''
+    This function prints one anomaly.
+
+    Args:
+        anomaly: An ACLAnomaly from ACLAnalyzer.anomalies.
+
+    '''
+    line = 'Rule {} ({}) is {} {} rule {} ({})'.format(
+        anomaly.position, anomaly.object_id, anomaly.kind, 'by' if anomaly.kind == 'shadowed' else 'with',
+        anomaly.by_position, anomaly.by_object_id)
+    if anomaly.count > 1:
+        line += ' and {} other rules'.format(anomaly.count - 1)
+    print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import argparse
+from asa_acl_compact import CompactionPlanner
+from asa_trace_flows import build_classifier
+
+
+def main():
+    '''
+    The purpose of this program is to plan how an interface's inbound ACL can be
+    made smaller without changing what it permits. The ACL and the objects it
+    references are collected from the ASA, or from the newest snapshot of the
+    ASA, and a CompactionPlanner finds rules that differ only in their source,
+    or only in their destination, and can be merged. No changes are made to the
+    ASA; the plan is printed to be reviewed and applied.
+
+    Print:
+        Each merge, with the rules it removes and the new value or proposed
+        object group, and the element count of the ACL before and after the plan.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_compact_acl.py lab -d asa_snapshots.db
+        What ASA do you want to plan for? 10.10.10.5
+
+        Merge the source of permit rules 12, 13 into rule 12 (3535378664), removing 1183290466:
+            IPv4Network 10.1.4.0/23
+        Merge the destination of permit rules 20, 24, 31 into rule 20 (938417220), removing 620514475, 4073312211:
+            object-group with: objectRef#NetworkObjGroup grp-weblab-monitors, IPv4Address 10.2.2.22
+
+        Rules removed: 3
+        Element count: 418 -> 415 (0.7% smaller)
+
+    '''
+    parser = argparse.ArgumentParser(description="Plan merges that shrink an interface's inbound ACL.")
+    parser.add_argument('interface', help="The name ('name-if') of the interface.")
+    parser.add_argument('-d', '--database', help='Use the newest snapshot in this database instead of the ASA.')
+    options = parser.parse_args()
+
+    asa = input('What ASA do you want to plan for? ')
+    planner = CompactionPlanner(build_classifier(asa, options.interface, options.database))
+    steps = planner.plan()
+    for step in steps:
+        print_step(step)
+
+    before, after, removed = planner.report(steps)
+    print('\nRules removed: {}'.format(removed))
+    print('Element count: {} -> {} ({:.1%} smaller)'.format(before, after, (before - after) / before if before else 0))
+
+
+def print_step(step):
+    '''
+    This function prints one merge of the plan.
+
+    Args:
+        step: A CompactionStep from CompactionPlanner.plan.
+
+    '''
+    print('\nMerge the {} of {} rules {} into rule {} ({}), removing {}:'.format(
+        step.side, step.permission, ', '.join(map(str, step.positions)), step.positions[0], step.object_ids[0],
+        ', '.join(step.object_ids[1:])))
+    members = ['{} {}'.format(member['kind'], member.get('objectId', member.get('value'))) for member in step.members]
+    if len(members) == 1:
+        print('    {}'.format(members[0]))
+    else:
+        print('    object-group with: {}'.format(', '.join(members)))
+
+
+if __name__ == '__main__':
+    main()
@@ -52,11 +52,11 @@ def main():
     header = login_cred.asa_login()
 
     intfc = input("What interface's policy would you like to modify?\n {} ".format(
-        used_intfcs_name(asa, header)))
-    position = get_acl_last_position(asa, header, intfc)
+        used_intfcs_name(asa, header, login_cred.session)))
+    position = get_acl_last_position(asa, header, intfc, login_cred.session)
 
     config = config_variables(intfc, position)
-    acl = ASAACL(asa, header)
+    acl = ASAACL(asa, header, session=login_cred.session)
 
     config_acl = acl.asa_configure_acl_access_in(intfc, config["source_kind"], config['source'],
                                                  config['destination_kind'], config['destination'],
@@ -1,25 +1,31 @@
-import sys
-import json
+import argparse
 from csv import DictReader
+from collections import Counter
 from asa_aaa_class import ASAAAA
-from asa_acl_class import ASAACL
+from asa_mirror import MirrorSession
+from asa_acl_class import ASAACL, acl_policy_config, bulk_results
 from asa_object_class import ASAObject
 from asa_routing_class import ASARouting
-from asa_object_functions import object_group_intfc
-from asa_acl_functions import get_acl_last_position
-from asa_routing_functions import sort_routes
+from asa_object_functions import ObjectIndex
+from asa_acl_functions import ACLPositionTracker
+from asa_acl_elements import ElementCounter
+from asa_routing_functions import RoutingTable
 
 
-def main(csv):
+def main(csv, batch_size=None, max_elements=None):
     '''
     The purpose of this program is to configure new lines of policy to
     existing ACLs on a Cisco ASA. The ASAAAA class is used to establish a
-    session, the ASAObject and ASARouting classes are used to help determine 
+    session, which is kept behind a MirrorSession so collections read during
+    the run are updated by its writes rather than listed again. The ASAObject
+    and ASARouting classes are used to help determine 
     which interface the source object group is associated with, and the ASAACL
     class is used to POST the new ACL configuration policy. The other functions
     are used to collect configuration and handle formatting. This is similar to
     an 'access-list acl_name remark remark' and 'access-list acl_name extended
     [permit,deny] source destination service log' from the CLI of a Cisco ASA.
+    With max_elements, the element count the rows add is checked first with
+    preflight_elements, and nothing is configured if the ASA would exceed it.
 
     Print:
         The configuration result: A 201 means the configuration was applied,
@@ -46,16 +52,93 @@ def main(csv):
             Thousand Eyes,grp-weblab-thousandeyes-monitors,Thousand Eyes,grp-securelab-thousandeyes-db,
             grp-tcpudp-thousandeyes,Thousand Eyes DB Access,RITM00029
 
+        (py3) C:\\asa_api_tests>python asa_configure_acls_csv.py asa_new_policy.csv --batch-size 200
+        ...
+        ROW 2 POST ACL CONFIG STATUS_CODE: 201 OK
+
+        ROW 3 POST ACL CONFIG STATUS_CODE: 201 OK
+
+        (py3) C:\\asa_api_tests>python asa_configure_acls_csv.py asa_new_policy.csv --max-elements 500
+        ...
+        PRE-FLIGHT lab: 12 new elements from 2 rows
+        PRE-FLIGHT TOTAL: 440 existing + 12 new = 452 elements (limit 500)
+
+        POST ACL CONFIG STATUS_CODE: 201 OK
+
     '''
     asa = input('What ASA would you like to modify? ')
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    obj = ASAObject(asa, header)
-    acl = ASAACL(asa, header)
-    routes = ASARouting(asa, header)
+    session = MirrorSession(login_cred.session)
+    obj = ASAObject(asa, header, session=session)
+    acl = ASAACL(asa, header, session=session)
+    routes = ASARouting(asa, header, session=session)
+
+    if max_elements and not preflight_elements(csv, obj, acl, routes, max_elements):
+        return
 
-    config_acls(csv, asa, header, obj, acl, routes)
+    if batch_size:
+        config_acls_bulk(csv, asa, header, obj, acl, routes, batch_size)
+    else:
+        config_acls(csv, asa, header, obj, acl, routes)
+
+
+def preflight_elements(csv, obj, acl, routes, max_elements):
+    '''
+    This function checks that configuring the CSV file keeps the ASA within an
+    element count, the number of ACEs the ASA expands its ACLs into. The element
+    count of each row is the product of the sizes of its source, destination and
+    service groups, from an ElementCounter, and is added to the element count of
+    the inbound ACLs already on the ASA.
+
+    Args:
+        csv: A CSV file containing necessary configuration info.
+        obj: An ASAObject instance.
+        acl: An ASAACL instance.
+        routes: An ASARouting instance.
+        max_elements: The largest element count allowed for the ASA's inbound ACLs.
+
+    Returns:
+        True if the rows can be configured within max_elements.
+
+    Print:
+        The elements each interface's ACL gains and the totals; a failure
+        prints the limit that would be exceeded.
+
+    '''
+    routing_table = RoutingTable(routes.asa_iter_all_static_routes(records=True))
+    objects = ObjectIndex(obj)
+    counter = ElementCounter(objects)
+
+    added, rows = Counter(), Counter()
+    for row, policy in enumerate(DictReader(open(csv)), start=2):
+        try:
+            intfc = objects.group_intfc(policy['Source'], routing_table)
+        except ValueError as error:
+            print("\nPRE-FLIGHT ROW {} NOT COUNTED, IT WILL NOT BE CONFIGURED: {}".format(row, error))
+            continue
+        added[intfc] += (counter.size('objectRef#NetworkObjGroup', policy['Source']) *
+                         counter.size('objectRef#NetworkObjGroup', policy['Destination']) *
+                         counter.size('objectRef#NetworkServiceGroup', policy['Protocol']))
+        rows[intfc] += 1
+
+    existing = 0
+    for group in acl.asa_iter_acls_in(records=True):
+        if group.direction.upper() == 'IN':
+            existing += counter.count(acl.asa_iter_acl_access_in(group.interface))[0]
+
+    for intfc, elements in added.items():
+        print("\nPRE-FLIGHT {}: {} new elements from {} rows".format(intfc, elements, rows[intfc]))
+    total = existing + sum(added.values())
+    print("PRE-FLIGHT TOTAL: {} existing + {} new = {} elements (limit {})".format(
+        existing, sum(added.values()), total, max_elements))
+
+    if total > max_elements:
+        print("\nPRE-FLIGHT FAILED!!! The rows would exceed the limit of {} elements; nothing was configured.".format(
+            max_elements))
+        return False
+    return True
 
 
 def config_acls(csv, asa, header, obj, acl, routes):
@@ -66,8 +149,18 @@ def config_acls(csv, asa, header, obj, acl, routes):
     to provide the routing table for the given ASA. The function then
     loops over each row in the CSV file and determines the appropriate
     ACL, position in the ACL, and applies the necessary configuration
-    parameters to the necessary ACL on the given ASA. The CSV should use
+    parameters to the necessary ACL on the given ASA. The routes are
+    compiled into a RoutingTable once for the whole run. The CSV should use
     object groups for sources, destinations, and destination services.
+    Source groups are resolved to interfaces through an ObjectIndex, which
+    lists the objects and groups once for the run instead of looking each
+    group up on the ASA. A row whose source group contains itself, has no
+    routed addresses, or spans more than one interface is skipped and
+    reported, since there is no single ACL to put it in. Positions come from
+    an ACLPositionTracker, so each interface's ACL is downloaded once rather
+    than once per row; if the ASA
+    rejects a row the ACL is downloaded again and the row is retried if its
+    position moved.
     
     Args:
         csv: A CSV file containing necessary configuration info:
@@ -85,12 +178,19 @@ def config_acls(csv, asa, header, obj, acl, routes):
     
     '''
     acl_csv = DictReader(open(csv))
-    sorted_routes = sort_routes(json.loads(routes.asa_get_all_static_routes().text)['items'])
+    routing_table = RoutingTable(routes.asa_iter_all_static_routes(records=True))
+    objects = ObjectIndex(obj)
+    positions = ACLPositionTracker(acl)
 
-    for policy in acl_csv:
+    for row, policy in enumerate(acl_csv, start=2):
         src, dst, svc, remark = policy['Source'], policy['Destination'], policy['Protocol'], policy['Remark']
-        intfc = object_group_intfc(obj, src, sorted_routes)
-        position = get_acl_last_position(asa, header, intfc)
+        try:
+            intfc = objects.group_intfc(src, routing_table)
+        except ValueError as error:
+            print("\nROW {} POST ACL CONFIG SKIPPED!!! The ACL for the source could not be chosen: {}".format(
+                row, error))
+            continue
+        position = positions.last_position(intfc)
 
         config_acl = acl.asa_configure_acl_access_in(intfc,
                                                      'objectRef#NetworkObjGroup', src,
@@ -98,12 +198,129 @@ def config_acls(csv, asa, header, obj, acl, routes):
                                                      'objectRef#NetworkServiceGroup', svc,
                                                      remark, position)
 
+        if not config_acl.ok and positions.refresh(intfc) != position:
+            config_acl = acl.asa_configure_acl_access_in(intfc,
+                                                         'objectRef#NetworkObjGroup', src,
+                                                         'objectRef#NetworkObjGroup', dst,
+                                                         'objectRef#NetworkServiceGroup', svc,
+                                                         remark, positions.last_position(intfc))
+
         if config_acl.ok:
+            positions.record_insert(intfc)
             print("\nPOST ACL CONFIG STATUS_CODE: {} OK\n".format(config_acl.status_code))
         else:
             print("\nPOST ACL CONFIG FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
                 config_acl.status_code, config_acl.reason, config_acl.content))
 
 
+def config_acls_bulk(csv, asa, header, obj, acl, routes, batch_size=100):
+    '''
+    This function is the batch form of config_acls. Instead of one POST per
+    CSV row, the rows are packed into bulk requests of batch_size operations
+    using 'asa_bulk_configure_acl_access_in', and the result of each operation
+    is reported against the CSV row it came from. Every row in a batch for an
+    interface is inserted at the position of that ACL's final entry, and the
+    rows are sent in reverse CSV order, so each insert lands above the rows
+    after it and the rows keep their CSV order above the final entry. No row's
+    position depends on another row succeeding, so a failed row never pushes
+    the rows after it below the final entry. The positions are kept by an
+    ACLPositionTracker across batches, advanced only for the rows that were
+    configured, and an interface's ACL is downloaded again when a row for it
+    fails or its result is unknown.
+
+    Args:
+        csv: A CSV file containing necessary configuration info:
+        source group, destination group, destination service and remark.
+        asa: The ASA to apply the new policy.
+        header: The header from an established ASAAAA object.
+        obj: An ASAObject instance.
+        acl: An ASAACL instance.
+        routes: An ASARouting instance.
+        batch_size: The number of CSV rows sent in each bulk request.
+
+    Print:
+        The configuration result of each CSV row: A 201 means the configuration
+        was applied, other codes indicate an issue with the request. Failures
+        do print the code and content returned for the row.
+
+    '''
+    acl_csv = DictReader(open(csv))
+    routing_table = RoutingTable(routes.asa_iter_all_static_routes(records=True))
+    objects = ObjectIndex(obj)
+    positions = ACLPositionTracker(acl)
+
+    batch = []
+    for row, policy in enumerate(acl_csv, start=2):
+        batch.append((row, policy))
+        if len(batch) == batch_size:
+            config_acl_batch(batch, objects, acl, routing_table, positions)
+            batch = []
+
+    if batch:
+        config_acl_batch(batch, objects, acl, routing_table, positions)
+
+
+def config_acl_batch(batch, objects, acl, routing_table, positions):
+    '''
+    This function sends one bulk request for a batch of CSV rows.
+
+    Args:
+        batch: A list of (row number, CSV row) tuples.
+        objects: The ObjectIndex for the run.
+        acl: An ASAACL instance.
+        routing_table: The RoutingTable of the ASA.
+        positions: The ACLPositionTracker for the run.
+
+    Print:
+        The configuration result of each CSV row in the batch.
+
+    '''
+    sent = []
+    for row, policy in batch:
+        try:
+            intfc = objects.group_intfc(policy['Source'], routing_table)
+        except ValueError as error:
+            print("\nROW {} POST ACL CONFIG SKIPPED!!! The ACL for the source could not be chosen: {}".format(
+                row, error))
+            continue
+        sent.append((row, policy, intfc))
+
+    if not sent:
+        return
+    # Each row is inserted at its ACL's final entry, so the last row is sent first.
+    sent.reverse()
+    policies = [(intfc, acl_policy_config('objectRef#NetworkObjGroup', policy['Source'],
+                                          'objectRef#NetworkObjGroup', policy['Destination'],
+                                          'objectRef#NetworkServiceGroup', policy['Protocol'],
+                                          policy['Remark'], positions.last_position(intfc)))
+                for row, policy, intfc in sent]
+    config_bulk = acl.asa_bulk_configure_acl_access_in(policies)
+    results = sorted(zip(sent, bulk_results(config_bulk, len(sent))), key=lambda result: result[0][0])
+    failed_intfcs = set()
+    for (row, policy, intfc), (ok, status_code, detail) in results:
+        if ok:
+            positions.record_insert(intfc)
+            print("\nROW {} POST ACL CONFIG STATUS_CODE: {} OK\n".format(row, status_code))
+        elif ok == None:
+            failed_intfcs.add(intfc)
+            print("\nROW {} POST ACL CONFIG UNKNOWN!!! STATUS_CODE: {}\nContent: {}".format(
+                row, status_code, detail))
+        else:
+            failed_intfcs.add(intfc)
+            print("\nROW {} POST ACL CONFIG FAILED!!! STATUS_CODE: {}\nContent: {}".format(
+                row, status_code, detail))
+
+    for intfc in failed_intfcs:
+        positions.refresh(intfc)
+
+
 if __name__ == '__main__':
-    main(sys.argv[1])
+    parser = argparse.ArgumentParser(description='Configure new ACL policy from a CSV file.')
+    parser.add_argument('csv', help='The CSV file of policy to configure.')
+    parser.add_argument('-b', '--batch-size', type=int,
+                        help='Send the rows in bulk requests of this many rows instead of one request per row.')
+    parser.add_argument('-m', '--max-elements', type=int,
+                        help='Configure nothing if the inbound ACLs would expand to more than this many elements.')
+    options = parser.parse_args()
+
+    main(options.csv, options.batch_size, options.max_elements)
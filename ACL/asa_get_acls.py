@@ -1,4 +1,4 @@
-import json
+from requests import HTTPError
 from asa_aaa_class import ASAAAA
 from asa_acl_class import ASAACL
 from asa_acl_functions import sort_access_groups
@@ -35,15 +35,12 @@ def main():
     login_cred = ASAAAA(asa=input('What ASA do you want to view? '))
     header = login_cred.asa_login()
 
-    acls = ASAACL(login_cred.asa, header=header)
-    access_groups = acls.asa_get_acls_in()
-
-    if access_groups.ok:
-        access_groups_json = json.loads(access_groups.text)
-        print_access_groups(access_groups_json['items'])
-    else:
+    acls = ASAACL(login_cred.asa, header=header, session=login_cred.session)
+    try:
+        print_access_groups(list(acls.asa_iter_acls_in()))
+    except HTTPError as error:
         print("GET ACCESS GROUPS FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
-            access_groups.status_code, access_groups.reason, access_groups.content))
+            error.response.status_code, error.response.reason, error.response.content))
 
 
 def print_access_groups(acls):
@@ -60,7 +57,7 @@ def print_access_groups(acls):
     for acl in acls:
         acl = sort_access_groups(acl)
         print('ACL: {} \n  Direction: {} \n  Interface: {}'.format(
-            acl['acl'], acl['direction'], acl['interface']))
+            acl.acl, acl.direction, acl.interface))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,92 @@
+import json
+import asyncio
+from asa_aaa_class import ASAAAA
+from asa_acl_async_class import AsyncASAACL
+from asa_async_session import AsyncASASession
+from asa_acl_functions import sort_access_groups
+from asa_get_policy import print_acls
+
+
+def main():
+    '''
+    The purpose of this program is to list out the inbound ACL policy of every
+    interface that has one. The ASAAAA class is used to establish a session, and
+    the AsyncASAACL class is used to collect the access-groups and then the
+    policy of every interface at the same time. The other functions are used to
+    handle formatting. This is similar to running 'show run access-list acl_name'
+    for each ACL in 'show run access-group' from the CLI of a Cisco ASA.
+
+    Print:
+        The active policy entries for each interface, in the same format as
+        asa_get_policy.py.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_get_policies.py
+        What ASA do you want to view? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        Interface lab (lab_access_in):
+        permit source 10.1.1.22 destination any protocol ip
+        permit source 10.1.1.53 destination 10.2.2.22 protocol udp
+
+        Interface weblab (weblab_access_in):
+        permit source 10.1.1.29 destination web_servers protocol tcp/http
+
+    '''
+    login_cred = ASAAAA(asa=input('What ASA do you want to view? '))
+    header = login_cred.asa_login()
+
+    asyncio.run(print_policies(login_cred, header))
+
+
+async def get_policies(acl):
+    '''
+    This function collects the inbound access-groups, and then the policy of every
+    interface with one concurrently.
+
+    Args:
+        acl: An AsyncASAACL instance.
+
+    Returns:
+        A list of (access-group, response) tuples, where access-group comes from
+        sort_access_groups and response is the interface's policy.
+
+    '''
+    access_groups = await acl.asa_get_acls_in()
+    if not access_groups.ok:
+        print("GET ACCESS GROUPS FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
+            access_groups.status_code, access_groups.reason, access_groups.content))
+        return []
+
+    groups = [sort_access_groups(group) for group in json.loads(access_groups.text)['items']]
+    policies = await asyncio.gather(*(acl.asa_get_acl_access_in(group.interface) for group in groups))
+
+    return list(zip(groups, policies))
+
+
+async def print_policies(login_cred, header):
+    '''
+    This function prints the policy of every interface with an inbound ACL.
+
+    Args:
+        login_cred: The ASAAAA instance used to login.
+        header: The header returned by asa_login.
+
+    '''
+    async with AsyncASASession(authenticator=login_cred) as session:
+        acl = AsyncASAACL(login_cred.asa, header, session=session)
+        for group, policy in await get_policies(acl):
+            print('\nInterface {} ({}):'.format(group.interface, group.acl))
+            if policy.ok:
+                print_acls(json.loads(policy.text)['items'])
+            else:
+                print("GET POLICY FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
+                    policy.status_code, policy.reason, policy.content))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
-import json
+from requests import HTTPError
 from asa_aaa_class import ASAAAA
 from asa_acl_class import ASAACL
 from asa_acl_functions import sort_acl
+from asa_acl_table import acl_line
 from asa_interface_functions import used_intfcs_name
 
 
@@ -41,17 +42,14 @@ def main():
     header = login_cred.asa_login()
 
     intfc = input("What interface's would you like to view?\n{} ".format(
-        used_intfcs_name(login_cred.asa, header)))
+        used_intfcs_name(login_cred.asa, header, login_cred.session)))
     print()
-    acl = ASAACL(login_cred.asa, header)
-    policy = acl.asa_get_acl_access_in(intfc)
-
-    if policy.ok:
-        policy_json = json.loads(policy.text)
-        print_acls(policy_json['items'])
-    else:
-        print("GET POLICY FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: ".format(
-            policy.status_code, policy.reason, policy.content))
+    acl = ASAACL(login_cred.asa, header, session=login_cred.session)
+    try:
+        print_acls(acl.asa_stream_acl_access_in(intfc))
+    except HTTPError as error:
+        print("GET POLICY FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
+            error.response.status_code, error.response.reason, error.response.content))
 
 
 def print_acls(acls):
@@ -60,7 +58,7 @@ def print_acls(acls):
     through sort_acl to return only the interesting values, and then prints the results.
 
     Args:
-        acls: A list of an interface's ACL policy
+        acls: An iterable of an interface's ACL policy entries
 
     Prints:
         One line per 'active' entry to display the policies configuration.
@@ -69,8 +67,7 @@ def print_acls(acls):
     for entry in acls:
         if entry['active']:
             acl = sort_acl(entry)
-            print('{} source {} destination {} protocol {}'.format(
-                acl['permission'], acl['source'], acl['destination'], acl['service']))
+            print(acl_line(acl.permission, acl.source, acl.destination, acl.service))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,104 @@
+import argparse
+import numpy as np
+from requests import HTTPError
+from asa_aaa_class import ASAAAA
+from asa_acl_class import ASAACL
+from asa_acl_table import ACLTable
+from asa_object_class import ASAObject
+from asa_object_functions import ObjectIndex
+from asa_snapshot_functions import ASASnapshotStore
+
+
+def main():
+    '''
+    The purpose of this program is to search an interface's inbound ACL policy.
+    The policy is loaded into an ACLTable, from the ASA or from the newest
+    snapshot of the ASA, and the rules matching every condition given are
+    printed in the same format as asa_get_policy.py. Object and object-group
+    references are expanded with an ObjectIndex of the same ASA or snapshot;
+    rules that cannot be expanded are listed, since address, protocol and port
+    conditions do not match them.
+
+    Print:
+        The positions of rules that could not be expanded, the position and text
+        of each matching rule, and the number of matches.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_query_acl.py lab --active --permit --source any --port 22
+        What ASA do you want to search? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        14 permit source any destination 10.2.2.0/24 protocol tcp/ssh
+
+        1 OF 9877 RULES MATCHED
+
+        (py3) C:\\asa_api_tests>python asa_query_acl.py lab --address 10.1.2.3 -d asa_snapshots.db
+
+    '''
+    parser = argparse.ArgumentParser(description="Search an interface's inbound ACL policy.")
+    parser.add_argument('interface', help="The name ('name-if') of the interface.")
+    parser.add_argument('--active', action='store_true', help='Only active rules.')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--permit', action='store_const', const=True, dest='permit', help='Only permits.')
+    action.add_argument('--deny', action='store_const', const=False, dest='permit', help='Only denies.')
+    parser.add_argument('--source', help="'any' or an address the source must contain.")
+    parser.add_argument('--destination', help="'any' or an address the destination must contain.")
+    parser.add_argument('--protocol', help='A protocol name, such as tcp, that the service must allow.')
+    parser.add_argument('--port', type=int, help='A destination port the service must allow.')
+    parser.add_argument('--address', help='An address the source or destination must contain.')
+    parser.add_argument('-d', '--database', help='Search the newest snapshot in this database instead of the ASA.')
+    options = parser.parse_args()
+
+    asa = input('What ASA do you want to search? ')
+    try:
+        entries, index = load_policy(asa, options.interface, options.database)
+        table = ACLTable(entries, index.address_ranges, index.service_ranges)
+    except HTTPError as error:
+        print("GET POLICY FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
+            error.response.status_code, error.response.reason, error.response.content))
+        return
+
+    unresolved = sorted(table.position[~table.resolved].tolist())
+    if unresolved:
+        print('RULES AT POSITIONS {} COULD NOT BE EXPANDED AND ONLY MATCH QUERIES WITHOUT ADDRESSES, '
+              'PROTOCOLS OR PORTS\n'.format(unresolved))
+
+    rows = table.query(options.active or None, options.permit, options.source, options.destination,
+                       options.protocol, options.port)
+    if options.address:
+        rows = np.intersect1d(rows, table.matching(options.address))
+
+    for row, line in zip(rows, table.lines(rows)):
+        print('{} {}'.format(table.position[row], line))
+    print('\n{} OF {} RULES MATCHED'.format(len(rows), len(table)))
+
+
+def load_policy(asa, intfc_name, database=None):
+    '''
+    This function returns an interface's inbound ACL policy from the ASA, or from
+    the newest snapshot of the ASA when a snapshot database is given.
+
+    Returns:
+        A tuple of an iterable of the policy entries as JSON, and the ObjectIndex
+        that resolves their object and object-group references.
+
+    '''
+    if database:
+        store = ASASnapshotStore(database)
+        snapshot = store.latest(asa)
+        if snapshot == None:
+            return [], ObjectIndex.from_items([], [])
+        return store.items(snapshot, 'acl_rules', intfc_name), store.object_index(snapshot)
+
+    login_cred = ASAAAA(asa)
+    header = login_cred.asa_login()
+    index = ObjectIndex(ASAObject(asa, header, session=login_cred.session))
+    return ASAACL(asa, header, session=login_cred.session).asa_stream_acl_access_in(intfc_name), index
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import csv
+import argparse
+from asa_aaa_class import ASAAAA
+from asa_acl_class import ASAACL
+from asa_object_class import ASAObject
+from asa_object_functions import ObjectIndex
+from asa_acl_classifier import ACLClassifier
+from asa_snapshot_functions import ASASnapshotStore
+
+
+def main():
+    '''
+    The purpose of this program is to answer 'is this flow allowed?' for many
+    flows at once without running packet-tracer on the ASA. An interface's
+    inbound ACL and the objects it references are collected from the ASA, or
+    from the newest snapshot of the ASA, and compiled into an ACLClassifier,
+    which finds the first matching rule of every flow in the file.
+
+    Print:
+        One line per flow with the decision and the position and objectId of the
+        matching rule, or 'implicit deny'; a flow that cannot be read is reported
+        as invalid and the rest of the file is still traced.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_trace_flows.py lab flows.csv
+        What ASA do you want to trace against? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        10.1.1.22 -> 10.2.2.22 tcp/443: PERMIT by rule 2 (3535378664)
+        10.1.1.99 -> 10.2.2.22 udp/53: DENY by implicit deny
+        10.1.1.99 -> 10.2.2.22 tcp/htps: INVALID FLOW, the address, protocol or port is not understood
+
+        flows.csv reads:
+            10.1.1.22,10.2.2.22,tcp,443
+            10.1.1.99,10.2.2.22,udp,53
+            10.1.1.99,10.2.2.22,tcp,htps
+
+    '''
+    parser = argparse.ArgumentParser(description="Evaluate flows against an interface's inbound ACL.")
+    parser.add_argument('interface', help="The name ('name-if') of the interface.")
+    parser.add_argument('flows', help='A CSV file of source,destination,protocol,port flows.')
+    parser.add_argument('-d', '--database', help='Use the newest snapshot in this database instead of the ASA.')
+    options = parser.parse_args()
+
+    asa = input('What ASA do you want to trace against? ')
+    classifier = build_classifier(asa, options.interface, options.database)
+    if classifier.unresolved:
+        print('RULES AT POSITIONS {} COULD NOT BE EXPANDED AND WERE SKIPPED\n'.format(classifier.unresolved))
+
+    with open(options.flows) as flow_file:
+        flows = [tuple((row + [''] * 4)[:4]) for row in csv.reader(flow_file) if row and not row[0].startswith('#')]
+
+    for decision in classifier.decide(flows):
+        print_decision(decision)
+
+
+def build_classifier(asa, intfc_name, database=None):
+    '''
+    This function builds the ACLClassifier of an interface from the ASA, or from
+    the newest snapshot of the ASA when a snapshot database is given.
+
+    Returns:
+        An ACLClassifier.
+
+    '''
+    if database:
+        store = ASASnapshotStore(database)
+        snapshot = store.latest(asa)
+        index = store.object_index(snapshot)
+        rules = store.items(snapshot, 'acl_rules', intfc_name)
+    else:
+        login_cred = ASAAAA(asa)
+        header = login_cred.asa_login()
+        index = ObjectIndex(ASAObject(asa, header, session=login_cred.session))
+        rules = ASAACL(asa, header, session=login_cred.session).asa_iter_acl_access_in(intfc_name)
+
+    return ACLClassifier(rules, index.address_ranges, index.service_ranges)
+
+
+def print_decision(decision):
+    '''
+    This function prints the decision for one flow.
+
+    Args:
+        decision: A FlowDecision from ACLClassifier.decide.
+
+    '''
+    source, destination, protocol, port = decision.flow
+    if not decision.valid:
+        print('{} -> {} {}/{}: INVALID FLOW, the address, protocol or port is not understood'.format(
+            source, destination, protocol, port))
+        return
+    if decision.position == None:
+        rule = 'implicit deny'
+    else:
+        rule = 'rule {} ({})'.format(decision.position, decision.object_id)
+    print('{} -> {} {}/{}: {} by {}'.format(
+        source, destination, protocol, port, 'PERMIT' if decision.permitted else 'DENY', rule))
+
+
+if __name__ == '__main__':
+    main()
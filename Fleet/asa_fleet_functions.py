@@ -0,0 +1,151 @@
+import time
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from asa_aaa_class import ASAAAA
+from asa_session import ASASession
+from asa_acl_class import ASAACL
+from asa_object_class import ASAObject
+from asa_routing_class import ASARouting
+from asa_interface_class import ASAInterface
+
+
+API_CLASSES = {
+    'ASAACL': ASAACL,
+    'ASAObject': ASAObject,
+    'ASARouting': ASARouting,
+    'ASAInterface': ASAInterface
+}
+
+FleetResult = namedtuple('FleetResult', 'asa args response error elapsed')
+
+
+def read_inventory(inventory):
+    '''
+    This function reads an inventory file of ASAs. Each line holds the IP or
+    hostname of one ASA; blank lines and lines starting with '#' are skipped.
+
+    Args:
+        inventory: The path to the inventory file.
+
+    Returns:
+        A list of ASAs in the order they appear in the file.
+
+    '''
+    with open(inventory) as inventory_file:
+        lines = (line.split('#')[0].strip() for line in inventory_file)
+        return [line for line in lines if line]
+
+
+def resolve_method(method):
+    '''
+    This function takes a method name such as 'ASARouting.asa_get_all_static_routes'
+    and returns the class and method name it refers to.
+
+    Args:
+        method: The API class and method separated by a '.'.
+
+    Returns:
+        A tuple of the API class and the method name.
+
+    '''
+    class_name, method_name = method.split('.')
+    if class_name not in API_CLASSES or not hasattr(API_CLASSES[class_name], method_name):
+        raise ValueError('{} is not an ASA API method; choose from {}'.format(method, sorted(API_CLASSES)))
+
+    return API_CLASSES[class_name], method_name
+
+
+class FleetDevice:
+    '''
+    The per-ASA state used by run_fleet: a pooled session, the token obtained
+    on first use, and a semaphore bounding how many calls run against the ASA
+    at the same time. Logging in is done once, by whichever call gets there first.
+
+    '''
+
+    def __init__(self, asa, un, pw, per_device_limit, timeout, token_cache=None):
+        self.asa = asa
+        self.session = ASASession(pool_size=per_device_limit, timeout=timeout)
+        self.login_cred = ASAAAA(asa, un, pw, session=self.session, token_cache=token_cache)
+        self.limit = threading.BoundedSemaphore(per_device_limit)
+        self.header = None
+        self._login_lock = threading.Lock()
+
+    def login(self):
+        with self._login_lock:
+            if self.header == None:
+                self.header = self.login_cred.asa_login()
+                if self.header == None:
+                    raise RuntimeError('login to {} failed'.format(self.asa))
+        return self.header
+
+
+def run_on_asa(device, api_class, method_name, args, timeout):
+    '''
+    This function logs in to the ASA if needed and runs the method on it.
+
+    Args:
+        device: The FleetDevice of the ASA.
+        api_class: The API class, such as ASARouting.
+        method_name: The name of the method to call.
+        args: A tuple of arguments passed to the method.
+        timeout: The number of seconds to wait for a free slot on the ASA.
+
+    Returns:
+        A FleetResult for the call.
+
+    '''
+    start = time.monotonic()
+    if not device.limit.acquire(timeout=timeout):
+        return FleetResult(device.asa, args, None, 'timed out waiting for the device', time.monotonic() - start)
+
+    try:
+        header = device.login()
+        api = api_class(device.asa, header, session=device.session)
+        response = getattr(api, method_name)(*args)
+        return FleetResult(device.asa, args, response, None, time.monotonic() - start)
+    except Exception as error:
+        return FleetResult(device.asa, args, None, repr(error), time.monotonic() - start)
+    finally:
+        device.limit.release()
+
+
+def run_fleet(asas, un, pw, method, calls=((),), workers=32, per_device_limit=2, timeout=60, token_cache=None):
+    '''
+    This function runs an API class method across many ASAs at once, and yields
+    each result as soon as it finishes rather than when the whole fleet is done.
+    At most 'workers' calls run at the same time across the fleet, and at most
+    'per_device_limit' against any one ASA.
+
+    Args:
+        asas: A list of ASAs, such as the output of read_inventory.
+        un: The username used to login to every ASA.
+        pw: The password used to login to every ASA.
+        method: The API class and method, such as 'ASARouting.asa_get_all_static_routes'.
+        calls: A list of argument tuples; the method is called once per tuple on every ASA.
+        workers: The number of calls that may run at the same time across the fleet.
+        per_device_limit: The number of calls that may run at the same time on one ASA.
+        timeout: The number of seconds allowed for each call to an ASA, and for waiting on a busy ASA.
+        token_cache: An ASATokenCache, or False to always login.
+
+    Yields:
+        A FleetResult per ASA and argument tuple, in the order they finish.
+
+    Example:
+
+        >>>for result in run_fleet(read_inventory('fleet.txt'), un, pw,
+        ...                        'ASARouting.asa_get_all_static_routes'):
+        ...    print(result.asa, result.response.status_code)
+        10.10.10.5 200
+        10.10.20.5 200
+
+    '''
+    api_class, method_name = resolve_method(method)
+    devices = [FleetDevice(asa, un, pw, per_device_limit, timeout, token_cache) for asa in asas]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_on_asa, device, api_class, method_name, tuple(args), timeout)
+                   for device in devices for args in calls]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,81 @@
+import os
+import argparse
+from getpass import getpass
+from asa_fleet_functions import read_inventory, run_fleet
+
+
+def main():
+    '''
+    The purpose of this program is to run one ASA API method on every ASA in an
+    inventory file. The ASAAAA class is used to establish a session with each
+    ASA, and the requested API class method is called on all of them at the
+    same time. Results are printed as each ASA finishes, and the response body
+    of each ASA can be saved to a directory.
+
+    Print:
+        One line per ASA with the status code and time taken, or the error.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_run_fleet.py fleet.txt ASARouting.asa_get_all_static_routes
+        -o routes
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        LOGIN STATUS_CODE: 204 OK
+
+        10.10.20.5 STATUS_CODE: 200 (0.41s)
+        10.10.10.5 STATUS_CODE: 200 (0.57s)
+
+        (py3) C:\\asa_api_tests>python asa_run_fleet.py fleet.txt ASAACL.asa_get_acl_access_in lab
+
+    '''
+    parser = argparse.ArgumentParser(description='Run an ASA API method across a fleet of ASAs.')
+    parser.add_argument('inventory', help='A file with one ASA per line.')
+    parser.add_argument('method', help='The API method, such as ASARouting.asa_get_all_static_routes.')
+    parser.add_argument('args', nargs='*', help='Arguments passed to the method.')
+    parser.add_argument('-w', '--workers', type=int, default=32, help='Concurrent calls across the fleet.')
+    parser.add_argument('-p', '--per-device', type=int, default=2, help='Concurrent calls to one ASA.')
+    parser.add_argument('-t', '--timeout', type=int, default=60, help='Seconds allowed for each ASA call.')
+    parser.add_argument('-o', '--output', help='A directory to save each response body to.')
+    options = parser.parse_args()
+
+    asas = read_inventory(options.inventory)
+    un = input('What is your username? ')
+    pw = getpass('Enter your password: ')
+
+    if options.output:
+        os.makedirs(options.output, exist_ok=True)
+
+    for result in run_fleet(asas, un, pw, options.method, [options.args], options.workers,
+                            options.per_device, options.timeout):
+        print_result(result, options.output)
+
+
+def print_result(result, output=None):
+    '''
+    This function prints the outcome of one ASA's call, and saves the response
+    body when an output directory is given.
+
+    Args:
+        result: A FleetResult from run_fleet.
+        output: A directory to save the response body to.
+
+    Print:
+        The ASA with the status code and time taken, or the error.
+
+    '''
+    if result.error:
+        print('{} FAILED!!! {} ({:.2f}s)'.format(result.asa, result.error, result.elapsed))
+        return
+
+    print('{} STATUS_CODE: {} ({:.2f}s)'.format(result.asa, result.response.status_code, result.elapsed))
+    if output:
+        with open(os.path.join(output, '{}.json'.format(result.asa)), 'w') as output_file:
+            output_file.write(result.response.text)
+
+
+if __name__ == '__main__':
+    main()
@@ -36,9 +36,9 @@ def main():
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    config = config_variables(asa, header)
+    config = config_variables(asa, header, login_cred.session)
 
-    interface = ASAInterface(asa, header)
+    interface = ASAInterface(asa, header, session=login_cred.session)
     config_interface = interface.asa_config_phys_interface(
         config['interface'], config['security_level'], config['name'],
         config['ip_address'], config['net_mask'], config['description']
@@ -51,7 +51,7 @@ def main():
             config_interface.status_code, config_interface.reason, config_interface.content))
 
 
-def config_variables(asa, header):
+def config_variables(asa, header, session=None):
     '''
     This function is used to collect the desired interface's
     configuration as a dictionary.
@@ -62,7 +62,7 @@ def config_variables(asa, header):
     '''
     return {
         "interface": input('What interface would you like to configure?\n{} '.format(
-            unused_intfcs_hardware_id(asa, header))),
+            unused_intfcs_hardware_id(asa, header, session))),
         "security_level" : input('What is the secuirity level of the interface? '),
         "name" : input('What is the name of the interface? '),
         "ip_address" : input('What is the IP address of the interface? '),
@@ -1,6 +1,7 @@
 import json
 from asa_aaa_class import ASAAAA
 from asa_interface_class import ASAInterface
+from asa_interface_models import Interface
 from asa_interface_functions import used_intfcs_hardware_id
 
 
@@ -40,16 +41,16 @@ def main():
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    intfc = input('What interface would you like to view?\n{}: '.format(used_intfcs_hardware_id(asa, header)))
+    intfc = input('What interface would you like to view?\n{}: '.format(used_intfcs_hardware_id(asa, header, login_cred.session)))
 
-    asa_intfc = ASAInterface(asa, header)
+    asa_intfc = ASAInterface(asa, header, session=login_cred.session)
     intfc_config = asa_intfc.asa_get_phys_interface(intfc)
 
     if intfc_config.ok:
         intfc = sort_intfc(json.loads((intfc_config.text)))
         print('\nInterface {}\n {}\n {}\n {}\n Security: {}\n Speed: {}\n Duplex: {}'.format(
-            intfc['intfc'], intfc['desc'], intfc['name'], intfc['ip'],
-            intfc['level'], intfc['speed'], intfc['duplex']))
+            intfc.hardware_id, intfc.description, intfc.name, intfc.ip,
+            intfc.security_level, intfc.speed, intfc.duplex))
     else:
         print("GET Interface FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
             intfc_config.status_code, intfc_config.reason, intfc_config.content))
@@ -62,18 +63,10 @@ def sort_intfc(config_json):
         config_json: The interface's configuration in json format.
 
     Returns:
-         A dictionary with interesting values; this is used to call desired 'key's for printing.
+         An Interface record with the interesting values used for printing.
 
     '''
-    return {
-        "intfc": config_json['hardwareID'],
-        "desc": config_json['interfaceDesc'],
-        "ip": '{} {}'.format(config_json['ipAddress']['ip']['value'], config_json['ipAddress']['netMask']['value']),
-        "name": config_json['name'],
-        "level": config_json['securityLevel'],
-        "speed": config_json['speed'],
-        "duplex": config_json['duplex']
-    }
+    return Interface.from_json(config_json)
 
 
 if __name__ == '__main__':
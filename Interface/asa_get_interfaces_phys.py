@@ -1,6 +1,7 @@
-import json
+from requests import HTTPError
 from asa_aaa_class import ASAAAA
 from asa_interface_class import ASAInterface
+from asa_interface_models import Interface
 
 
 def main():
@@ -66,15 +67,12 @@ def main():
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    asa_intfcs = ASAInterface(asa, header)
-    intfcs_config = asa_intfcs.asa_get_phys_interfaces()
-
-    if intfcs_config.ok:
-        intfcs_config_json = json.loads(intfcs_config.text)['items']
-        print_intfcs(intfcs_config_json)
-    else:
+    asa_intfcs = ASAInterface(asa, header, session=login_cred.session)
+    try:
+        print_intfcs(asa_intfcs.asa_stream_phys_interfaces())
+    except HTTPError as error:
         print("GET Interfaces FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
-            intfcs_config.status_code, intfcs_config.reason, intfcs_config.content))
+            error.response.status_code, error.response.reason, error.response.content))
 
 
 def sort_intfc(config_json):
@@ -84,18 +82,10 @@ def sort_intfc(config_json):
         config_json: The interface's configuration in json format.
 
     Returns:
-         A dictionary with interesting values; this is used to call desired 'key's for printing.
+         An Interface record with the interesting values used for printing.
 
     '''
-    return {
-        "intfc": config_json['hardwareID'],
-        "desc": config_json['interfaceDesc'],
-        "ip": '{} {}'.format(config_json['ipAddress']['ip']['value'], config_json['ipAddress']['netMask']['value']),
-        "name": config_json['name'],
-        "level": config_json['securityLevel'],
-        "speed": config_json['speed'],
-        "duplex": config_json['duplex']
-    }
+    return Interface.from_json(config_json)
 
 
 def print_intfcs(intfcs_json):
@@ -118,8 +108,8 @@ def print_intfcs(intfcs_json):
         else:
             intfc = sort_intfc(intfc_config)
             print('\nInterface {}\n {}\n {}\n {}\n Security: {}\n Speed: {}\n Duplex: {}'.format(
-                intfc['intfc'], intfc['desc'], intfc['name'], intfc['ip'],
-                intfc['level'], intfc['speed'], intfc['duplex']))
+                intfc.hardware_id, intfc.description, intfc.name, intfc.ip,
+                intfc.security_level, intfc.speed, intfc.duplex))
 
     print('\nAvailable Interfaces are: ')
     for intfc in avail_intfcs:
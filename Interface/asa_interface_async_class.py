@@ -0,0 +1,86 @@
+import json
+from asa_aaa_class import ASAAAA
+from asa_interface_class import phys_interface_config
+from asa_async_session import AsyncASASession
+
+
+class AsyncASAInterface:
+    '''Asyncio counterpart of ASAInterface.
+
+    The methods have the same names, arguments and return shapes as ASAInterface,
+    but are coroutines sent through an AsyncASASession.
+
+    '''
+
+    def __init__(self, asa, header=None, base_url=None, session=None):
+        '''
+        Args:
+            asa: The IP or hostname to be used to reach the desired ASA.
+            header: The header to use for providing the authentication token.
+            base_url: The base URL used by all API calls in the module.
+            session: The AsyncASASession used to send every API call.
+
+        Example:
+
+            >>>asa_interface = AsyncASAInterface(asa, header, session=session)
+
+        '''
+        self.asa = asa
+
+        if header == None:
+            self.header = ASAAAA(asa).asa_login()
+        else:
+            self.header = header
+
+        if base_url == None:
+            self.base_url = "https://{}/api/interfaces/".format(asa)
+        else:
+            self.base_url = base_url
+
+        if session == None:
+            self.session = AsyncASASession()
+        else:
+            self.session = session
+
+    async def asa_get_phys_interface(self, hardware_id):
+        '''
+        Returns:
+            The configuration of a single interface; see ASAInterface.asa_get_phys_interface.
+
+        '''
+        interface = hardware_id.split('/')
+        url = self.base_url + 'physical/{}_API_SLASH_{}'.format(interface[0], interface[1])
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_get_phys_interfaces(self):
+        '''
+        Returns:
+            The configuration of all interfaces; see ASAInterface.asa_get_phys_interfaces.
+
+        '''
+        url = self.base_url + 'physical'
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_config_phys_interface(self, hardware_id, security_level, name, ip_address, net_mask, description,
+                                        mtu=1500, duplex='auto', speed='auto', shutdown='false', mgmt_only='false'):
+        '''
+        Returns:
+            The result of PUTting the interface configuration; see ASAInterface.asa_config_phys_interface.
+
+        '''
+        intfc = hardware_id.split('/')
+        intfc_status = await self.asa_get_phys_interface(hardware_id)
+        intfc_status_json = json.loads(intfc_status.text)
+        if intfc_status_json['shutdown']:
+            kind = intfc_status_json["kind"]
+
+            interface_config = phys_interface_config(kind, hardware_id, security_level, name, ip_address,
+                                                     net_mask, description, mtu, duplex, speed, shutdown,
+                                                     mgmt_only)
+
+            url = self.base_url + 'physical/{}_API_SLASH_{}'.format(intfc[0], intfc[1])
+            return await self.session.put(url, verify=False, headers=self.header, json=interface_config)
+
+        else:
+            print("Interface currently in use! ")
+            exit()
@@ -1,7 +1,62 @@
 import json
-import requests
 from pprint import pprint
 from asa_aaa_class import ASAAAA
+from asa_session import ASASession
+from asa_paging import asa_iter_items
+from asa_stream import asa_stream_items
+from asa_interface_models import Interface
+
+
+def phys_interface_config(kind, hardware_id, security_level, name, ip_address, net_mask, description,
+                          mtu=1500, duplex='auto', speed='auto', shutdown='false', mgmt_only='false'):
+    '''
+    This function builds the body used to configure a physical interface.
+
+    Args:
+        kind: The kind of interface, as reported by the ASA for the hardware_id.
+        hardware_id: The interface being configured.
+        security_level: The security level of the interface.
+        name: The name ('name-if') of the interface.
+        ip_address: The IP address of the interface.
+        net_mask: The mask for the IP address.
+        description: The description of the interface.
+
+    Returns:
+        A dictionary of the interface configuration.
+
+    '''
+    return {
+        'securityLevel': security_level,
+        'kind': kind,
+        'channelGroupMode': 'active',
+        'flowcontrolLow': -1,
+        'name': name,
+        'duplex': duplex,
+        'hardwareID': hardware_id,
+        'mtu': mtu,
+        'lacpPriority': -1,
+        'flowcontrolHigh': -1,
+        'ipAddress': {
+            'ip': {
+                'kind': 'IPv4Address',
+                'value': ip_address
+            },
+            'kind': 'StaticIP',
+            'netMask': {
+                'kind': 'IPv4NetMask',
+                'value': net_mask
+            }
+        },
+        'flowcontrolOn': 'false',
+        'shutdown': shutdown,
+        'interfaceDesc': description,
+        'managementOnly': mgmt_only,
+        'channelGroupID': "",
+        'speed': speed,
+        'flowcontrolPeriod': -1,
+        'forwardTrafficSFR': 'false',
+        'forwardTrafficCX': 'false'
+    }
 
 
 class ASAInterface:
@@ -15,18 +70,21 @@ class ASAInterface:
 
     '''
 
-    def __init__(self, asa, header=None, base_url=None):
+    def __init__(self, asa, header=None, base_url=None, session=None):
         '''
         The __init__ method requires an ASA name or IP that can be used to make API calls.
         It is expected that the ASAAAA class will be used to obtain a header containing a
         valid authentication token; however, a user will be prompted to initialize ASAAAA and
         obtain the necessary token if none is provided. The default base URL is based on Cisco's
         API documentation; all methods will build off the base URL for making an API call.
+        The session should be the ASASession kept by ASAAAA at login, so that all classes
+        share one pool of keep-alive connections to the ASA.
 
         Args:
             asa: The IP or hostname to be used to reach the desired ASA.
             header: The header to use for providing the authentication token.
             base_url: The base URL used by all API calls in the module.
+            session: The ASASession used to send every API call.
 
         Example:
 
@@ -39,7 +97,7 @@ class ASAInterface:
 
             LOGIN STATUS_CODE: 204 OK
 
-            >>>asa_interface = ASAAInterface(asa, header)
+            >>>asa_interface = ASAAInterface(asa, header, session=asa_login.session)
 
         '''
         self.asa = asa
@@ -54,6 +112,11 @@ class ASAInterface:
         else:
             self.base_url = base_url
 
+        if session == None:
+            self.session = ASASession()
+        else:
+            self.session = session
+
     def asa_get_phys_interface(self, hardware_id):
         '''
         This method is used to obtain the configuration for a single interface
@@ -119,7 +182,7 @@ class ASAInterface:
         '''
         interface = hardware_id.split('/')
         url = self.base_url + 'physical/{}_API_SLASH_{}'.format(interface[0], interface[1])
-        return requests.get(url, verify=False, headers=self.header)
+        return self.session.get(url, verify=False, headers=self.header)
 
     def asa_get_phys_interfaces(self):
         '''
@@ -220,7 +283,52 @@ class ASAInterface:
 
         '''
         url = self.base_url + 'physical'
-        return requests.get(url, verify=False, headers=self.header)
+        return self.session.get(url, verify=False, headers=self.header)
+
+    def asa_iter_phys_interfaces(self, limit=100, workers=4, records=False):
+        '''
+        This method is the paged form of asa_get_phys_interfaces. It follows
+        every page of the collection, fetching the pages after the first one at the
+        same time, so the whole collection is returned however large it is.
+
+        Args:
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+            records: True to return Interface records instead of the JSON items.
+
+        Returns:
+            A generator of interface configurations, yielded as each page arrives.
+
+        Example:
+
+            >>>intfcs_config = list(asa_intfcs.asa_iter_phys_interfaces())
+
+        '''
+        url = self.base_url + 'physical'
+        items = asa_iter_items(self.session, url, self.header, limit, workers)
+        return map(Interface.from_json, items) if records else items
+
+    def asa_stream_phys_interfaces(self, limit=100, records=False):
+        '''
+        This method is the constant memory form of asa_iter_phys_interfaces. The pages
+        are requested one after another and each item is decoded from the socket as
+        it arrives, so a very large collection is never held in memory at once.
+
+        Args:
+            limit: The number of items requested per page.
+            records: True to return Interface records instead of the JSON items.
+
+        Returns:
+            A generator of physical interfaces, yielded in the order the ASA lists them.
+
+        Example:
+
+            >>>print_intfcs(asa_intfcs.asa_stream_phys_interfaces())
+
+        '''
+        url = self.base_url + 'physical'
+        items = asa_stream_items(self.session, url, self.header, limit)
+        return map(Interface.from_json, items) if records else items
 
     def asa_config_phys_interface(self, hardware_id, security_level, name, ip_address, net_mask, description,
                                   mtu=1500, duplex='auto', speed='auto', shutdown='false', mgmt_only='false'):
@@ -245,41 +353,12 @@ class ASAInterface:
         if intfc_status_json['shutdown']:
             kind = intfc_status_json["kind"]
 
-            interface_config = {
-                'securityLevel': security_level,
-                'kind': kind,
-                'channelGroupMode': 'active',
-                'flowcontrolLow': -1,
-                'name': name,
-                'duplex': duplex,
-                'hardwareID': hardware_id,
-                'mtu': mtu,
-                'lacpPriority': -1,
-                'flowcontrolHigh': -1,
-                'ipAddress': {
-                    'ip': {
-                        'kind': 'IPv4Address',
-                        'value': ip_address
-                    },
-                    'kind': 'StaticIP',
-                    'netMask': {
-                        'kind': 'IPv4NetMask',
-                        'value': net_mask
-                    }
-                },
-                'flowcontrolOn': 'false',
-                'shutdown': shutdown,
-                'interfaceDesc': description,
-                'managementOnly': mgmt_only,
-                'channelGroupID': "",
-                'speed': speed,
-                'flowcontrolPeriod': -1,
-                'forwardTrafficSFR': 'false',
-                'forwardTrafficCX': 'false'
-            }
+            interface_config = phys_interface_config(kind, hardware_id, security_level, name, ip_address,
+                                                     net_mask, description, mtu, duplex, speed, shutdown,
+                                                     mgmt_only)
 
             url = self.base_url + 'physical/{}_API_SLASH_{}'.format(intfc[0], intfc[1])
-            return requests.put(url, verify=False, headers=self.header, json=interface_config)
+            return self.session.put(url, verify=False, headers=self.header, json=interface_config)
 
         else:
             print("Interface currently in use! ")
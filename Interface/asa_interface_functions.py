@@ -1,22 +1,21 @@
-import json
 from asa_interface_class import ASAInterface
 
 
-def used_intfcs_hardware_id(asa, header):
+def used_intfcs_hardware_id(asa, header, session=None):
     '''
     This function is used to get the currently used interfaces.
 
     Args:
         asa: The IP or hostname to be used to reach the desired ASA.
         header: The header to use for providing the authentication token.
+        session: The ASASession used to send the API call.
 
     Returns:
         A list of currently used interfaces.
 
     '''
-    intfc_config = ASAInterface(asa, header)
-    intfcs = intfc_config.asa_get_phys_interfaces().text
-    intfcs_json = json.loads(intfcs)["items"]
+    intfc_config = ASAInterface(asa, header, session=session)
+    intfcs_json = intfc_config.asa_iter_phys_interfaces()
     used_intfcs = []
     for intfc in intfcs_json:
         if not intfc["shutdown"]:
@@ -26,20 +25,21 @@ def used_intfcs_hardware_id(asa, header):
     return used_intfcs
 
 
-def used_intfcs_name(asa, header):
+def used_intfcs_name(asa, header, session=None):
     '''This function uses ASAInterface class to collect the Interfaces,
     and returns just the names of used interfaces
 
     Args:
         asa: The IP or hostname to be used to reach the desired ASA.
         header: The header to use for providing the authentication token.
+        session: The ASASession used to send the API call.
 
     Returns:
          A list of currently used interfaces
 
     '''
-    intfc_config = ASAInterface(asa, header)
-    intfcs = json.loads(intfc_config.asa_get_phys_interfaces().text)['items']
+    intfc_config = ASAInterface(asa, header, session=session)
+    intfcs = intfc_config.asa_iter_phys_interfaces()
     used_intfcs = []
     for intfc in intfcs:
         if not intfc["shutdown"]:
@@ -48,21 +48,21 @@ def used_intfcs_name(asa, header):
     return used_intfcs
 
 
-def unused_intfcs_hardware_id(asa, header):
+def unused_intfcs_hardware_id(asa, header, session=None):
     '''
     This function is used to get the currently unused interfaces.
 
     Args:
         asa: The IP or hostname to be used to reach the desired ASA.
         header: The header to use for providing the authentication token.
+        session: The ASASession used to send the API call.
 
     Returns:
         A list of currently unused interfaces.
 
     '''
-    intfc_config = ASAInterface(asa, header)
-    intfcs = intfc_config.asa_get_phys_interfaces().text
-    intfcs_json = json.loads(intfcs)["items"]
+    intfc_config = ASAInterface(asa, header, session=session)
+    intfcs_json = intfc_config.asa_iter_phys_interfaces()
     unused_intfcs = []
     for intfc in intfcs_json:
         if intfc["shutdown"]:
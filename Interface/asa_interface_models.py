@@ -0,0 +1,51 @@
+from asa_models import Record
+
+
+class Interface(Record):
+    '''
+    A physical interface and the configuration the programs display.
+
+    '''
+    __slots__ = ('hardware_id', 'name', 'description', 'ip_address', 'net_mask', 'security_level', 'speed',
+                 'duplex', 'shutdown')
+
+    def __init__(self, hardware_id, name, description, ip_address, net_mask, security_level, speed, duplex,
+                 shutdown):
+        self.hardware_id = hardware_id
+        self.name = name
+        self.description = description
+        self.ip_address = ip_address
+        self.net_mask = net_mask
+        self.security_level = security_level
+        self.speed = speed
+        self.duplex = duplex
+        self.shutdown = shutdown
+
+    @property
+    def ip(self):
+        return '{} {}'.format(self.ip_address, self.net_mask)
+
+    @classmethod
+    def from_json(cls, config_json):
+        '''
+        Args:
+            config_json: The interface's configuration from an ASA API call.
+
+        Returns:
+            An Interface. The address fields are None when no address is configured.
+
+        '''
+        address = config_json.get('ipAddress')
+        if not isinstance(address, dict):
+            address = {}
+        return cls(
+            config_json['hardwareID'],
+            config_json.get('name'),
+            config_json.get('interfaceDesc'),
+            address.get('ip', {}).get('value'),
+            address.get('netMask', {}).get('value'),
+            config_json.get('securityLevel'),
+            config_json.get('speed'),
+            config_json.get('duplex'),
+            config_json.get('shutdown', False)
+        )
@@ -1,4 +1,3 @@
-import json
 from asa_aaa_class import ASAAAA
 from asa_object_class import ASAObject
 from asa_routing_class import ASARouting
@@ -18,7 +17,8 @@ def main():
     Print:
         The configuration result: A 201 means the configuration was applied,
         other codes indicate an issue with the request. Failures do print
-        the code, reason, and content of the response.
+        the code, reason, and content of the response. A value with no route
+        is not configured.
 
     Example:
 
@@ -44,19 +44,22 @@ def main():
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    routes = ASARouting(asa, header)
-    asa_routes = routes.asa_get_all_static_routes().text
-    sorted_routes = sort_routes(json.loads(asa_routes)['items'])
+    routes = ASARouting(asa, header, session=login_cred.session)
+    sorted_routes = sort_routes(routes.asa_iter_all_static_routes())
 
     config = config_variables()
     used_route = route_used(sorted_routes, config['host'])
+    if used_route == None:
+        print("\nPOST OBJECT CONFIG SKIPPED!!! NO ROUTE for {}, so the name of the object "
+              "could not be chosen.".format(config['host']))
+        return
     key = determine_obj_key(config['host'])
     obj_name = make_name(key, used_route, config['host'])
 
     if '/32' in config['host']:
         config['host'] = config['host'].split('/')[0]
 
-    net_obj = ASAObject(asa, header)
+    net_obj = ASAObject(asa, header, session=login_cred.session)
     config_obj = net_obj.asa_create_network_object(obj_name, config['host'], config['desc'])
 
     if config_obj.ok:
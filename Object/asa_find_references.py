@@ -0,0 +1,101 @@
+import argparse
+from asa_aaa_class import ASAAAA
+from asa_acl_class import ASAACL
+from asa_object_class import ASAObject
+from asa_routing_class import ASARouting
+from asa_object_functions import ObjectIndex
+from asa_object_references import ReferenceIndex
+from asa_snapshot_functions import ASASnapshotStore
+
+
+def main():
+    '''
+    The purpose of this program is to find where objects and object groups are
+    used before they are changed or deleted, and what covers an address. Every
+    ACL rule, object group and static route is collected from the ASA, or from
+    the newest snapshot of the ASA, once, and indexed with a ReferenceIndex.
+
+    Print:
+        Each rule, group and route that references the objects, directly or
+        through the groups they are nested in, and the objects, groups and rules
+        that cover each address.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_find_references.py lab-host-10.1.1.22_32 -a 10.2.2.22
+        What ASA do you want to search? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        lab-host-10.1.1.22_32 is used by:
+            group grp-lab-neteng-networks
+            rule 3 (3535378664) of lab, sourceAddress, through grp-lab-neteng-networks
+
+        10.2.2.22 is covered by:
+            objectRef#NetworkObj weblab-host-10.2.2.22_32
+            objectRef#NetworkObjGroup grp-weblab-servers
+            rule 3 (3535378664) of lab, destinationAddress
+            rule 1 (938417220) of weblab, sourceAddress
+
+    '''
+    parser = argparse.ArgumentParser(description='Find where objects are used, and what covers addresses.')
+    parser.add_argument('objects', nargs='*', help='The objectIds of objects or object groups.')
+    parser.add_argument('-a', '--address', action='append', default=[], help='An address to find what covers.')
+    parser.add_argument('-d', '--database', help='Use the newest snapshot in this database instead of the ASA.')
+    options = parser.parse_args()
+
+    asa = input('What ASA do you want to search? ')
+    if options.database:
+        store = ASASnapshotStore(options.database)
+        references = ReferenceIndex.from_snapshot(store, store.latest(asa))
+    else:
+        login_cred = ASAAAA(asa)
+        header = login_cred.asa_login()
+        acl = ASAACL(asa, header, session=login_cred.session)
+        index = ObjectIndex(ASAObject(asa, header, session=login_cred.session))
+        routes = ASARouting(asa, header, session=login_cred.session)
+        references = ReferenceIndex.build(index, acl.asa_iter_acls_in(records=True), acl.asa_iter_acl_access_in,
+                                          routes.asa_iter_all_static_routes())
+
+    for object_id in options.objects:
+        print_references(references, object_id)
+
+    for address in options.address:
+        objects, rules = references.covering(address)
+        print('\n{} is covered by:'.format(address))
+        for kind, object_id in objects:
+            print('    {} {}'.format(kind, object_id))
+        for rule in rules:
+            print('    rule {} ({}) of {}, {}'.format(rule.position, rule.object_id, rule.interface, rule.field))
+
+
+def print_references(references, object_id):
+    '''
+    This function prints what uses an object or group. References through a
+    parent group name the group the object is nested in.
+
+    Args:
+        references: A ReferenceIndex.
+        object_id: The objectId of the object or group.
+
+    '''
+    found = references.used_by(object_id)
+    if not found:
+        print('\n{} is not used'.format(object_id))
+        return
+    print('\n{} is used by:'.format(object_id))
+    for via, reference in found:
+        through = '' if via == object_id else ', through {}'.format(via)
+        if reference.kind == 'rule':
+            print('    rule {} ({}) of {}, {}{}'.format(reference.position, reference.object_id, reference.interface,
+                                                       reference.field, through))
+        elif reference.kind == 'route':
+            print('    route {} on {}, {}{}'.format(reference.object_id, reference.interface, reference.field, through))
+        else:
+            print('    group {}{}'.format(reference.object_id, through))
+
+
+if __name__ == '__main__':
+    main()
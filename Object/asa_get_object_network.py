@@ -1,4 +1,5 @@
-import json
+from itertools import chain
+from requests import HTTPError
 from asa_aaa_class import ASAAAA
 from asa_object_class import ASAObject
 
@@ -46,16 +47,16 @@ def main():
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    asa_objects = ASAObject(asa, header)
-    net_objects = asa_objects.asa_get_network_objects()
-
-    if net_objects.ok:
-        print("GET NETWORK OBJECT STATUS_CODE: {} OK \n".format(net_objects.status_code))
-        net_objects_json = json.loads(net_objects.text)['items']
-        print_net_objects(net_objects_json)
-    else:
+    asa_objects = ASAObject(asa, header, session=login_cred.session)
+    try:
+        net_objects_json = asa_objects.asa_stream_network_objects()
+        first_object = next(net_objects_json, None)
+        print("GET NETWORK OBJECT STATUS_CODE: 200 OK \n")
+        if first_object != None:
+            print_net_objects(chain([first_object], net_objects_json))
+    except HTTPError as error:
         print("GET NETWORK OBJECTS FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
-            net_objects.status_code, net_objects.reason, net_objects.content))
+            error.response.status_code, error.response.reason, error.response.content))
 
 def print_net_objects(objects):
     '''
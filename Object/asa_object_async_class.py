@@ -0,0 +1,89 @@
+from asa_aaa_class import ASAAAA
+from asa_object_class import network_object_config
+from asa_async_session import AsyncASASession
+
+
+class AsyncASAObject:
+    '''Asyncio counterpart of ASAObject.
+
+    The methods have the same names, arguments and return shapes as ASAObject,
+    but are coroutines sent through an AsyncASASession.
+
+    '''
+
+    def __init__(self, asa, header=None, base_url=None, session=None):
+        '''
+        Args:
+            asa: The IP or hostname to be used to reach the desired ASA.
+            header: The header to use for providing the authentication token.
+            base_url: The base URL used by all API calls in the module.
+            session: The AsyncASASession used to send every API call.
+
+        Example:
+
+            >>>asa_object = AsyncASAObject(asa, header, session=session)
+
+        '''
+        self.asa = asa
+
+        if header == None:
+            self.header = ASAAAA(asa).asa_login()
+        else:
+            self.header = header
+
+        if base_url == None:
+            self.base_url = "https://{}/api/".format(asa)
+        else:
+            self.base_url = base_url
+
+        if session == None:
+            self.session = AsyncASASession()
+        else:
+            self.session = session
+
+    async def asa_get_network_object(self, object):
+        '''
+        Returns:
+            The configuration of a network object; see ASAObject.asa_get_network_object.
+
+        '''
+        url = self.base_url + 'objects/networkobjects/' + object
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_get_network_objects(self):
+        '''
+        Returns:
+            The network objects configured on the ASA; see ASAObject.asa_get_network_objects.
+
+        '''
+        url = self.base_url + 'objects/networkobjects'
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_get_network_object_group(self, group):
+        '''
+        Returns:
+            The configuration of a network object group; see ASAObject.asa_get_network_object_group.
+
+        '''
+        url = self.base_url + 'objects/networkobjectgroups/' + group
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_get_network_object_groups(self):
+        '''
+        Returns:
+            The network object groups configured on the ASA; see ASAObject.asa_get_network_object_groups.
+
+        '''
+        url = self.base_url + 'objects/networkobjectgroups'
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_create_network_object(self, name, obj, desc):
+        '''
+        Returns:
+            The result of POSTing the new network object; see ASAObject.asa_create_network_object.
+
+        '''
+        url = self.base_url + 'objects/networkobjects'
+        network_objects_config = network_object_config(name, obj, desc)
+
+        return await self.session.post(url, verify=False, headers=self.header, json=network_objects_config)
@@ -1,9 +1,36 @@
 import json
-import requests
 from asa_aaa_class import ASAAAA
+from asa_session import ASASession
+from asa_paging import asa_iter_items
+from asa_stream import asa_stream_items
+from asa_object_models import NetworkObject, ObjectGroup
 from asa_object_functions import determine_obj_key
 
 
+def network_object_config(name, obj, desc):
+    '''
+    This function builds the body used to create a network object.
+
+    Args:
+        name: The name of the network object
+        obj: The IP, Range, or Subnet the object represents.
+        desc: A description of the object.
+
+    Returns:
+        A dictionary of the network object configuration.
+
+    '''
+    return {
+        'name': name,
+        'host': {
+            'kind': '{}'.format(determine_obj_key(obj)),
+            'value': obj
+        },
+        'description': desc,
+        'kind': 'object#NetworkObj'
+    }
+
+
 class ASAObject:
     '''Methods for making Object related API calls to a Cisco ASA.
 
@@ -14,18 +41,21 @@ class ASAObject:
 
     '''
 
-    def __init__(self, asa, header=None, base_url=None):
+    def __init__(self, asa, header=None, base_url=None, session=None):
         '''
         The __init__ method requires an ASA name or IP that can be used to make API calls.
         It is expected that the ASAAAA class will be used to obtain a header containing a
         valid authentication token; however, a user will be prompted to initialize ASAAAA and
         obtain the necessary token if none is provided. The default base URL is based on Cisco's
         API documentation; all methods will build off the base URL for making an API call.
+        The session should be the ASASession kept by ASAAAA at login, so that all classes
+        share one pool of keep-alive connections to the ASA.
 
         Args:
             asa: The IP or hostname to be used to reach the desired ASA.
             header: The header to use for providing the authentication token.
             base_url: The base URL used by all API calls in the module.
+            session: The ASASession used to send every API call.
 
         Example:
             >>>asa = input('What firewall would you like to use? ')
@@ -37,7 +67,7 @@ class ASAObject:
 
             LOGIN STATUS_CODE: 204 OK
 
-            >>>asa_object = ASAObject(asa, header)
+            >>>asa_object = ASAObject(asa, header, session=asa_login.session)
 
         '''
         self.asa = asa
@@ -52,6 +82,11 @@ class ASAObject:
         else:
             self.base_url = base_url
 
+        if session == None:
+            self.session = ASASession()
+        else:
+            self.session = session
+
     def asa_get_network_object(self, object):
         '''
         This method returns a GET request for obtaining network object configurations.
@@ -79,7 +114,7 @@ class ASAObject:
 
         '''
         url = self.base_url + 'objects/networkobjects/' + object
-        net_object = requests.get(url, verify=False, headers=self.header)
+        net_object = self.session.get(url, verify=False, headers=self.header)
 
         return net_object
 
@@ -119,10 +154,55 @@ class ASAObject:
 
         '''
         url = self.base_url + 'objects/networkobjects'
-        net_objects = requests.get(url, verify=False, headers=self.header)
+        net_objects = self.session.get(url, verify=False, headers=self.header)
 
         return net_objects
 
+    def asa_iter_network_objects(self, limit=100, workers=4, records=False):
+        '''
+        This method is the paged form of asa_get_network_objects. It follows
+        every page of the collection, fetching the pages after the first one at the
+        same time, so the whole collection is returned however large it is.
+
+        Args:
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+            records: True to return NetworkObject records instead of the JSON items.
+
+        Returns:
+            A generator of network objects, yielded as each page arrives.
+
+        Example:
+
+            >>>net_objects = list(asa_objects.asa_iter_network_objects())
+
+        '''
+        url = self.base_url + 'objects/networkobjects'
+        items = asa_iter_items(self.session, url, self.header, limit, workers)
+        return map(NetworkObject.from_json, items) if records else items
+
+    def asa_stream_network_objects(self, limit=100, records=False):
+        '''
+        This method is the constant memory form of asa_iter_network_objects. The pages
+        are requested one after another and each item is decoded from the socket as
+        it arrives, so a very large collection is never held in memory at once.
+
+        Args:
+            limit: The number of items requested per page.
+            records: True to return NetworkObject records instead of the JSON items.
+
+        Returns:
+            A generator of network objects, yielded in the order the ASA lists them.
+
+        Example:
+
+            >>>print_net_objects(asa_objects.asa_stream_network_objects())
+
+        '''
+        url = self.base_url + 'objects/networkobjects'
+        items = asa_stream_items(self.session, url, self.header, limit)
+        return map(NetworkObject.from_json, items) if records else items
+
     def asa_get_network_object_group(self, group):
         '''
         This method returns a GET request for obtaining a specific network
@@ -155,7 +235,7 @@ class ASAObject:
 
         '''
         url = self.base_url + 'objects/networkobjectgroups/' + group
-        net_object_group = requests.get(url, verify=False, headers=self.header)
+        net_object_group = self.session.get(url, verify=False, headers=self.header)
 
         return net_object_group
 
@@ -195,10 +275,112 @@ class ASAObject:
 
         '''
         url = self.base_url + 'objects/networkobjectgroups'
-        net_object_groups = requests.get(url, verify=False, headers=self.header)
+        net_object_groups = self.session.get(url, verify=False, headers=self.header)
 
         return net_object_groups
 
+    def asa_iter_network_object_groups(self, limit=100, workers=4, records=False):
+        '''
+        This method is the paged form of asa_get_network_object_groups. It follows
+        every page of the collection, fetching the pages after the first one at the
+        same time, so the whole collection is returned however large it is.
+
+        Args:
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+            records: True to return ObjectGroup records instead of the JSON items.
+
+        Returns:
+            A generator of network object groups, yielded as each page arrives.
+
+        Example:
+
+            >>>net_object_grps = list(asa_object.asa_iter_network_object_groups())
+
+        '''
+        url = self.base_url + 'objects/networkobjectgroups'
+        items = asa_iter_items(self.session, url, self.header, limit, workers)
+        return map(ObjectGroup.from_json, items) if records else items
+
+    def asa_stream_network_object_groups(self, limit=100, records=False):
+        '''
+        This method is the constant memory form of asa_iter_network_object_groups. The pages
+        are requested one after another and each item is decoded from the socket as
+        it arrives, so a very large collection is never held in memory at once.
+
+        Args:
+            limit: The number of items requested per page.
+            records: True to return ObjectGroup records instead of the JSON items.
+
+        Returns:
+            A generator of network object groups, yielded in the order the ASA lists them.
+
+        Example:
+
+            >>>net_object_grps = asa_object.asa_stream_network_object_groups()
+
+        '''
+        url = self.base_url + 'objects/networkobjectgroups'
+        items = asa_stream_items(self.session, url, self.header, limit)
+        return map(ObjectGroup.from_json, items) if records else items
+
+    def asa_iter_service_objects(self, limit=100, workers=4):
+        '''
+        This method returns every service object configured on the ASA, following
+        every page of the collection. This is similar to a 'show run object service'
+        on the CLI.
+
+        Args:
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+
+        Returns:
+            A generator of service objects, yielded as each page arrives.
+
+        Example:
+
+            >>>svc_objects = list(asa_object.asa_iter_service_objects())
+            >>>pprint(svc_objects[0])
+            {'kind': 'object#TcpUdpServiceObj',
+             'name': 'tcp-8443',
+             'objectId': 'tcp-8443',
+             'selfLink': 'https://10.10.10.5/api/objects/networkservices/tcp-8443',
+             'value': 'tcp/8443'}
+
+        '''
+        url = self.base_url + 'objects/networkservices'
+        return asa_iter_items(self.session, url, self.header, limit, workers)
+
+    def asa_iter_service_object_groups(self, limit=100, workers=4):
+        '''
+        This method returns every service object group configured on the ASA,
+        following every page of the collection. This is similar to a 'show run
+        object-group service' on the CLI.
+
+        Args:
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+
+        Returns:
+            A generator of service object groups, yielded as each page arrives.
+
+        Example:
+
+            >>>svc_groups = list(asa_object.asa_iter_service_object_groups())
+            >>>pprint(svc_groups[0])
+            {'kind': 'object#NetworkServiceGroup',
+             'members': [{'kind': 'TcpUdpService', 'value': 'tcp/https'},
+                         {'kind': 'objectRef#TcpUdpServiceObj',
+                          'objectId': 'tcp-8443',
+                          'refLink': 'https://10.10.10.5/api/objects/networkservices/tcp-8443'}],
+             'name': 'grp-tcp-https',
+             'objectId': 'grp-tcp-https',
+             'selfLink': 'https://10.10.10.5/api/objects/networkservicegroups/grp-tcp-https'}
+
+        '''
+        url = self.base_url + 'objects/networkservicegroups'
+        return asa_iter_items(self.session, url, self.header, limit, workers)
+
     def asa_create_network_object(self, name, obj, desc):
         '''
         This method returns a POST request for configuring a network object on the
@@ -221,14 +403,54 @@ class ASAObject:
 
         '''
         url = self.base_url + 'objects/networkobjects'
-        network_objects_config = {
-            'name': name,
-            'host': {
-                'kind': '{}'.format(determine_obj_key(obj)),
-                'value': obj
-            },
-            'description': desc,
-            'kind': 'object#NetworkObj'
-        }
-
-        return requests.post(url, verify=False, headers=self.header, json=network_objects_config)
+        network_objects_config = network_object_config(name, obj, desc)
+
+        return self.session.post(url, verify=False, headers=self.header, json=network_objects_config)
+
+    def asa_delete_network_object(self, object):
+        '''
+        This method returns a DELETE request for removing a network object from the
+        given ASA. This is similar to a 'no object network name' from the CLI. The
+        ASA refuses to delete an object that is still in use.
+
+        Args:
+            object: The name of the object
+
+        Returns:
+            The request.delete results for removing the network object.
+
+        Example:
+
+            >>>asa_object = ASAObject(asa, header)
+            >>>net_object_delete = asa_object.asa_delete_network_object('webserver0001')
+            >>>print('STATUS_CODE: {}'.format(net_object_delete.status_code))
+            STATUS_CODE: 204
+
+        '''
+        url = self.base_url + 'objects/networkobjects/' + object
+
+        return self.session.delete(url, verify=False, headers=self.header)
+
+    def asa_delete_network_object_group(self, group):
+        '''
+        This method returns a DELETE request for removing a network object group from
+        the given ASA. This is similar to a 'no object-group network name' from the CLI.
+        The ASA refuses to delete a group that is still in use.
+
+        Args:
+            group: The name of the object group
+
+        Returns:
+            The request.delete results for removing the network object group.
+
+        Example:
+
+            >>>asa_object = ASAObject(asa, header)
+            >>>net_object_grp_delete = asa_object.asa_delete_network_object_group('grp-web-servers')
+            >>>print('STATUS_CODE: {}'.format(net_object_grp_delete.status_code))
+            STATUS_CODE: 204
+
+        '''
+        url = self.base_url + 'objects/networkobjectgroups/' + group
+
+        return self.session.delete(url, verify=False, headers=self.header)
@@ -0,0 +1,192 @@
+from bisect import bisect_right
+from asa_acl_table import address_intervals
+from asa_routing_functions import int_to_ip
+
+
+def merge_intervals(ranges):
+    '''
+    This function merges address ranges that overlap or touch.
+
+    Args:
+        ranges: An iterable of (first, last) integer address tuples.
+
+    Returns:
+        A tuple of sorted, non-overlapping (first, last) tuples covering the same addresses.
+
+    '''
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return tuple(merged)
+
+
+def interval_to_cidrs(first, last):
+    '''
+    This function splits an address range into the fewest networks that cover it exactly.
+
+    Args:
+        first: The first address of the range as an integer.
+        last: The last address of the range as an integer.
+
+    Returns:
+        A list of networks such as '10.1.1.0/24', with hosts as '/32'.
+
+    Example:
+
+        >>>interval_to_cidrs(ip_to_int('10.1.1.0'), ip_to_int('10.1.2.127'))
+        ['10.1.1.0/24', '10.1.2.0/25']
+
+    '''
+    cidrs = []
+    while first <= last:
+        size = (first & -first).bit_length() - 1 if first else 32
+        while first + (1 << size) - 1 > last:
+            size -= 1
+        cidrs.append('{}/{}'.format(int_to_ip(first), 32 - size))
+        first += 1 << size
+    return cidrs
+
+
+class GroupExpander:
+    '''
+    A resolver of the full address set of network object groups. Objects,
+    literal hosts, networks and ranges, and nested groups are flattened into one
+    merged set of address ranges per group. Each group is expanded once and
+    remembered, so a group nested in many others, or referenced by many ACL
+    entries, costs one expansion for the life of the expander.
+
+    Members that cannot be expanded, such as FQDN objects or references to
+    objects that do not exist, are left out of the set and listed in unresolved
+    against the group, and against every group that contains it. A group that
+    contains itself, directly or through other groups, raises a ValueError.
+
+    '''
+
+    def __init__(self, objects, groups):
+        '''
+        Args:
+            objects: A dictionary of objectId to NetworkObject.
+            groups: A dictionary of objectId to ObjectGroup.
+
+        Example:
+
+            >>>index = ObjectIndex(ASAObject(asa, header))
+            >>>index.load()
+            >>>expander = GroupExpander(index.objects, index.groups)
+            >>>expander.cidrs('grp-lab-neteng-networks')
+            ['10.1.1.0/24', '10.1.4.16/28']
+
+        '''
+        self.objects = objects
+        self.groups = groups
+        self.unresolved = {}
+        self._sets = {}
+        self._objects = {}
+
+    def object_ranges(self, object_id):
+        '''
+        Returns:
+            The address ranges of a network object, or None if it cannot be expanded.
+
+        '''
+        if object_id not in self._objects:
+            net_obj = self.objects.get(object_id)
+            self._objects[object_id] = address_intervals(net_obj.kind, net_obj.value) if net_obj else None
+        return self._objects[object_id]
+
+    def expand(self, group_id, _path=()):
+        '''
+        This method returns the address set of a group and every group nested in it.
+
+        Args:
+            group_id: The objectId of the group.
+
+        Returns:
+            A tuple of sorted, non-overlapping (first, last) integer address tuples.
+
+        '''
+        found = self._sets.get(group_id)
+        if found != None:
+            return found
+        if group_id in _path:
+            cycle = _path[_path.index(group_id):] + (group_id,)
+            raise ValueError('object-group {} contains itself: {}'.format(group_id, ' -> '.join(cycle)))
+
+        path = _path + (group_id,)
+        ranges = []
+        missing = []
+        for kind, member in self.groups[group_id].members:
+            if kind == 'objectRef#NetworkObjGroup':
+                if member not in self.groups:
+                    missing.append((kind, member))
+                    continue
+                ranges.extend(self.expand(member, path))
+                missing.extend(self.unresolved.get(member, ()))
+                continue
+            elif 'objectRef#' in kind:
+                member_ranges = self.object_ranges(member)
+            else:
+                member_ranges = address_intervals(kind, member)
+            if member_ranges == None:
+                missing.append((kind, member))
+            else:
+                ranges.extend(member_ranges)
+
+        merged = merge_intervals(ranges)
+        self._sets[group_id] = merged
+        if missing:
+            self.unresolved[group_id] = tuple(missing)
+        return merged
+
+    def expand_all(self):
+        '''
+        This method expands every group.
+
+        Returns:
+            A tuple of a dictionary of objectId to address set, and a list of the
+            objectIds of the groups that could not be expanded because they
+            contain themselves.
+
+        '''
+        cycles = []
+        for group_id in self.groups:
+            try:
+                self.expand(group_id)
+            except ValueError:
+                cycles.append(group_id)
+        return dict(self._sets), cycles
+
+    def complete(self, group_id):
+        '''
+        Returns:
+            True if every member of the group, and of the groups nested in it, was expanded.
+
+        '''
+        self.expand(group_id)
+        return group_id not in self.unresolved
+
+    def contains(self, group_id, address):
+        '''
+        Args:
+            group_id: The objectId of the group.
+            address: An address as an integer.
+
+        Returns:
+            True if the address is in the group's address set.
+
+        '''
+        ranges = self.expand(group_id)
+        found = bisect_right(ranges, (address, 0xFFFFFFFF)) - 1
+        return found >= 0 and ranges[found][1] >= address
+
+    def cidrs(self, group_id):
+        '''
+        Returns:
+            The group's address set as the fewest networks that cover it exactly.
+
+        '''
+        return [cidr for first, last in self.expand(group_id) for cidr in interval_to_cidrs(first, last)]
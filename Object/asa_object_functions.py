@@ -1,5 +1,8 @@
 import json
-from asa_routing_functions import route_used
+from asa_routing_functions import RoutingTable
+from asa_object_models import NetworkObject, ObjectGroup
+from asa_object_expand import GroupExpander
+from asa_acl_table import service_ranges
 
 
 def determine_obj_key(obj):
@@ -80,29 +83,295 @@ def get_object_ip(obj_inst, object):
     return net_obj_json['host']['value']
 
 
+def expander_zones(expander, obj_grp, routes):
+    '''
+    Args:
+        expander: A GroupExpander holding the object group.
+        obj_grp: The name of a configured object-group
+        routes: A list of routes from the sort_routes function, or a RoutingTable
+
+    Returns:
+        A list of every interface the group's addresses, including those of nested
+        groups, are reachable from, in the order of the addresses they route.
+
+    '''
+    if not isinstance(routes, RoutingTable):
+        routes = RoutingTable(routes)
+
+    zones = []
+    for route in routes.lookup_many(expander.cidrs(obj_grp)):
+        if route != None and route.zone not in zones:
+            zones.append(route.zone)
+    return zones
+
+
+def zones_intfc(obj_grp, zones):
+    '''
+    Returns:
+        The one interface in zones from expander_zones.
+
+    Raises:
+        ValueError: If there is no interface, or more than one.
+
+    '''
+    if not zones:
+        raise ValueError('object-group {} has no addresses that are routed'.format(obj_grp))
+    elif len(zones) > 1:
+        raise ValueError('object-group {} spans more than one interface: {}'.format(obj_grp, ', '.join(zones)))
+    return zones[0]
+
+
 def object_group_intfc(obj_inst, obj_grp, routes):
     '''
     This function takes a given ASAObject instance, object group ID,
     and routes from 'sort_routes' function and returns the interface
-    which the object group's objects are reachable from.
+    which the object group's objects are reachable from. The group, the
+    groups nested in it and the objects they reference are each read with
+    one GET, and every member is used, the same as ObjectIndex.group_intfc.
 
     Args:
         obj_inst: An ASAObject
         obj_grp: The name of a configured object-group
-        routes: A list of routes from the sort_routes function
+        routes: A list of routes from the sort_routes function, or a RoutingTable
 
     Returns:
         The name of the interface which would be used to forward traffic
         to the objects withing the object group.
 
+    Raises:
+        ValueError: If the group cannot be read, contains itself, has no
+        addresses that are routed, or has addresses routed to more than one interface.
+
     '''
-    grp = obj_inst.asa_get_network_object_group(obj_grp).text
-    grp_json = json.loads(grp)
+    objects = {}
+    groups = {}
+    pending = [obj_grp]
+    while pending:
+        group_id = pending.pop()
+        if group_id in groups:
+            continue
+        grp = obj_inst.asa_get_network_object_group(group_id)
+        if not grp.ok:
+            if group_id == obj_grp:
+                raise ValueError('object-group {} could not be read: STATUS_CODE {}'.format(
+                    obj_grp, grp.status_code))
+            continue
+        groups[group_id] = ObjectGroup.from_json(json.loads(grp.text))
+        for kind, member in groups[group_id].members:
+            if kind == 'objectRef#NetworkObjGroup':
+                pending.append(member)
+            elif 'objectRef#' in kind and member not in objects:
+                net_obj = obj_inst.asa_get_network_object(member)
+                if net_obj.ok:
+                    objects[member] = NetworkObject.from_json(json.loads(net_obj.text))
 
-    if 'objectRef#' in grp_json['members'][0]['kind']:
-        ex_obj = grp_json['members'][0]['objectId']
-        ex = get_object_ip(obj_inst, ex_obj)
-    else:
-        ex = grp_json['members'][0]['value']
+    return zones_intfc(obj_grp, expander_zones(GroupExpander(objects, groups), obj_grp, routes))
+
+
+class ObjectIndex:
+    '''
+    An in-memory index of an ASA's network objects and network object groups.
+    Both collections are downloaded with one listing each the first time the
+    index is used, so resolving an object group to an interface is a dictionary
+    lookup instead of one or two GETs per group. The interface of each group is
+    also remembered for the rest of the run. Service objects and groups are
+    downloaded the first time a service is resolved.
+
+    The index also expands object and group references of ACL entries into
+    address and service ranges, in the form used by ACLTable. Network groups
+    are expanded with a GroupExpander, so each group is flattened only once.
+
+    '''
+
+    def __init__(self, obj_inst):
+        '''
+        Args:
+            obj_inst: An ASAObject
+
+        Example:
+
+            >>>index = ObjectIndex(ASAObject(asa, header))
+            >>>index.group_intfc('grp-lab-neteng-networks', sorted_routes)
+            'lab'
+
+        '''
+        self.obj_inst = obj_inst
+        self.objects = None
+        self.groups = None
+        self.services = None
+        self.service_groups = None
+        self.expander = None
+        self._group_intfcs = {}
+
+    @classmethod
+    def from_items(cls, objects, groups, services=(), service_groups=()):
+        '''
+        This method builds an index from collections that have already been
+        downloaded, such as those of a snapshot, instead of from an ASAObject.
+
+        Args:
+            objects: The network objects as JSON.
+            groups: The network object groups as JSON.
+            services: The service objects as JSON.
+            service_groups: The service object groups as JSON.
+
+        Returns:
+            An ObjectIndex that makes no API calls.
+
+        '''
+        index = cls(None)
+        index.objects = {net_obj.object_id: net_obj for net_obj in map(NetworkObject.from_json, objects)}
+        index.groups = {grp.object_id: grp for grp in map(ObjectGroup.from_json, groups)}
+        index.expander = GroupExpander(index.objects, index.groups)
+        index._index_services(services, service_groups)
+        return index
+
+    def _index_services(self, services, service_groups):
+        self.services = {svc.get('objectId', svc['name']): (svc['kind'].split('#')[-1][:-len('Obj')], svc['value'])
+                         for svc in services}
+        self.service_groups = {grp.get('objectId', grp['name']): ObjectGroup.from_json(grp) for grp in service_groups}
+
+    def load(self):
+        '''
+        Downloads every network object and network object group into the index.
+
+        '''
+        self.objects = {net_obj.object_id: net_obj for net_obj in self.obj_inst.asa_iter_network_objects(records=True)}
+        self.groups = {grp.object_id: grp for grp in self.obj_inst.asa_iter_network_object_groups(records=True)}
+        self.expander = GroupExpander(self.objects, self.groups)
+
+    def load_services(self):
+        '''
+        Downloads every service object and service object group into the index.
+
+        '''
+        self._index_services(self.obj_inst.asa_iter_service_objects(),
+                             self.obj_inst.asa_iter_service_object_groups())
+
+    def address_ranges(self, kind, object_id):
+        '''
+        This method expands a network object or network object group, including
+        nested groups, to address ranges.
+
+        Args:
+            kind: The kind of the reference, such as 'objectRef#NetworkObjGroup'.
+            object_id: The objectId of the object or group.
+
+        Returns:
+            A list of (first, last) integer address tuples, or None if the object,
+            or anything in the group, cannot be resolved, or the group contains itself.
+
+        '''
+        if self.groups == None:
+            self.load()
+        if 'Group' not in kind:
+            return self.expander.object_ranges(object_id)
+
+        if object_id not in self.groups:
+            return None
+        try:
+            ranges = self.expander.expand(object_id)
+        except ValueError:
+            return None
+        return list(ranges) if object_id not in self.expander.unresolved else None
+
+    def service_ranges(self, kind, object_id, _seen=()):
+        '''
+        This method expands a service object or service object group, including
+        nested groups, to protocol and port ranges.
+
+        Args:
+            kind: The kind of the reference, such as 'objectRef#NetworkServiceGroup'.
+            object_id: The objectId of the object or group.
+
+        Returns:
+            A list of (protocol, first port, last port) tuples, or None if the
+            object, or anything in the group, cannot be resolved.
+
+        '''
+        if self.service_groups == None:
+            self.load_services()
+        if 'Group' not in kind:
+            svc = self.services.get(object_id)
+            return service_ranges(*svc) if svc else None
+
+        grp = self.service_groups.get(object_id)
+        if grp == None or object_id in _seen:
+            return None
+        ranges = []
+        for member_kind, member in grp.members:
+            if 'objectRef#' in member_kind:
+                member_ranges = self.service_ranges(member_kind, member, _seen + (object_id,))
+            else:
+                member_ranges = service_ranges(member_kind, member)
+            if member_ranges == None:
+                return None
+            ranges.extend(member_ranges)
+        return ranges
+
+    def object_ip(self, object):
+        '''
+        Args:
+            object: The name of a configured object
+
+        Returns:
+            The IP value associated with the object.
+
+        '''
+        if self.objects == None:
+            self.load()
+        if object not in self.objects:
+            return get_object_ip(self.obj_inst, object)
+
+        return self.objects[object].value
+
+    def group_zones(self, obj_grp, routes):
+        '''
+        This method returns every interface the object group's addresses are
+        reachable from, using the group's full address set, including nested
+        groups, rather than only its first member.
+
+        Args:
+            obj_grp: The name of a configured object-group
+            routes: A list of routes from the sort_routes function, or a RoutingTable
+
+        Returns:
+            A list of the interface names, in the order of the addresses they route.
+
+        '''
+        if self.groups == None:
+            self.load()
+        return expander_zones(self.expander, obj_grp, routes)
+
+    def group_intfc(self, obj_grp, routes):
+        '''
+        This method returns the interface which the object group's objects are
+        reachable from, the same as object_group_intfc, using the index and the
+        group's full address set from group_zones. A group that is not in the
+        index, such as one created after it was loaded, is looked up on the ASA.
+
+        Args:
+            obj_grp: The name of a configured object-group
+            routes: A list of routes from the sort_routes function, or a RoutingTable
+
+        Returns:
+            The name of the interface which would be used to forward traffic
+            to the objects withing the object group.
+
+        Raises:
+            ValueError: If the group contains itself, has no addresses that are
+            routed, or has addresses routed to more than one interface.
+
+        '''
+        if obj_grp in self._group_intfcs:
+            return self._group_intfcs[obj_grp]
+
+        if self.groups == None:
+            self.load()
+        if obj_grp not in self.groups:
+            intfc = object_group_intfc(self.obj_inst, obj_grp, routes)
+        else:
+            intfc = zones_intfc(obj_grp, self.group_zones(obj_grp, routes))
 
-    return route_used(routes, ex).zone
+        self._group_intfcs[obj_grp] = intfc
+        return intfc
@@ -0,0 +1,67 @@
+from asa_models import Record
+
+
+class NetworkObject(Record):
+    '''
+    A network object: its name, and the kind and value of the host, range or network it represents.
+
+    '''
+    __slots__ = ('name', 'object_id', 'kind', 'value', 'description')
+
+    def __init__(self, name, object_id, kind, value, description=None):
+        self.name = name
+        self.object_id = object_id
+        self.kind = kind
+        self.value = value
+        self.description = description
+
+    @classmethod
+    def from_json(cls, net_obj):
+        '''
+        Args:
+            net_obj: A json formatted network object from an ASA API call.
+
+        Returns:
+            A NetworkObject.
+
+        '''
+        return cls(
+            net_obj['name'],
+            net_obj.get('objectId', net_obj['name']),
+            net_obj['host']['kind'],
+            net_obj['host']['value'],
+            net_obj.get('description')
+        )
+
+
+class ObjectGroup(Record):
+    '''
+    A network object group. Each member is a (kind, reference) tuple, where the
+    reference is the objectId of an object or group, or the value of a literal.
+
+    '''
+    __slots__ = ('name', 'object_id', 'description', 'members')
+
+    def __init__(self, name, object_id, description, members):
+        self.name = name
+        self.object_id = object_id
+        self.description = description
+        self.members = members
+
+    @classmethod
+    def from_json(cls, grp):
+        '''
+        Args:
+            grp: A json formatted network object group from an ASA API call.
+
+        Returns:
+            An ObjectGroup.
+
+        '''
+        return cls(
+            grp['name'],
+            grp.get('objectId', grp['name']),
+            grp.get('description'),
+            tuple((member['kind'], member['objectId'] if 'objectRef#' in member['kind'] else member['value'])
+                  for member in grp.get('members', ()))
+        )
@@ -0,0 +1,312 @@
+from collections import namedtuple
+from functools import partial
+import numpy as np
+from asa_acl_table import address_intervals
+from asa_acl_functions import sort_access_groups
+from asa_routing_functions import ip_to_int
+
+
+Reference = namedtuple('Reference', 'kind interface object_id position field')
+
+ADDRESS_FIELDS = ('sourceAddress', 'destinationAddress')
+
+ROUTE_FIELDS = ('network', 'gateway')
+
+
+def element_refs(item, fields=None):
+    '''
+    Args:
+        item: An ACL policy entry or a static route as JSON.
+        fields: The fields to read, or None for every field.
+
+    Returns:
+        A generator of (field, kind, objectId) tuples of the object and group references in the item.
+
+    '''
+    for field, element in item.items():
+        if fields != None and field not in fields:
+            continue
+        if isinstance(element, dict) and 'objectRef#' in element.get('kind', ''):
+            yield field, element['kind'], element['objectId']
+
+
+class IntervalIndex:
+    '''
+    A stabbing index of address ranges: given an address, it returns every item
+    with a range that contains it. The ranges are kept in NumPy columns sorted
+    by their first address, so a lookup is a binary search for the ranges that
+    start at or below the address and one array comparison over those, and
+    takes milliseconds over hundreds of thousands of ranges.
+
+    '''
+
+    def __init__(self, intervals):
+        '''
+        Args:
+            intervals: An iterable of (first, last, item) tuples, with integer addresses.
+
+        '''
+        firsts, lasts, items = [], [], []
+        for first, last, item in intervals:
+            firsts.append(first)
+            lasts.append(last)
+            items.append(item)
+
+        order = np.argsort(np.array(firsts, dtype=np.uint32), kind='stable')
+        self.first = np.array(firsts, dtype=np.uint32)[order]
+        self.last = np.array(lasts, dtype=np.uint32)[order]
+        self.items = [items[i] for i in order.tolist()]
+
+    def __len__(self):
+        return len(self.items)
+
+    def stab(self, address):
+        '''
+        Args:
+            address: An IPv4 address as a string or integer.
+
+        Returns:
+            A list of the items with a range that contains the address, once per range.
+
+        '''
+        address = ip_to_int(address) if isinstance(address, str) else address
+        count = int(np.searchsorted(self.first, address, side='right'))
+        return [self.items[i] for i in np.flatnonzero(self.last[:count] >= address).tolist()]
+
+
+class ReferenceIndex:
+    '''
+    A reverse index of where each object and object group is used. Every ACL
+    rule of every access-group, every object group and every static route is
+    read once, and each object or group reference found is recorded against the
+    referenced objectId as a Reference: the kind of the item holding it ('rule',
+    'group' or 'route'), the interface of a rule or route, the objectId of the
+    item, the position of a rule, and the field or 'members' holding it.
+
+    The index also answers which objects, groups and rules cover an address.
+    The address sets of every network object and group, from the GroupExpander
+    of the ObjectIndex, and the literal sources and destinations of the rules,
+    are loaded into an IntervalIndex the first time an address is looked up.
+    Rules that reference an object or group are found through the references
+    of the objects and groups that cover the address.
+
+    References are also counted to find the network objects and groups that
+    nothing uses, including those only used by groups that are themselves
+    unused. Only inbound ACLs, object groups and static routes are read, so an
+    object used elsewhere, such as by NAT, is listed as unused; the ASA refuses
+    to delete it.
+
+    '''
+
+    def __init__(self, index):
+        '''
+        Args:
+            index: An ObjectIndex.
+
+        Example:
+
+            >>>references = ReferenceIndex.build(ObjectIndex(asa_obj), asa_acl.asa_iter_acls_in(records=True),
+            ...                                  asa_acl.asa_iter_acl_access_in)
+            >>>references.referenced_by('grp-lab-neteng-networks')
+            [Reference(kind='rule', interface='lab', object_id='3535378664', position=3, field='sourceAddress'),
+            Reference(kind='group', interface=None, object_id='grp-lab-all', position=None, field='members')]
+
+        '''
+        self.index = index
+        self.references = {}
+        self.literals = []
+        self._addresses = None
+
+    @classmethod
+    def build(cls, index, access_groups, acl_rules, routes=()):
+        '''
+        This method builds the index in one pass over the configuration.
+
+        Args:
+            index: An ObjectIndex; its network and service groups are read.
+            access_groups: An iterable of AccessGroups.
+            acl_rules: A function of an interface name returning its ACL policy entries as JSON.
+            routes: An iterable of static routes as JSON.
+
+        Returns:
+            A ReferenceIndex.
+
+        '''
+        references = cls(index)
+        for group in access_groups:
+            if group.direction.upper() == 'IN':
+                for entry in acl_rules(group.interface):
+                    references.add_rule(group.interface, entry)
+
+        if index.groups == None:
+            index.load()
+        if index.service_groups == None:
+            index.load_services()
+        for grp in list(index.groups.values()) + list(index.service_groups.values()):
+            references.add_group(grp)
+
+        for route in routes:
+            references.add_route(route)
+        return references
+
+    @classmethod
+    def from_snapshot(cls, store, snapshot):
+        '''
+        Returns:
+            A ReferenceIndex of a snapshot in an ASASnapshotStore, built without the ASA.
+
+        '''
+        return cls.build(store.object_index(snapshot), map(sort_access_groups, store.items(snapshot, 'access_groups')),
+                         partial(store.items, snapshot, 'acl_rules'),
+                         store.items(snapshot, 'routes'))
+
+    def _add(self, object_id, reference):
+        self.references.setdefault(object_id, []).append(reference)
+
+    def add_rule(self, intfc, entry):
+        '''
+        Records the references of an ACL policy entry of the interface.
+
+        '''
+        position = entry.get('position')
+        for field, kind, object_id in element_refs(entry):
+            self._add(object_id, Reference('rule', intfc, entry.get('objectId'), position, field))
+
+        for field in ADDRESS_FIELDS:
+            element = entry.get(field)
+            ranges = address_intervals(element['kind'], element.get('value')) if element else None
+            for first, last in ranges or ():
+                self.literals.append((first, last, Reference('rule', intfc, entry.get('objectId'), position, field)))
+        self._addresses = None
+
+    def add_group(self, grp):
+        '''
+        Records the references of the members of a network or service ObjectGroup.
+
+        '''
+        for kind, member in grp.members:
+            if 'objectRef#' in kind:
+                self._add(member, Reference('group', None, grp.object_id, None, 'members'))
+
+    def add_route(self, route):
+        '''
+        Records the references of a static route as JSON.
+
+        '''
+        intfc = route.get('interface', {}).get('name')
+        for field, kind, object_id in element_refs(route, ROUTE_FIELDS):
+            self._add(object_id, Reference('route', intfc, route.get('objectId'), None, field))
+
+    def referenced_by(self, object_id):
+        '''
+        Returns:
+            A list of the References to the object or group, empty if it is not used.
+
+        '''
+        return list(self.references.get(object_id, ()))
+
+    def used_by(self, object_id):
+        '''
+        This method follows the references through the groups that contain the
+        object or group, so a rule that references a parent group is included.
+
+        Returns:
+            A list of (objectId, Reference) tuples of the References to the object
+            or group, and to every group it is nested in, with the objectId each
+            Reference points to.
+
+        '''
+        found = []
+        seen = {object_id}
+        pending = [object_id]
+        while pending:
+            target = pending.pop(0)
+            for reference in self.references.get(target, ()):
+                found.append((target, reference))
+                if reference.kind == 'group' and reference.object_id not in seen:
+                    seen.add(reference.object_id)
+                    pending.append(reference.object_id)
+        return found
+
+    def unused(self):
+        '''
+        This method counts the references to every network object and group,
+        and removes the groups with none, taking one from the count of each of
+        their members, until every remaining count is above zero. Groups that
+        only contain each other are never removed.
+
+        Returns:
+            A list of layers, each a list of the (kind, objectId) of unused objects and
+            groups. Nothing in a layer is referenced by anything in the same or a
+            later layer, so deleting the layers in order never deletes an object in use.
+
+        '''
+        index = self.index
+        if index.groups == None:
+            index.load()
+        counts = {object_id: len(self.references.get(object_id, ())) for object_id in index.objects}
+        counts.update((group_id, len(self.references.get(group_id, ()))) for group_id in index.groups)
+
+        layers = []
+        layer = [object_id for object_id, count in counts.items() if count == 0]
+        while layer:
+            layers.append([('objectRef#NetworkObjGroup' if object_id in index.groups else 'objectRef#NetworkObj',
+                            object_id) for object_id in layer])
+            released = []
+            for group_id in layer:
+                for kind, member in index.groups[group_id].members if group_id in index.groups else ():
+                    if 'objectRef#' in kind and member in counts:
+                        counts[member] -= 1
+                        if counts[member] == 0:
+                            released.append(member)
+            layer = released
+        return layers
+
+    def addresses(self):
+        '''
+        Returns:
+            The IntervalIndex of the objects, groups and literal rule addresses,
+            with ('objectRef#NetworkObj', objectId) and ('objectRef#NetworkObjGroup',
+            objectId) items for objects and groups, and References for rules.
+
+        '''
+        if self._addresses == None:
+            index = self.index
+            if index.groups == None:
+                index.load()
+            expander = index.expander
+            intervals = list(self.literals)
+            for object_id in index.objects:
+                for first, last in expander.object_ranges(object_id) or ():
+                    intervals.append((first, last, ('objectRef#NetworkObj', object_id)))
+
+            for group_id, ranges in expander.expand_all()[0].items():
+                for first, last in ranges:
+                    intervals.append((first, last, ('objectRef#NetworkObjGroup', group_id)))
+            self._addresses = IntervalIndex(intervals)
+        return self._addresses
+
+    def covering(self, address):
+        '''
+        This method finds what covers an address. A group covers the address
+        when one of its members, or of the groups nested in it, does.
+
+        Args:
+            address: An IPv4 address as a string or integer.
+
+        Returns:
+            A tuple of a sorted list of the (kind, objectId) of the objects and groups
+            that cover the address, and a list of the References of the rules whose
+            source or destination covers it, in interface and position order.
+
+        '''
+        objects = []
+        rules = set()
+        for item in self.addresses().stab(address):
+            if isinstance(item, Reference):
+                rules.add(item)
+            else:
+                objects.append(item)
+                rules.update(reference for reference in self.references.get(item[1], ())
+                             if reference.kind == 'rule' and reference.field in ADDRESS_FIELDS)
+        return sorted(set(objects)), sorted(rules, key=lambda rule: (rule.interface, rule.position or 0, rule.field))
@@ -0,0 +1,144 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from asa_aaa_class import ASAAAA
+from asa_mirror import MirrorSession
+from asa_acl_class import ASAACL
+from asa_object_class import ASAObject
+from asa_routing_class import ASARouting
+from asa_object_functions import ObjectIndex
+from asa_object_references import ReferenceIndex
+from asa_snapshot_functions import ASASnapshotStore
+
+
+def main():
+    '''
+    The purpose of this program is to find the network objects and object groups
+    that nothing uses, and optionally to delete them. Every ACL rule, object
+    group and static route is collected from the ASA, or from the newest snapshot
+    of the ASA, once, and the references to each object are counted with a
+    ReferenceIndex, so objects only used by unused groups are found as well.
+    With --delete the objects are deleted from the ASA with delete_unused.
+
+    Print:
+        Each unused object and group, grouped in the order they can be deleted,
+        and the result of each deletion.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_remove_unused_objects.py --delete
+        What ASA do you want to clean up? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        Unused, layer 1:
+            objectRef#NetworkObjGroup grp-old-servers
+            objectRef#NetworkObj lab-host-10.1.1.99_32
+        Unused, layer 2:
+            objectRef#NetworkObj lab-host-10.1.1.98_32
+
+        3 unused objects and groups
+
+        DELETE grp-old-servers STATUS_CODE: 204 OK
+        DELETE lab-host-10.1.1.99_32 STATUS_CODE: 204 OK
+        DELETE lab-host-10.1.1.98_32 STATUS_CODE: 204 OK
+
+    '''
+    parser = argparse.ArgumentParser(description='Find, and optionally delete, unused network objects and groups.')
+    parser.add_argument('--delete', action='store_true', help='Delete the unused objects and groups from the ASA.')
+    parser.add_argument('-b', '--batch-size', type=int, default=50, help='The number of deletions per batch.')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='The number of deletions sent at the same time.')
+    parser.add_argument('-d', '--database', help='Use the newest snapshot in this database instead of the ASA.')
+    options = parser.parse_args()
+    if options.delete and options.database:
+        parser.error('--delete needs the current configuration of the ASA, not a snapshot')
+
+    asa = input('What ASA do you want to clean up? ')
+    if options.database:
+        store = ASASnapshotStore(options.database)
+        references = ReferenceIndex.from_snapshot(store, store.latest(asa))
+    else:
+        login_cred = ASAAAA(asa)
+        header = login_cred.asa_login()
+        session = MirrorSession(login_cred.session)
+        acl = ASAACL(asa, header, session=session)
+        obj = ASAObject(asa, header, session=session)
+        routes = ASARouting(asa, header, session=session)
+        references = ReferenceIndex.build(ObjectIndex(obj), acl.asa_iter_acls_in(records=True),
+                                          acl.asa_iter_acl_access_in, routes.asa_iter_all_static_routes())
+
+    layers = references.unused()
+    for number, layer in enumerate(layers, start=1):
+        print('\nUnused, layer {}:'.format(number))
+        for kind, object_id in layer:
+            print('    {} {}'.format(kind, object_id))
+    print('\n{} unused objects and groups'.format(sum(map(len, layers))))
+
+    if options.delete:
+        delete_unused(obj, references, layers, options.batch_size, options.workers)
+
+
+def delete_object(obj, kind, object_id):
+    '''
+    Returns:
+        The response of deleting a network object or network object group.
+
+    '''
+    if kind == 'objectRef#NetworkObjGroup':
+        return obj.asa_delete_network_object_group(object_id)
+    return obj.asa_delete_network_object(object_id)
+
+
+def delete_unused(obj, references, layers, batch_size=50, workers=4):
+    '''
+    This function deletes the unused objects and groups layer by layer, so a
+    group is always deleted before the objects it contains. Each layer is sent
+    in batches of batch_size deletions, and the deletions of a batch are sent
+    workers at a time; nothing in a layer references anything else in it. When
+    the ASA refuses to delete a group, such as one used by NAT, the objects of
+    later layers that it contains are kept and not sent.
+
+    Args:
+        obj: An ASAObject instance.
+        references: The ReferenceIndex the layers came from.
+        layers: The layers of (kind, objectId) tuples from ReferenceIndex.unused.
+        batch_size: The number of deletions per batch.
+        workers: The number of deletions sent at the same time.
+
+    Returns:
+        A set of the objectIds that were not deleted.
+
+    Print:
+        The result of each deletion: A 204 means the object was deleted, other
+        codes indicate an issue with the request. Failures do print the code,
+        reason, and content of the response.
+
+    '''
+    kept = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for layer in layers:
+            pending = []
+            for kind, object_id in layer:
+                if any(reference.kind == 'group' and reference.object_id in kept
+                       for reference in references.referenced_by(object_id)):
+                    kept.add(object_id)
+                    print('\nSKIPPED {}: it is in a group that was not deleted'.format(object_id))
+                else:
+                    pending.append((kind, object_id))
+
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                results = executor.map(lambda item: delete_object(obj, *item), batch)
+                for (kind, object_id), response in zip(batch, results):
+                    if response.ok:
+                        print('\nDELETE {} STATUS_CODE: {} OK'.format(object_id, response.status_code))
+                    else:
+                        kept.add(object_id)
+                        print('\nDELETE {} FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}'.format(
+                            object_id, response.status_code, response.reason, response.content))
+    return kept
+
+
+if __name__ == '__main__':
+    main()
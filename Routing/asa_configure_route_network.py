@@ -37,8 +37,8 @@ def main():
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    config = config_variables(asa, header)
-    route = ASARouting(asa, header=header)
+    config = config_variables(asa, header, login_cred.session)
+    route = ASARouting(asa, header=header, session=login_cred.session)
     config_route = route.asa_add_static_route(config['network'], config['gateway'], config['zone'])
 
     if config_route.ok:
@@ -48,7 +48,7 @@ def main():
             config_route.status_code, config_route.reason, config_route.content))
 
 
-def config_variables(asa, header):
+def config_variables(asa, header, session=None):
     '''
     This function is used to collect the configuration details for the
     route being added, and returns them as a dictionary.
@@ -56,6 +56,7 @@ def config_variables(asa, header):
     Args:
         asa: The IP or hostname to be used to reach the desired ASA.
         header: The header to use for providing the authentication token.
+        session: The ASASession used to send the API call.
 
     Returns:
         A dictionary of route configuration details.
@@ -65,7 +66,7 @@ def config_variables(asa, header):
         "network": input('What Network would you like to route? EX 192.168.1.0/24: '),
         "gateway": input('What is the gateway used to reach this network? '),
         "zone": input('What interface name is used to reach this network?\n{} '.format(
-            used_intfcs_name(asa, header)))
+            used_intfcs_name(asa, header, session)))
     }
 
 
@@ -1,7 +1,7 @@
-import json
+from requests import HTTPError
 from asa_aaa_class import ASAAAA
 from asa_routing_class import ASARouting
-from asa_routing_functions import sort_routes
+from asa_routing_functions import iter_routes
 
 
 def main():
@@ -41,30 +41,27 @@ def main():
     login_cred = ASAAAA(asa)
     header = login_cred.asa_login()
 
-    routes = ASARouting(asa, header)
-    configured_routes = routes.asa_get_all_static_routes()
-
-    if configured_routes.ok:
-        configured_routes_json = json.loads(configured_routes.text)
-        print_routes(configured_routes_json['items'])
-    else:
+    routes = ASARouting(asa, header, session=login_cred.session)
+    try:
+        print_routes(routes.asa_stream_all_static_routes())
+    except HTTPError as error:
         print("GET STATIC ROUTES FAILED!!! STATUS_CODE: {}\nReason: {}\nContent: {}".format(
-            configured_routes.status_code, configured_routes.reason, configured_routes.content))
+            error.response.status_code, error.response.reason, error.response.content))
 
 def print_routes(routes):
     '''
-    This function uses the sort_route function to sort the
-    relevant data, and then print out each route.
+    This function uses the iter_routes function to sort the
+    relevant data, and then print out each route as it is read.
 
     Args:
-        routes: a list of configured static routes
+        routes: an iterable of configured static routes
 
     Print:
         The routed network, gateway to reach the network, interface to
         reach this network, and what zone this network is in.
 
     '''
-    for route in sort_routes(routes):
+    for route in iter_routes(routes):
         print('Network {} is reachable via {} over interface {} in zone {}'.format(
             route.network, route.gateway, route.intfc, route.zone))
 
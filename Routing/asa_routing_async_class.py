@@ -0,0 +1,62 @@
+from asa_aaa_class import ASAAAA
+from asa_routing_class import static_route_config
+from asa_async_session import AsyncASASession
+
+
+class AsyncASARouting:
+    '''Asyncio counterpart of ASARouting.
+
+    The methods have the same names, arguments and return shapes as ASARouting,
+    but are coroutines sent through an AsyncASASession.
+
+    '''
+
+    def __init__(self, asa, header=None, base_url=None, session=None):
+        '''
+        Args:
+            asa: The IP or hostname to be used to reach the desired ASA.
+            header: The header to use for providing the authentication token.
+            base_url: The base URL used by all API calls in the module.
+            session: The AsyncASASession used to send every API call.
+
+        Example:
+
+            >>>asa_routes = AsyncASARouting(asa, header, session=session)
+
+        '''
+        self.asa = asa
+
+        if header == None:
+            self.header = ASAAAA(asa).asa_login()
+        else:
+            self.header = header
+
+        if base_url == None:
+            self.base_url = "https://{}/api/routing/".format(asa)
+        else:
+            self.base_url = base_url
+
+        if session == None:
+            self.session = AsyncASASession()
+        else:
+            self.session = session
+
+    async def asa_get_all_static_routes(self):
+        '''
+        Returns:
+            The static routes configured on the ASA; see ASARouting.asa_get_all_static_routes.
+
+        '''
+        url = self.base_url + 'static'
+        return await self.session.get(url, verify=False, headers=self.header)
+
+    async def asa_add_static_route(self, network, gateway, zone):
+        '''
+        Returns:
+            The result of POSTing the new route; see ASARouting.asa_add_static_route.
+
+        '''
+        url = self.base_url + 'static'
+        route_config = static_route_config(network, gateway, zone)
+
+        return await self.session.post(url, verify=False, headers=self.header, json=route_config)
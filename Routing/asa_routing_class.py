@@ -1,6 +1,42 @@
 import json
-import requests
 from asa_aaa_class import ASAAAA
+from asa_session import ASASession
+from asa_paging import asa_iter_items
+from asa_stream import asa_stream_items
+from asa_routing_models import Route
+
+
+def static_route_config(network, gateway, zone):
+    '''
+    This function builds the body used to configure a new static route.
+
+    Args:
+        network: The network which needs to be added to the routing table.
+        gateway: The gateway through which this network can be reached.
+        zone: The zone on the firewall this interface belongs to.
+
+    Returns:
+        A dictionary of the static route configuration.
+
+    '''
+    return {
+        "tunneled": "false",
+        "kind": "object#IPv4Route",
+        "distanceMetric": 1,
+        "tracked": "false",
+        "interface": {
+            "kind": "objectRef#Interface",
+            "name": zone
+        },
+        "gateway": {
+            "kind": "IPv4Address",
+            "value": gateway
+        },
+        "network": {
+            "kind": "IPv4Network",
+            "value": network
+        }
+    }
 
 
 class ASARouting:
@@ -13,18 +49,21 @@ class ASARouting:
 
     '''
 
-    def __init__(self, asa, header=None, base_url=None):
+    def __init__(self, asa, header=None, base_url=None, session=None):
         '''
         The __init__ method requires an ASA name or IP that can be used to make API calls.
         It is expected that the ASAAAA class will be used to obtain a header containing a
         valid authentication token; however, a user will be prompted to initialize ASAAAA and
         obtain the necessary token if none is provided. The default base URL is based on Cisco's
         API documentation; all methods will build off the base URL for making an API call.
+        The session should be the ASASession kept by ASAAAA at login, so that all classes
+        share one pool of keep-alive connections to the ASA.
 
         Args:
             asa: The IP or hostname to be used to reach the desired ASA.
             header: The header to use for providing the authentication token.
             base_url: The base URL used by all API calls in the module.
+            session: The ASASession used to send every API call.
 
         Example:
 
@@ -37,7 +76,7 @@ class ASARouting:
 
             LOGIN STATUS_CODE: 204 OK
 
-            >>>asa_acl = ASAARouting(asa, header)
+            >>>asa_acl = ASAARouting(asa, header, session=asa_login.session)
 
         '''
         self.asa = asa
@@ -52,6 +91,11 @@ class ASARouting:
         else:
             self.base_url = base_url
 
+        if session == None:
+            self.session = ASASession()
+        else:
+            self.session = session
+
     def asa_get_all_static_routes(self):
         '''
         This method returns a GET request for obtaining static route
@@ -96,7 +140,52 @@ class ASARouting:
 
         '''
         url = self.base_url + 'static'
-        return requests.get(url, verify=False, headers=self.header)
+        return self.session.get(url, verify=False, headers=self.header)
+
+    def asa_iter_all_static_routes(self, limit=100, workers=4, records=False):
+        '''
+        This method is the paged form of asa_get_all_static_routes. It follows
+        every page of the collection, fetching the pages after the first one at the
+        same time, so the whole collection is returned however large it is.
+
+        Args:
+            limit: The number of items requested per page.
+            workers: The number of pages fetched at the same time.
+            records: True to return Route records instead of the JSON items.
+
+        Returns:
+            A generator of static routes, yielded as each page arrives.
+
+        Example:
+
+            >>>routes = list(asa_routes.asa_iter_all_static_routes())
+
+        '''
+        url = self.base_url + 'static'
+        items = asa_iter_items(self.session, url, self.header, limit, workers)
+        return map(Route.from_json, items) if records else items
+
+    def asa_stream_all_static_routes(self, limit=100, records=False):
+        '''
+        This method is the constant memory form of asa_iter_all_static_routes. The pages
+        are requested one after another and each item is decoded from the socket as
+        it arrives, so a very large collection is never held in memory at once.
+
+        Args:
+            limit: The number of items requested per page.
+            records: True to return Route records instead of the JSON items.
+
+        Returns:
+            A generator of static routes, yielded in the order the ASA lists them.
+
+        Example:
+
+            >>>print_routes(asa_routes.asa_stream_all_static_routes())
+
+        '''
+        url = self.base_url + 'static'
+        items = asa_stream_items(self.session, url, self.header, limit)
+        return map(Route.from_json, items) if records else items
 
     def asa_add_static_route(self, network, gateway, zone):
         '''
@@ -120,23 +209,6 @@ class ASARouting:
 
         '''
         url = self.base_url + 'static'
-        route_config = {
-            "tunneled": "false",
-            "kind": "object#IPv4Route",
-            "distanceMetric": 1,
-            "tracked": "false",
-            "interface": {
-                "kind": "objectRef#Interface",
-                "name": zone
-            },
-            "gateway": {
-                "kind": "IPv4Address",
-                "value": gateway
-            },
-            "network": {
-                "kind": "IPv4Network",
-                "value": network
-            }
-        }
+        route_config = static_route_config(network, gateway, zone)
 
-        return requests.post(url, verify=False, headers=self.header, json=route_config)
+        return self.session.post(url, verify=False, headers=self.header, json=route_config)
@@ -1,62 +1,206 @@
-import re
-from netaddr import IPNetwork
-from collections import namedtuple
+import socket
+import struct
+from asa_routing_models import Route
+
+
+def iter_routes(routes):
+    '''
+    This function takes the json formatted route data, and yields a
+    Route record for Network to route, Gateway to reach the network,
+    Interface to use, and zone this network is in. Routes are converted
+    one at a time, so a stream of routes is never held in memory.
+
+    Args:
+        routes: An iterable of json formatted routes from an ASA API call.
+
+    Returns:
+         An iterator of Route records with only relevant fields extracted.
+
+    '''
+    return map(Route.from_json, routes)
+
 
 def sort_routes(routes):
     '''
     This function takes the json formatted route data, and returns a
-    list of named tuples for Network to route, Gateway to reach the
+    list of Route records for Network to route, Gateway to reach the
     network, Interface to use, and zone this network is in.
 
     Args:
         routes: A list of json formatted routes from an ASA API call.
 
     Returns:
-         A list of named tuples with only relevant fields extracted.
+         A list of Route records with only relevant fields extracted.
+
+    '''
+    return list(iter_routes(routes))
+
+
+def ip_to_int(address):
+    '''
+    This function converts a dotted IPv4 address to an integer.
+
+    Args:
+        address: An IPv4 address such as '192.168.1.5'.
+
+    Returns:
+        The address as an integer.
+
+    '''
+    return struct.unpack('!I', socket.inet_aton(address))[0]
+
+
+def int_to_ip(address):
+    '''
+    This function converts an integer to a dotted IPv4 address.
+
+    Args:
+        address: An IPv4 address as an integer.
+
+    Returns:
+        The address such as '192.168.1.5'.
 
     '''
-    static_routes = []
-    for route in routes:
-        hw_id = re.match('(?P<type>.*[0-9]).*(?P<int>[0-9]+)', route['interface']['objectId'])
-        net_route = namedtuple('net_route', 'network gateway intfc zone')
-        static_route = net_route(
-            route['network']['value'],
-            route['gateway']['value'],
-            hw_id.group('type') + '/' + hw_id.group('int'),
-            route['interface']['name']
-        )
-        static_routes.append(static_route)
-    return static_routes
+    return socket.inet_ntoa(struct.pack('!I', address))
+
+
+def parse_network(net):
+    '''
+    This function converts a network as used by the ASA API to an integer
+    network and prefix length. 'any4' is 0.0.0.0/0, a bare address is a /32,
+    and the mask may be given as a prefix length or a dotted netmask.
+
+    Args:
+        net: A network such as '192.168.1.0/24', '192.168.1.5' or 'any4'.
+
+    Returns:
+        A tuple of the network as an integer and its prefix length.
+
+    '''
+    if net == 'any4':
+        return 0, 0
+
+    address, _, mask = net.partition('/')
+    if not mask:
+        prefixlen = 32
+    elif '.' in mask:
+        prefixlen = bin(ip_to_int(mask)).count('1')
+    else:
+        prefixlen = int(mask)
+
+    network = ip_to_int(address) & (0xFFFFFFFF << (32 - prefixlen) & 0xFFFFFFFF)
+    return network, prefixlen
+
+
+class RoutingTable:
+    '''
+    A compiled routing table for longest prefix match lookups. The routes from
+    sort_routes are parsed once into a binary trie over the network bits, so a
+    lookup walks at most one node per prefix bit instead of re-parsing and
+    comparing every route. The management interface is removed from
+    consideration, and 'any4' is the default route.
+
+    '''
+
+    def __init__(self, routes):
+        '''
+        Args:
+            routes: A list of routes from an ASA formatted from sort_routes.
+
+        Example:
+
+            >>>table = RoutingTable(sort_routes(routes_json['items']))
+            >>>table.lookup('192.168.6.98/32').zone
+            'lab'
+
+        '''
+        self.root = [None, None, None]
+        for route in routes:
+            if 'Management' in route.intfc:
+                continue
+            self.insert(route)
+
+    def insert(self, route):
+        '''
+        Adds a route to the trie. If two routes share a network the first one is kept.
+
+        Args:
+            route: A route from sort_routes.
+
+        '''
+        network, prefixlen = parse_network(route.network)
+        node = self.root
+        for bit in range(prefixlen):
+            branch = (network >> (31 - bit)) & 1
+            if node[branch] == None:
+                node[branch] = [None, None, None]
+            node = node[branch]
+        if node[2] == None:
+            node[2] = route
+
+    def lookup(self, net):
+        '''
+        Args:
+            net: An address or network that needs to be routed on an ASA.
+
+        Returns:
+            The most specific route containing the whole of net, or None if no
+            route does.
+
+        '''
+        network, prefixlen = parse_network(net)
+        node = self.root
+        best = node[2]
+        for bit in range(prefixlen):
+            node = node[(network >> (31 - bit)) & 1]
+            if node == None:
+                break
+            if node[2] != None:
+                best = node[2]
+
+        return best
+
+    def lookup_many(self, nets):
+        '''
+        This method looks up a batch of addresses or networks, such as every
+        object being named or every CSV row being resolved to a zone. Repeated
+        values are only looked up once.
+
+        Args:
+            nets: An iterable of addresses or networks.
+
+        Returns:
+            A list of routes, or None where no route matches, in the order of nets.
+
+        '''
+        found = {}
+        results = []
+        for net in nets:
+            if net not in found:
+                found[net] = self.lookup(net)
+            results.append(found[net])
+
+        return results
 
 
 def route_used(routes, net):
     '''
     This function takes a list of routes from sort_routes, and
     returns the specific route an ASA should use for a given network.
-    The management interface is removed from consideration.
+    The management interface is removed from consideration. Callers
+    resolving many networks should build a RoutingTable once and pass
+    it in place of the list.
 
     Args:
-        routes: A list of routes from an ASA formatted from sort_routes.
+        routes: A list of routes from an ASA formatted from sort_routes,
+        or a RoutingTable built from them.
         network: A network that needs to be routed on an ASA.
 
     Returns:
-        The routing information for the given network.
-
-    '''
-    possible_routes = []
-    for route in routes:
-        if 'Management' in route.intfc:
-            pass
-        elif route.network == 'any4':
-            value = '0.0.0.0/0'
-        else:
-            value = route.network
-        if IPNetwork(net) not in IPNetwork(value):
-            pass
-        elif len(possible_routes) == 0 or possible_routes[-1].network == 'any4':
-            possible_routes.append(route)
-        else:
-            if IPNetwork(possible_routes[-1]) < IPNetwork(value):
-                possible_routes.append(route)
-
-    return possible_routes[-1]
+        The routing information for the given network, or None if no route matches it.
+
+    '''
+    if not isinstance(routes, RoutingTable):
+        routes = RoutingTable(routes)
+
+    return routes.lookup(net)
@@ -0,0 +1,38 @@
+import re
+from asa_models import Record
+
+
+HW_ID = re.compile('(?P<type>.*[0-9]).*(?P<int>[0-9]+)')
+
+
+class Route(Record):
+    '''
+    A static route: the network routed, the gateway to reach the network, the
+    interface to use, and the zone (interface name) the network is in.
+
+    '''
+    __slots__ = ('network', 'gateway', 'intfc', 'zone')
+
+    def __init__(self, network, gateway, intfc, zone):
+        self.network = network
+        self.gateway = gateway
+        self.intfc = intfc
+        self.zone = zone
+
+    @classmethod
+    def from_json(cls, route):
+        '''
+        Args:
+            route: A json formatted route from an ASA API call.
+
+        Returns:
+            A Route.
+
+        '''
+        hw_id = HW_ID.match(route['interface']['objectId'])
+        return cls(
+            route['network']['value'],
+            route['gateway']['value'],
+            hw_id.group('type') + '/' + hw_id.group('int'),
+            route['interface']['name']
+        )
@@ -0,0 +1,126 @@
+import socket
+import numpy as np
+from asa_routing_functions import parse_network
+
+
+def addresses_to_array(addresses):
+    '''
+    This function converts dotted IPv4 addresses to a NumPy array of integers.
+
+    Args:
+        addresses: An iterable of IPv4 addresses such as '192.168.1.5'.
+
+    Returns:
+        A uint32 array of the addresses.
+
+    '''
+    packed = b''.join(socket.inet_aton(address) for address in addresses)
+    return np.frombuffer(packed, dtype='>u4').astype(np.uint32)
+
+
+class VectorRoutingTable:
+    '''
+    A NumPy form of RoutingTable for mapping very large address lists to routes.
+    The routes are flattened once into sorted, non-overlapping address ranges,
+    each owned by the most specific route covering it, so that lookup resolves
+    a whole array of addresses with a single searchsorted rather than one trie
+    walk per address. The management interface is removed from consideration,
+    and 'any4' is the default route, the same as RoutingTable.
+
+    '''
+
+    def __init__(self, routes):
+        '''
+        Args:
+            routes: A list of routes from an ASA formatted from sort_routes.
+
+        Example:
+
+            >>>table = VectorRoutingTable(sort_routes(routes_json['items']))
+            >>>zones, intfcs, gateways = table.lookup(addresses_to_array(['192.168.6.98', '10.1.1.5']))
+            >>>zones
+            array(['lab', 'management'], dtype=object)
+
+        '''
+        prefixes = {}
+        self.routes = []
+        for route in routes:
+            if 'Management' in route.intfc:
+                continue
+            prefix = parse_network(route.network)
+            if prefix not in prefixes:
+                prefixes[prefix] = len(self.routes)
+                self.routes.append(route)
+
+        self.zones = np.array([route.zone for route in self.routes] + [None], dtype=object)
+        self.intfcs = np.array([route.intfc for route in self.routes] + [None], dtype=object)
+        self.gateways = np.array([route.gateway for route in self.routes] + [None], dtype=object)
+
+        starts, owners = flatten_prefixes(prefixes)
+        self.starts = np.array(starts, dtype=np.uint32)
+        self.owners = np.array(owners, dtype=np.int64)
+
+    def lookup_index(self, addresses):
+        '''
+        Args:
+            addresses: A uint32 array of addresses, such as from addresses_to_array.
+
+        Returns:
+            An array of indexes into self.routes, with -1 where no route matches.
+
+        '''
+        addresses = np.asarray(addresses, dtype=np.uint32)
+        return self.owners[np.searchsorted(self.starts, addresses, side='right') - 1]
+
+    def lookup(self, addresses):
+        '''
+        Args:
+            addresses: A uint32 array of addresses, such as from addresses_to_array.
+
+        Returns:
+            A tuple of zone, interface and gateway arrays in the order of addresses,
+            with None where no route matches.
+
+        '''
+        found = self.lookup_index(addresses)
+        return self.zones[found], self.intfcs[found], self.gateways[found]
+
+
+def flatten_prefixes(prefixes):
+    '''
+    This function turns nested prefixes into non-overlapping ranges. Prefixes are
+    visited in address order with enclosing prefixes first, keeping a stack of
+    the prefixes that contain the current address; each time a prefix starts or
+    ends, a new range begins that belongs to the top of the stack.
+
+    Args:
+        prefixes: A dictionary of (network, prefix length) to an owner index.
+
+    Returns:
+        A tuple of range start addresses in ascending order, and the owner of each
+        range, with -1 for ranges no prefix covers.
+
+    '''
+    starts, owners = [0], [-1]
+
+    def begin(address, owner):
+        if starts[-1] == address:
+            owners[-1] = owner
+        else:
+            starts.append(address)
+            owners.append(owner)
+
+    stack = [(0xFFFFFFFF, -1)]
+    for (network, prefixlen), owner in sorted(prefixes.items()):
+        while stack[-1][0] < network:
+            end, _ = stack.pop()
+            begin(end + 1, stack[-1][1])
+        begin(network, owner)
+        stack.append((network + (1 << (32 - prefixlen)) - 1, owner))
+
+    while len(stack) > 1:
+        end, _ = stack.pop()
+        if end < 0xFFFFFFFF:
+            begin(end + 1, stack[-1][1])
+
+    return starts, owners
@@ -0,0 +1,237 @@
+import csv
+import os
+from itertools import islice
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from asa_acl_table import flow_service
+from asa_acl_classifier import ACLClassifier
+from asa_acl_functions import sort_access_groups
+from asa_interface_models import Interface
+from asa_routing_functions import sort_routes
+from asa_routing_models import Route
+from asa_routing_vector import VectorRoutingTable, addresses_to_array
+from asa_snapshot_functions import ASASnapshotStore
+
+
+FlowVerdict = namedtuple('FlowVerdict', 'flow permitted reason ingress acl position object_id egress egress_intfc '
+                                         'gateway unresolved')
+
+
+def connected_routes(intfcs):
+    '''
+    This function returns a route for the network of every named interface that
+    is not shut down, the same as the connected routes in 'show route'.
+
+    Args:
+        intfcs: The physical interfaces as JSON.
+
+    Returns:
+        A list of Route records with a gateway of 'connected'.
+
+    '''
+    routes = []
+    for intfc in map(Interface.from_json, intfcs):
+        if intfc.name and not intfc.shutdown and intfc.ip_address and intfc.net_mask:
+            routes.append(Route('{}/{}'.format(intfc.ip_address, intfc.net_mask), 'connected',
+                                intfc.hardware_id, intfc.name))
+    return routes
+
+
+class DeviceSimulator:
+    '''A whole-device model of how an ASA handles a flow, built from a snapshot.
+
+    Each flow goes through the same steps as on the ASA. The ingress interface
+    is the one the source address is routed to (connected networks first, as
+    the most specific, then static routes). The access-group of that interface
+    selects the inbound ACL, and the ACL is evaluated with an ACLClassifier. The
+    egress interface and next hop come from the route to the destination. When
+    the ingress interface has no access-group, the ASA's default applies: a flow
+    is allowed from a higher to a lower security level. A flow that would leave
+    on the interface it arrived on is reported as dropped.
+
+    ACL rules that cannot be expanded, such as those referencing an object that
+    is not in the snapshot, are left out of the ACLClassifier. The positions of
+    the ones that come before a flow's decision and could match the flow are
+    kept in the verdict's unresolved, and the verdict should be checked on the
+    ASA.
+
+    Route lookups and ACL evaluation are done for a whole batch of flows at once.
+
+    '''
+
+    def __init__(self, store, snapshot):
+        '''
+        Args:
+            store: An ASASnapshotStore.
+            snapshot: The id of the snapshot to simulate.
+
+        Example:
+
+            >>>simulator = DeviceSimulator(ASASnapshotStore('asa_snapshots.db'), 3)
+            >>>simulator.simulate([('10.1.1.22', '10.2.2.22', 'tcp', 443)])
+            [FlowVerdict(flow=('10.1.1.22', '10.2.2.22', 'tcp', 443), permitted=True, reason='acl',
+            ingress='lab', acl='lab_access_in', position=2, object_id='3535378664', egress='weblab',
+            egress_intfc='GigabitEthernet0/2', gateway='192.168.1.17', unresolved=())]
+
+        '''
+        intfcs = store.items(snapshot, 'interfaces')
+        self.routes = VectorRoutingTable(connected_routes(intfcs) + sort_routes(store.items(snapshot, 'routes')))
+        self.security_levels = {intfc.name: int(intfc.security_level or 0)
+                                for intfc in map(Interface.from_json, intfcs) if intfc.name}
+        self.access_groups = {group.interface: group.acl for group in map(
+            sort_access_groups, store.items(snapshot, 'access_groups')) if group.direction.upper() == 'IN'}
+
+        self.store = store
+        self.snapshot = snapshot
+        self.index = store.object_index(snapshot)
+        self.classifiers = {}
+
+    def classifier(self, intfc_name):
+        '''
+        Returns:
+            The ACLClassifier of the interface's inbound ACL, built the first time it is needed.
+
+        '''
+        if intfc_name not in self.classifiers:
+            self.classifiers[intfc_name] = ACLClassifier(
+                self.store.items(self.snapshot, 'acl_rules', intfc_name),
+                self.index.address_ranges, self.index.service_ranges)
+        return self.classifiers[intfc_name]
+
+    def simulate(self, flows):
+        '''
+        This method simulates a batch of flows.
+
+        Args:
+            flows: A list of (source, destination, protocol, port) tuples, where the
+            addresses are dotted strings and protocol is a name or number.
+
+        Returns:
+            A list of FlowVerdict tuples in the order of flows. reason is 'acl',
+            'security-level', 'no-ingress-route', 'no-route', 'same-interface', or
+            'invalid-service' for a protocol or port that is not understood.
+            unresolved is a tuple of the positions of rules that could not be
+            expanded and could match the flow before its decision.
+
+        '''
+        if not flows:
+            return []
+        sources = addresses_to_array(flow[0] for flow in flows)
+        destinations = addresses_to_array(flow[1] for flow in flows)
+        services = [flow_service(*flow[2:4]) for flow in flows]
+        protocols = np.array([service[0] if service else 0 for service in services])
+        ports = np.array([service[1] if service else 0 for service in services])
+
+        ingress = self.routes.zones[self.routes.lookup_index(sources)]
+        egress_route = self.routes.lookup_index(destinations)
+        egress, egress_intfcs, gateways = (self.routes.zones[egress_route], self.routes.intfcs[egress_route],
+                                           self.routes.gateways[egress_route])
+
+        rules = np.full(len(flows), -1, dtype=np.int64)
+        unresolved = [()] * len(flows)
+        for intfc_name in set(ingress.tolist()) & set(self.access_groups):
+            selected = np.flatnonzero(ingress == intfc_name)
+            classifier = self.classifier(intfc_name)
+            flow_args = (sources[selected], destinations[selected], protocols[selected], ports[selected])
+            rules[selected] = classifier.match(*flow_args)
+            for number, positions in zip(selected.tolist(),
+                                         classifier.skipped_matches(*flow_args, rules[selected])):
+                unresolved[number] = positions
+
+        verdicts = []
+        for number, flow in enumerate(flows):
+            intfc_name, egress_name = ingress[number], egress[number]
+            acl = self.access_groups.get(intfc_name)
+            position = object_id = None
+
+            if services[number] == None:
+                permitted, reason = False, 'invalid-service'
+            elif intfc_name == None:
+                permitted, reason = False, 'no-ingress-route'
+            elif egress_name == None:
+                permitted, reason = False, 'no-route'
+            elif intfc_name == egress_name:
+                permitted, reason = False, 'same-interface'
+            elif acl == None:
+                permitted = self.security_levels.get(intfc_name, 0) > self.security_levels.get(egress_name, 0)
+                reason = 'security-level'
+            else:
+                table = self.classifiers[intfc_name].table
+                row = rules[number]
+                permitted, reason = bool(row >= 0 and table.permit[row]), 'acl'
+                if row >= 0:
+                    position, object_id = int(table.position[row]), table.object_id[row]
+
+            verdicts.append(FlowVerdict(flow, permitted, reason, intfc_name, acl, position, object_id,
+                                        egress_name, egress_intfcs[number], gateways[number],
+                                        unresolved[number] if reason == 'acl' else ()))
+        return verdicts
+
+
+_simulator = None
+
+
+def _start_worker(database, snapshot):
+    global _simulator
+    _simulator = DeviceSimulator(ASASnapshotStore(database), snapshot)
+
+
+def _simulate_chunk(flows):
+    return _simulator.simulate(flows)
+
+
+def read_flows(path):
+    '''
+    This function reads a CSV file of source,destination,protocol,port flows one
+    line at a time; blank lines and lines starting with '#' are skipped.
+
+    Yields:
+        (source, destination, protocol, port) tuples.
+
+    '''
+    with open(path) as flow_file:
+        for row in csv.reader(flow_file):
+            if row and not row[0].startswith('#'):
+                yield tuple(field.strip() for field in row[:4])
+
+
+def chunks(flows, chunk_size):
+    flows = iter(flows)
+    while True:
+        chunk = list(islice(flows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def simulate_flows(database, snapshot, flows, chunk_size=50000, workers=None):
+    '''
+    This function simulates a large number of flows against a snapshot. The
+    flows are split into chunks, and the chunks are simulated in a pool of
+    processes that each build their own DeviceSimulator from the snapshot, so
+    the flow file is never held in memory at once.
+
+    Args:
+        database: The SQLite snapshot database.
+        snapshot: The id of the snapshot.
+        flows: An iterable of flows, such as from read_flows.
+        chunk_size: The number of flows simulated together.
+        workers: The number of processes; defaults to the number of CPUs.
+
+    Yields:
+        A FlowVerdict for every flow, in the order of flows.
+
+    '''
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                             initargs=(database, snapshot)) as executor:
+        pending = []
+        for chunk in chunks(flows, chunk_size):
+            pending.append(executor.submit(_simulate_chunk, chunk))
+            if len(pending) > workers * 2:
+                for verdict in pending.pop(0).result():
+                    yield verdict
+        for future in pending:
+            for verdict in future.result():
+                yield verdict
@@ -0,0 +1,96 @@
+import argparse
+from asa_flow_simulator import simulate_flows, read_flows
+from asa_snapshot_functions import ASASnapshotStore
+
+
+def main():
+    '''
+    The purpose of this program is to find what an ASA would do with every flow
+    in a file, using a snapshot instead of the ASA. For each flow the ingress
+    interface is found from the route to the source, the inbound ACL of that
+    interface is evaluated, and the egress interface and next hop are found from
+    the route to the destination. The file is read in chunks that are simulated
+    in parallel, so files of millions of flows can be checked.
+
+    Print:
+        One line per flow with the verdict, the reason for it, and the path, and
+        the rules that could not be expanded and may have decided some flows.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_simulate_flows.py 10.10.10.5 flows.csv
+        10.1.1.22 -> 10.2.2.22 tcp/443: PERMIT by lab_access_in rule 2 (3535378664), lab -> weblab
+        (GigabitEthernet0/2 via 192.168.1.17)
+        10.1.1.99 -> 10.2.2.22 udp/53: DENY by lab_access_in implicit deny, lab -> weblab
+        (GigabitEthernet0/2 via 192.168.1.17)
+        172.16.9.9 -> 10.2.2.22 tcp/22: DENY by no-ingress-route
+        10.1.1.40 -> 10.2.2.22 tcp/8443: PERMIT by lab_access_in rule 9 (620514475), lab -> weblab
+        (GigabitEthernet0/2 via 192.168.1.17), UNCERTAIN: rules 4 could not be expanded and may match first
+
+        lab_access_in RULES AT POSITIONS [4] COULD NOT BE EXPANDED AND MAY DECIDE SOME FLOWS; CHECK THEM ON THE ASA
+
+        flows.csv reads:
+            10.1.1.22,10.2.2.22,tcp,443
+            10.1.1.99,10.2.2.22,udp,53
+            172.16.9.9,10.2.2.22,tcp,22
+            10.1.1.40,10.2.2.22,tcp,8443
+
+    '''
+    parser = argparse.ArgumentParser(description='Simulate flows through an ASA from a snapshot.')
+    parser.add_argument('asa', help='The IP or hostname of the ASA.')
+    parser.add_argument('flows', help='A CSV file of source,destination,protocol,port flows.')
+    parser.add_argument('-s', '--snapshot', type=int, help='The snapshot id; defaults to the newest.')
+    parser.add_argument('-d', '--database', default='asa_snapshots.db', help='The SQLite snapshot database.')
+    parser.add_argument('-c', '--chunk-size', type=int, default=50000, help='The number of flows per chunk.')
+    parser.add_argument('-w', '--workers', type=int, help='The number of processes; defaults to the CPU count.')
+    options = parser.parse_args()
+
+    store = ASASnapshotStore(options.database)
+    snapshot = options.snapshot or store.latest(options.asa)
+    store.close()
+    if snapshot == None:
+        print('NO SNAPSHOT OF {} IN {}'.format(options.asa, options.database))
+        return
+
+    skipped = {}
+    for verdict in simulate_flows(options.database, snapshot, read_flows(options.flows),
+                                  options.chunk_size, options.workers):
+        print_verdict(verdict)
+        if verdict.unresolved:
+            skipped.setdefault(verdict.acl, set()).update(verdict.unresolved)
+
+    for acl, positions in sorted(skipped.items()):
+        print('\n{} RULES AT POSITIONS {} COULD NOT BE EXPANDED AND MAY DECIDE SOME FLOWS; '
+              'CHECK THEM ON THE ASA'.format(acl, sorted(positions)))
+
+
+def print_verdict(verdict):
+    '''
+    This function prints the verdict for one flow.
+
+    Args:
+        verdict: A FlowVerdict from DeviceSimulator.simulate.
+
+    '''
+    source, destination, protocol, port = verdict.flow
+    if verdict.reason == 'acl':
+        if verdict.position == None:
+            reason = '{} implicit deny'.format(verdict.acl)
+        else:
+            reason = '{} rule {} ({})'.format(verdict.acl, verdict.position, verdict.object_id)
+    else:
+        reason = verdict.reason
+
+    line = '{} -> {} {}/{}: {} by {}'.format(
+        source, destination, protocol, port, 'PERMIT' if verdict.permitted else 'DENY', reason)
+    if verdict.ingress != None and verdict.egress != None:
+        line += ', {} -> {} ({} via {})'.format(verdict.ingress, verdict.egress, verdict.egress_intfc,
+                                               verdict.gateway)
+    if verdict.unresolved:
+        line += ', UNCERTAIN: rules {} could not be expanded and may match first'.format(
+            ', '.join(map(str, verdict.unresolved)))
+    print(line)
+
+
+if __name__ == '__main__':
+    main()
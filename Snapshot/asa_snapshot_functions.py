@@ -0,0 +1,388 @@
+import json
+import time
+import sqlite3
+import hashlib
+from asa_paging import get_page, asa_iter_items
+from asa_acl_class import ASAACL
+from asa_object_class import ASAObject
+from asa_routing_class import ASARouting
+from asa_interface_class import ASAInterface
+from asa_acl_functions import sort_access_groups
+from asa_object_functions import ObjectIndex
+
+
+COLLECTIONS = ('interfaces', 'routes', 'network_objects', 'network_object_groups', 'service_objects',
+               'service_object_groups', 'access_groups', 'acl_rules')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    asa TEXT NOT NULL,
+    taken REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_asa ON snapshots (asa, taken);
+CREATE TABLE IF NOT EXISTS items (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    collection TEXT NOT NULL,
+    parent TEXT NOT NULL DEFAULT '',
+    object_id TEXT,
+    position INTEGER,
+    hash TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_collection ON items (snapshot_id, collection, parent, position);
+CREATE INDEX IF NOT EXISTS items_object ON items (snapshot_id, collection, object_id);
+CREATE TABLE IF NOT EXISTS changes (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    base_id INTEGER NOT NULL,
+    collection TEXT NOT NULL,
+    parent TEXT NOT NULL DEFAULT '',
+    object_id TEXT,
+    change TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_snapshot ON changes (snapshot_id, collection, parent);
+'''
+
+
+def content_hash(item):
+    '''
+    Returns:
+        A digest of the item's JSON that is the same for the same content whatever the key order.
+
+    '''
+    return hashlib.sha1(json.dumps(item, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def item_key(item):
+    '''
+    Returns:
+        The objectId of the item, or its selfLink when it has no objectId (such as an access-group).
+
+    '''
+    return item.get('objectId') or item.get('selfLink') or content_hash(item)
+
+
+def probe_collection(session, url, header):
+    '''
+    This function GETs a one item page of a collection, which is enough to learn
+    how many items it holds from 'rangeInfo' without downloading them.
+
+    Returns:
+        A tuple of the total number of items and the first item (None if empty).
+
+    '''
+    page = get_page(session, url, header, 0, 1)
+    items = page.get('items', [])
+    return page.get('rangeInfo', {}).get('total', len(items)), items[0] if items else None
+
+
+def collection_urls(asa, header, session, access_groups):
+    '''
+    This function returns the URL of every collection kept in a snapshot,
+    including the inbound ACL rules of every interface with an access-group.
+
+    Args:
+        asa: The IP or hostname of the ASA.
+        header: The header to use for providing the authentication token.
+        session: The ASASession used to send the API calls.
+        access_groups: The inbound access-groups of the ASA.
+
+    Returns:
+        A list of (collection, parent, url) tuples, where parent is the
+        interface name for ACL rules and '' for everything else.
+
+    '''
+    acl = ASAACL(asa, header, session=session)
+    obj = ASAObject(asa, header, session=session)
+    routes = ASARouting(asa, header, session=session)
+    intfcs = ASAInterface(asa, header, session=session)
+
+    urls = [
+        ('interfaces', '', intfcs.base_url + 'physical'),
+        ('routes', '', routes.base_url + 'static'),
+        ('network_objects', '', obj.base_url + 'objects/networkobjects'),
+        ('network_object_groups', '', obj.base_url + 'objects/networkobjectgroups'),
+        ('service_objects', '', obj.base_url + 'objects/networkservices'),
+        ('service_object_groups', '', obj.base_url + 'objects/networkservicegroups')
+    ]
+    for group in access_groups:
+        intfc_name = sort_access_groups(group).interface
+        urls.append(('acl_rules', intfc_name, acl.base_url + 'in/{}/rules'.format(intfc_name)))
+
+    return urls
+
+
+def collect_config(asa, header, session):
+    '''
+    This function collects every collection kept in a snapshot from the ASA.
+    The inbound ACL rules are collected for every interface with an access-group.
+
+    Args:
+        asa: The IP or hostname of the ASA.
+        header: The header to use for providing the authentication token.
+        session: The ASASession used to send the API calls.
+
+    Returns:
+        A list of (collection, parent, items) tuples, where parent is the
+        interface name for ACL rules and '' for everything else.
+
+    '''
+    access_groups = list(ASAACL(asa, header, session=session).asa_iter_acls_in())
+    config = [(collection, parent, list(asa_iter_items(session, url, header, ordered=True)))
+              for collection, parent, url in collection_urls(asa, header, session, access_groups)]
+    config.append(('access_groups', '', access_groups))
+
+    return config
+
+
+class ASASnapshotStore:
+    '''A SQLite store of point in time copies of ASA configuration.
+
+    Each snapshot holds the interfaces, static routes, network and service objects
+    and groups, access-groups and inbound ACL rules of one ASA at one time, as the
+    JSON items returned by the API. The items are indexed by snapshot,
+    collection, parent (the interface of an ACL rule) and position, so the print
+    functions and any analysis can be run against a snapshot without touching
+    the ASA.
+
+    '''
+
+    def __init__(self, path='asa_snapshots.db'):
+        '''
+        Args:
+            path: The SQLite database file; it is created if it does not exist.
+
+        Example:
+
+            >>>store = ASASnapshotStore('asa_snapshots.db')
+            >>>snapshot = store.take(asa, header, asa_login.session)
+            >>>print_routes(store.items(snapshot, 'routes'))
+
+        '''
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+        if 'hash' not in [column[1] for column in self.db.execute('PRAGMA table_info(items)')]:
+            self.db.execute('ALTER TABLE items ADD COLUMN hash TEXT')
+
+    def close(self):
+        self.db.close()
+
+    def save(self, asa, config, taken=None):
+        '''
+        This method stores collected configuration as a new snapshot.
+
+        Args:
+            asa: The IP or hostname of the ASA.
+            config: A list of (collection, parent, items) tuples from collect_config.
+            taken: The time of the snapshot in seconds since the epoch; defaults to now.
+
+        Returns:
+            The id of the new snapshot.
+
+        '''
+        with self.db:
+            snapshot = self.db.execute(
+                'INSERT INTO snapshots (asa, taken) VALUES (?, ?)', (asa, taken or time.time())).lastrowid
+            self.db.executemany(
+                'INSERT INTO items (snapshot_id, collection, parent, object_id, position, hash, body) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((snapshot, collection, parent, item_key(item), item.get('position'), content_hash(item),
+                  json.dumps(item)) for collection, parent, items in config for item in items))
+
+        return snapshot
+
+    def sync(self, asa, header, session, trust_counts=False):
+        '''
+        This method stores a new snapshot of the ASA by comparing it to the newest
+        stored snapshot. Every collection is downloaded and compared item by item on
+        objectId (or selfLink) and content hash, and every added, changed and
+        deleted item is recorded in the changes table, so the snapshot is always
+        complete and only the differences are recorded. The first snapshot of an
+        ASA is a full take.
+
+        A sync is a full diff, not an incremental fetch: it downloads as much as
+        take does. The ASA API has no modification time, change counter or ETag
+        for its collections and items, and cannot list the items changed since a
+        time, so an edited item can only be found by downloading it.
+
+        With trust_counts, each collection is first probed with a one item page,
+        and when its total and first item match the stored copy the collection is
+        carried forward without being downloaded. This is much faster, but an edit
+        in the middle of a collection, such as the port of a rule or the value of
+        an object, is not found and the new snapshot keeps the old item, so tools
+        that read the snapshot would use stale data; only use it between full syncs.
+
+        Args:
+            asa: The IP or hostname of the ASA.
+            header: The header to use for providing the authentication token.
+            session: The ASASession used to send the API calls.
+            trust_counts: True to carry forward collections whose count and first item are unchanged.
+
+        Returns:
+            The id of the new snapshot.
+
+        '''
+        base = self.latest(asa)
+        if base == None:
+            return self.take(asa, header, session)
+
+        access_groups = list(ASAACL(asa, header, session=session).asa_iter_acls_in())
+        base_counts = dict(((collection, parent), count) for collection, parent, count in self.db.execute(
+            'SELECT collection, parent, COUNT(*) FROM items WHERE snapshot_id = ? GROUP BY collection, parent',
+            (base,)))
+
+        with self.db:
+            snapshot = self.db.execute(
+                'INSERT INTO snapshots (asa, taken) VALUES (?, ?)', (asa, time.time())).lastrowid
+
+            for collection, parent, url in collection_urls(asa, header, session, access_groups):
+                base_count = base_counts.pop((collection, parent), 0)
+                if trust_counts:
+                    total, first = probe_collection(session, url, header)
+                    if total == base_count and (first == None or self._first_hash(base, collection, parent) ==
+                                                content_hash(first)):
+                        self._carry_forward(snapshot, base, collection, parent)
+                        continue
+                items = list(asa_iter_items(session, url, header, ordered=True))
+                self._merge(snapshot, base, collection, parent, items)
+
+            base_counts.pop(('access_groups', ''), None)
+            self._merge(snapshot, base, 'access_groups', '', access_groups)
+            for collection, parent in base_counts:
+                self._merge(snapshot, base, collection, parent, [])
+
+        return snapshot
+
+    def _first_hash(self, base, collection, parent):
+        row = self.db.execute(
+            'SELECT hash FROM items WHERE snapshot_id = ? AND collection = ? AND parent = ? '
+            'ORDER BY position, rowid LIMIT 1', (base, collection, parent)).fetchone()
+        return row[0] if row else None
+
+    def _carry_forward(self, snapshot, base, collection, parent):
+        self.db.execute(
+            'INSERT INTO items (snapshot_id, collection, parent, object_id, position, hash, body) '
+            'SELECT ?, collection, parent, object_id, position, hash, body FROM items '
+            'WHERE snapshot_id = ? AND collection = ? AND parent = ? ORDER BY position, rowid',
+            (snapshot, base, collection, parent))
+
+    def _merge(self, snapshot, base, collection, parent, items):
+        stored = dict(self.db.execute(
+            'SELECT object_id, hash FROM items WHERE snapshot_id = ? AND collection = ? AND parent = ?',
+            (base, collection, parent)))
+
+        rows = []
+        changes = []
+        for item in items:
+            key, digest = item_key(item), content_hash(item)
+            rows.append((snapshot, collection, parent, key, item.get('position'), digest, json.dumps(item)))
+            if key not in stored:
+                changes.append((snapshot, base, collection, parent, key, 'added'))
+            elif stored.pop(key) != digest:
+                changes.append((snapshot, base, collection, parent, key, 'changed'))
+        changes.extend((snapshot, base, collection, parent, key, 'deleted') for key in stored)
+
+        self.db.executemany(
+            'INSERT INTO items (snapshot_id, collection, parent, object_id, position, hash, body) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        self.db.executemany(
+            'INSERT INTO changes (snapshot_id, base_id, collection, parent, object_id, change) '
+            'VALUES (?, ?, ?, ?, ?, ?)', changes)
+
+    def changes(self, snapshot):
+        '''
+        Returns:
+            A list of (collection, parent, object_id, change) tuples recorded when the
+            snapshot was synced, where change is 'added', 'changed' or 'deleted'.
+
+        '''
+        return self.db.execute(
+            'SELECT collection, parent, object_id, change FROM changes WHERE snapshot_id = ? '
+            'ORDER BY collection, parent, rowid', (snapshot,)).fetchall()
+
+    def take(self, asa, header, session):
+        '''
+        This method collects the configuration of the ASA and stores it as a new snapshot.
+
+        Returns:
+            The id of the new snapshot.
+
+        '''
+        return self.save(asa, collect_config(asa, header, session))
+
+    def snapshots(self, asa=None):
+        '''
+        Returns:
+            A list of (id, asa, taken) tuples, oldest first, for one ASA or every ASA.
+
+        '''
+        if asa == None:
+            return self.db.execute('SELECT id, asa, taken FROM snapshots ORDER BY taken').fetchall()
+        return self.db.execute(
+            'SELECT id, asa, taken FROM snapshots WHERE asa = ? ORDER BY taken', (asa,)).fetchall()
+
+    def latest(self, asa):
+        '''
+        Returns:
+            The id of the newest snapshot of the ASA, or None if it has none.
+
+        '''
+        row = self.db.execute(
+            'SELECT id FROM snapshots WHERE asa = ? ORDER BY taken DESC LIMIT 1', (asa,)).fetchone()
+        return row[0] if row else None
+
+    def items(self, snapshot, collection, parent=None):
+        '''
+        This method returns the items of a collection in a snapshot. Items with a
+        position (ACL rules) are returned in position order, others in the order
+        the ASA listed them.
+
+        Args:
+            snapshot: The id of the snapshot.
+            collection: One of COLLECTIONS.
+            parent: The interface name, to return only that interface's ACL rules.
+
+        Returns:
+            A list of the items as decoded JSON.
+
+        '''
+        query = 'SELECT body FROM items WHERE snapshot_id = ? AND collection = ?'
+        args = [snapshot, collection]
+        if parent != None:
+            query += ' AND parent = ?'
+            args.append(parent)
+        query += ' ORDER BY parent, position, rowid'
+
+        return [json.loads(body) for body, in self.db.execute(query, args)]
+
+    def item(self, snapshot, collection, object_id):
+        '''
+        Returns:
+            The item of the collection with the objectId as decoded JSON, or None.
+
+        '''
+        row = self.db.execute(
+            'SELECT body FROM items WHERE snapshot_id = ? AND collection = ? AND object_id = ? LIMIT 1',
+            (snapshot, collection, object_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def object_index(self, snapshot):
+        '''
+        Returns:
+            An ObjectIndex of the snapshot's network and service objects and groups,
+            which resolves ACL references without the ASA.
+
+        '''
+        return ObjectIndex.from_items(
+            self.items(snapshot, 'network_objects'), self.items(snapshot, 'network_object_groups'),
+            self.items(snapshot, 'service_objects'), self.items(snapshot, 'service_object_groups'))
+
+    def delete(self, snapshot):
+        '''
+        This method removes a snapshot and its items.
+
+        '''
+        with self.db:
+            self.db.execute('DELETE FROM snapshots WHERE id = ?', (snapshot,))
@@ -0,0 +1,71 @@
+import argparse
+from asa_acl_functions import sort_access_groups
+from asa_get_policy import print_acls
+from asa_get_routes import print_routes
+from asa_get_interfaces_phys import print_intfcs
+from asa_snapshot_functions import ASASnapshotStore
+
+
+def main():
+    '''
+    The purpose of this program is to print the routes, inbound ACL policies or
+    interfaces of an ASA from a snapshot instead of from the ASA. The same print
+    functions as asa_get_routes.py, asa_get_policy.py and asa_get_interfaces_phys.py
+    are used, so the output is the same; no API calls are made.
+
+    Print:
+        The report for the newest snapshot of the ASA, or the snapshot given.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_snapshot_report.py 10.10.10.5 routes
+        Network 192.168.20.0/23 is reachable via 192.168.1.9 over interface
+        GigabitEthernet0/0 in zone lab
+
+        (py3) C:\\asa_api_tests>python asa_snapshot_report.py 10.10.10.5 acls -i lab -s 3
+
+        Interface lab (lab_access_in):
+        permit source 10.1.1.22 destination any protocol ip
+
+    '''
+    parser = argparse.ArgumentParser(description='Print ASA configuration from a snapshot.')
+    parser.add_argument('asa', help='The IP or hostname of the ASA.')
+    parser.add_argument('report', choices=('routes', 'acls', 'intfcs'), help='The report to print.')
+    parser.add_argument('-s', '--snapshot', type=int, help='The snapshot id; defaults to the newest.')
+    parser.add_argument('-i', '--interface', help='Only print the ACL policy of this interface.')
+    parser.add_argument('-d', '--database', default='asa_snapshots.db', help='The SQLite snapshot database.')
+    options = parser.parse_args()
+
+    store = ASASnapshotStore(options.database)
+    snapshot = options.snapshot or store.latest(options.asa)
+    if snapshot == None:
+        print('NO SNAPSHOT OF {} IN {}'.format(options.asa, options.database))
+    else:
+        print_report(store, snapshot, options.report, options.interface)
+    store.close()
+
+
+def print_report(store, snapshot, report, intfc_name=None):
+    '''
+    This function prints one report from a snapshot.
+
+    Args:
+        store: An ASASnapshotStore.
+        snapshot: The id of the snapshot.
+        report: 'routes', 'acls' or 'intfcs'.
+        intfc_name: Only print the ACL policy of this interface.
+
+    '''
+    if report == 'routes':
+        print_routes(store.items(snapshot, 'routes'))
+    elif report == 'intfcs':
+        print_intfcs(store.items(snapshot, 'interfaces'))
+    else:
+        for group in map(sort_access_groups, store.items(snapshot, 'access_groups')):
+            if intfc_name in (None, group.interface):
+                print('\nInterface {} ({}):'.format(group.interface, group.acl))
+                print_acls(store.items(snapshot, 'acl_rules', group.interface))
+
+
+if __name__ == '__main__':
+    main()
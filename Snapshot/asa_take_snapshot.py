@@ -0,0 +1,95 @@
+import argparse
+from collections import Counter
+from datetime import datetime
+from asa_aaa_class import ASAAAA
+from asa_snapshot_functions import ASASnapshotStore, COLLECTIONS
+
+
+def main():
+    '''
+    The purpose of this program is to save a snapshot of an ASA's configuration
+    to a SQLite database. The ASAAAA class is used to establish a session, and
+    the ASASnapshotStore class collects the interfaces, static routes, network
+    and service objects and groups, access-groups and the inbound ACL rules of
+    every interface, and stores them so they can be queried without the ASA. With
+    --sync the collections are downloaded in full and compared to the newest
+    snapshot of the ASA, and the added, changed and deleted items are recorded;
+    the ASA API cannot list only what changed. --quick also skips downloading
+    collections whose item count and first item are unchanged, which misses edits
+    to the other items.
+
+    Print:
+        The id and time of the new snapshot, the number of items per collection,
+        and the number of changes per collection when syncing.
+
+    Example:
+
+        (py3) C:\\asa_api_tests>python asa_take_snapshot.py -d asa_snapshots.db
+        What ASA do you want to snapshot? 10.10.10.5
+        What is your username? username
+        Enter your password: getpass is used to hide password input
+
+        LOGIN STATUS_CODE: 204 OK
+
+        SNAPSHOT 3 OF 10.10.10.5 TAKEN 2017-06-02 14:21:07
+         interfaces: 8
+         routes: 1452
+         network_objects: 3120
+         network_object_groups: 611
+         service_objects: 87
+         service_object_groups: 42
+         access_groups: 4
+         acl_rules: 9877
+
+        (py3) C:\\asa_api_tests>python asa_take_snapshot.py -d asa_snapshots.db --sync
+        ...
+        SNAPSHOT 4 OF 10.10.10.5 TAKEN 2017-06-02 14:26:40
+        ...
+         acl_rules: 9878
+         acl_rules lab added: 1
+
+    '''
+    parser = argparse.ArgumentParser(description="Save a snapshot of an ASA's configuration.")
+    parser.add_argument('-d', '--database', default='asa_snapshots.db', help='The SQLite snapshot database.')
+    parser.add_argument('--sync', action='store_true', help='Record what changed since the last snapshot.')
+    parser.add_argument('--quick', action='store_true',
+                        help='With --sync, skip collections whose item count and first item are unchanged; '
+                             'edits to other items are missed.')
+    options = parser.parse_args()
+
+    login_cred = ASAAAA(asa=input('What ASA do you want to snapshot? '))
+    header = login_cred.asa_login()
+
+    store = ASASnapshotStore(options.database)
+    if options.sync:
+        snapshot = store.sync(login_cred.asa, header, login_cred.session, options.quick)
+    else:
+        snapshot = store.take(login_cred.asa, header, login_cred.session)
+    print_snapshot(store, snapshot)
+    store.close()
+
+
+def print_snapshot(store, snapshot):
+    '''
+    This function prints a summary of one snapshot.
+
+    Args:
+        store: An ASASnapshotStore.
+        snapshot: The id of the snapshot.
+
+    '''
+    _, asa, taken = next(row for row in store.snapshots() if row[0] == snapshot)
+    print('\nSNAPSHOT {} OF {} TAKEN {}'.format(
+        snapshot, asa, datetime.fromtimestamp(taken).strftime('%Y-%m-%d %H:%M:%S')))
+    counts = dict(store.db.execute(
+        'SELECT collection, COUNT(*) FROM items WHERE snapshot_id = ? GROUP BY collection', (snapshot,)))
+    for collection in COLLECTIONS:
+        print(' {}: {}'.format(collection, counts.get(collection, 0)))
+
+    changes = Counter((collection, parent, change) for collection, parent, _, change in store.changes(snapshot))
+    for (collection, parent, change), count in sorted(changes.items()):
+        print(' {} {}: {}'.format(' '.join(filter(None, (collection, parent))), change, count))
+
+
+if __name__ == '__main__':
+    main()